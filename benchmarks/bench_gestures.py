@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the gesture logic, no camera or model needed.
+
+    python benchmarks/bench_gestures.py              # compare against baseline.json
+    python benchmarks/bench_gestures.py --update     # rewrite the baseline
+    python benchmarks/bench_gestures.py -k classify  # only cases matching a substring
+
+Each case times one operation (a classified frame, a filter update, a
+drawn overlay) over a seeded synthetic landmark stream and reports the
+median microseconds per operation. Every repeat of a case is paired with
+a run of a fixed pure-Python calibration loop, and the case is judged by
+the median of case / calibration over the pairs: a slow or throttled
+stretch of a shared machine slows both halves of a pair alike, so it
+cancels out, and the same baseline works on faster or slower CI boxes.
+The run fails (exit 1) when a case's ratio is more than `tolerance` above
+the baseline's.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DEFAULT_THRESHOLDS, DEFAULT_SENSITIVITY
+from gesture_detector import GestureDetector
+from synthetic import STREAMS, steering_sweep
+from utils import Smoother, StabilityFilter, Trail
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+FRAMES = 600
+
+
+def _detector() -> GestureDetector:
+    return GestureDetector(dict(DEFAULT_THRESHOLDS), dict(DEFAULT_SENSITIVITY), backend=None)
+
+
+def case_classify(stream: str):
+    frames = [hands for _, hands in STREAMS[stream](FRAMES)]
+    det = _detector()
+
+    def run():
+        for hands in frames:
+            det.process_landmarks(hands)
+    return run, len(frames)
+
+
+def case_smoother():
+    values = list(np.random.default_rng(0).normal(size=FRAMES * 10))
+    sm = Smoother(12)
+
+    def run():
+        for v in values:
+            sm.add(v)
+    return run, len(values)
+
+
+def case_stability():
+    rng = np.random.default_rng(0)
+    keys = ['l_fwd', 'l_bwd', 'r_fwd', 'r_bwd', 'close', 'far', 'steer_l', 'steer_r']
+    values = [(keys[i % 8], bool(b)) for i, b in enumerate(rng.random(FRAMES * 8) > 0.7)]
+    sf = StabilityFilter(0.18)
+
+    def run():
+        for k, v in values:
+            sf.update(k, v)
+    return run, len(values)
+
+
+def case_trail():
+    pts = [(int(320 + 200 * np.sin(i / 10)), int(240 + 100 * np.cos(i / 10))) for i in range(FRAMES)]
+    tr = Trail()
+
+    def run():
+        for p in pts:
+            tr.add("Left", p)
+            tr.get("Left")
+    return run, len(pts)
+
+
+def case_draw():
+    frames = [hands for _, hands in steering_sweep(120)]
+    det = _detector()
+    blank = np.zeros((480, 640, 3), np.uint8)
+    canvas = blank.copy()
+
+    def run():
+        for hands in frames:
+            det.process_landmarks(hands)
+            np.copyto(canvas, blank)
+            det.draw(canvas)
+    return run, len(frames)
+
+
+CASES = {
+    'classify_steering_sweep': lambda: case_classify('steering_sweep'),
+    'classify_finger_poses': lambda: case_classify('finger_poses'),
+    'classify_enter_leave': lambda: case_classify('enter_leave'),
+    'smoother_add': case_smoother,
+    'stability_update': case_stability,
+    'trail_add_get': case_trail,
+    'draw_blank_frame': case_draw,
+}
+
+
+def _calibration_work():
+    acc = 0.0
+    for i in range(200_000):
+        acc += (i % 7) * 0.5
+    return acc
+
+
+def _sample(run, ops: int) -> float:
+    t0 = time.perf_counter()
+    run()
+    return (time.perf_counter() - t0) / ops * 1e6
+
+
+def measure(run, ops: int, repeat: int) -> Tuple[float, float, float]:
+    """Median us/op, median calibration us and median of their ratio over `repeat` pairs."""
+    cases, cals, ratios = [], [], []
+    for _ in range(repeat):
+        cal = _sample(_calibration_work, 1)
+        us = _sample(run, ops)
+        cases.append(us)
+        cals.append(cal)
+        ratios.append(us / cal)
+    return statistics.median(cases), statistics.median(cals), statistics.median(ratios)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--update', action='store_true', help='write results as the new baseline')
+    ap.add_argument('--tolerance', type=float, default=0.4)
+    ap.add_argument('--repeat', type=int, default=15)
+    ap.add_argument('-k', default='', help='only run cases containing this substring')
+    args = ap.parse_args()
+
+    results = {}
+    cals = {}
+    ratios = {}
+    for name, make in CASES.items():
+        if args.k not in name:
+            continue
+        run, ops = make()
+        run()  # warm-up
+        results[name], cals[name], ratios[name] = measure(run, ops, args.repeat)
+    cal = statistics.median(cals.values()) if cals else 0.0
+
+    if args.update:
+        # Stored as us at this run's calibration, so the file stays readable
+        with open(BASELINE, 'w') as f:
+            json.dump({'calibration_us': cal, 'cases': {n: r * cal for n, r in ratios.items()}},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {BASELINE}")
+        return
+
+    baseline = {}
+    base_cal = cal
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            data = json.load(f)
+        baseline = data.get('cases', {})
+        base_cal = data.get('calibration_us', cal)
+    ratio = cal / base_cal if base_cal else 1.0
+    print(f"calibration {cal:.0f} us (x{ratio:.2f} vs baseline machine), tolerance {args.tolerance:.0%}\n")
+    print(f"{'case':<26} {'us/op':>9} {'baseline':>9} {'change':>8}")
+    failed = []
+    for name, us in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26} {us:>9.2f} {'-':>9} {'new':>8}")
+            continue
+        # Compare calibration-relative costs; show the baseline scaled to this case's calibration
+        change = ratios[name] / (base / base_cal) - 1
+        expected = base / base_cal * cals[name]
+        flag = ''
+        if change > args.tolerance:
+            failed.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<26} {us:>9.2f} {expected:>9.2f} {change:>+8.0%}{flag}")
+    if failed:
+        print(f"\n{len(failed)} regression(s): {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
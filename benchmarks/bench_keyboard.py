@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""PWM steering accuracy and per-call cost of KeyboardController.press_pwm.
+
+    python benchmarks/bench_keyboard.py
+    python benchmarks/bench_keyboard.py --fps 30 60 --cycle 300 500 --hold 6
+
+Nothing is typed: the controller runs on a RecordingBackend and a
+simulated clock that advances one frame per press_pwm call (optionally
+with frame-time jitter). For each frame rate, base cycle and force step
+of a ramp it reports the duty cycle players actually get against the
+target, plus how far each on/off pulse strays from its intended length.
+Per-call overhead is measured separately on the real clock.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clock import VirtualClock
+from keyboard_controller import KeyboardController, RecordingBackend
+
+KEY = 'a'
+FORCES = (0.05, 0.2, 0.35, 0.5, 0.65, 0.8, 0.9)
+
+
+def simulate(fps: float, cycle_ms: int, force: float, hold_s: float, jitter: float, seed: int = 0) -> dict:
+    clock = VirtualClock()  # In milliseconds here, like the controller's clock
+    rec = RecordingBackend(clock)
+    kb = KeyboardController(4, backend=rec, clock=clock)
+    kb._base_cycle_ms = cycle_ms
+    rng = random.Random(seed)
+    frame_ms = 1000.0 / fps
+    end = hold_s * 1000
+    while clock.now < end:
+        kb.press_pwm(KEY, force)
+        clock.now += max(0.0, rng.gauss(frame_ms, frame_ms * jitter))
+    kb.release_all()
+
+    on_ms, off_ms = kb._calculate_pwm_timing(force)
+    target = on_ms / (on_ms + off_ms)
+    edges = [(t, kind) for t, kind, _ in rec.events]
+    # Measure whole pulses between the first and last press
+    presses = [i for i, (_, kind) in enumerate(edges) if kind == 'press']
+    on, off = [], []
+    for a, b in zip(presses, presses[1:]):
+        t_press, t_release, t_next = edges[a][0], edges[a + 1][0], edges[b][0]
+        on.append(t_release - t_press)
+        off.append(t_next - t_release)
+    if not on:
+        return {'target': target, 'achieved': float('nan'), 'on_err': float('nan'),
+                'off_err': float('nan'), 'jitter': float('nan'), 'pulses': 0}
+    period = [a + b for a, b in zip(on, off)]
+    return {
+        'target': target,
+        'achieved': sum(on) / sum(period),
+        'on_err': statistics.mean(on) - on_ms,
+        'off_err': statistics.mean(off) - off_ms,
+        # Spread of pulse edges around their average position
+        'jitter': ((statistics.pvariance(on) + statistics.pvariance(off)) / 2) ** 0.5,
+        'pulses': len(on),
+    }
+
+
+def overhead(calls: int = 50000) -> dict:
+    """Real-clock microseconds per press_pwm call, key held and key pulsing."""
+    out = {}
+    for label, force in (('hold', 1.0), ('pulse', 0.5)):
+        kb = KeyboardController(4, backend=RecordingBackend())
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            kb.press_pwm(KEY, force)
+        out[label] = (time.perf_counter() - t0) / calls * 1e6
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--fps', type=float, nargs='+', default=[15, 30, 60])
+    ap.add_argument('--cycle', type=int, nargs='+', default=[500],
+                    help='base PWM cycle lengths (ms) to compare')
+    ap.add_argument('--hold', type=float, default=10.0, help='seconds per force step')
+    ap.add_argument('--jitter', type=float, default=0.1,
+                    help='frame-time std dev as a fraction of the frame time')
+    args = ap.parse_args()
+
+    print(f"{'fps':>5} {'cycle':>6} {'force':>6} {'target':>7} {'actual':>7} "
+          f"{'on err':>7} {'off err':>8} {'jitter':>7} {'pulses':>7}")
+    for fps in args.fps:
+        for cycle in args.cycle:
+            for force in FORCES:
+                r = simulate(fps, cycle, force, args.hold, args.jitter)
+                print(f"{fps:>5.0f} {cycle:>6} {force:>6.2f} {r['target']:>7.1%} {r['achieved']:>7.1%} "
+                      f"{r['on_err']:>+6.1f}ms {r['off_err']:>+7.1f}ms {r['jitter']:>5.1f}ms {r['pulses']:>7}")
+        print()
+
+    oh = overhead()
+    print(f"press_pwm overhead: {oh['hold']:.2f} us/call holding, {oh['pulse']:.2f} us/call pulsing")
+
+
+if __name__ == "__main__":
+    main()
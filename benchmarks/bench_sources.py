@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Side-by-side throughput of the landmark backends.
+
+    python benchmarks/bench_sources.py [--video clip.mp4] [--frames 300] [--model hand_landmarker.task]
+
+The same in-memory RGB frames are pushed through each backend as fast as
+possible. For each one it reports how long process() blocks the caller,
+the submit rate, and completed results per second. For LIVE_STREAM, the
+completed rate is what the gesture logic actually gets. Without --video
+the frames are synthetic (a moving blob on noise), which still exercises
+palm detection on every frame.
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from landmark_sources import BACKENDS, make_source
+
+
+def load_frames(video: str, n: int):
+    frames = []
+    if video:
+        cap = cv2.VideoCapture(video)
+        while len(frames) < n:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.cvtColor(cv2.resize(frame, (640, 480)), cv2.COLOR_BGR2RGB))
+        cap.release()
+        return frames
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        frame = rng.integers(0, 40, (480, 640, 3), dtype=np.uint8)
+        cx = int(320 + 200 * np.sin(i / 15))
+        cv2.circle(frame, (cx, 240), 60, (200, 160, 140), -1)
+        frames.append(frame)
+    return frames
+
+
+def bench(backend: str, frames, model: str):
+    src = make_source(backend, 2, model)
+    for f in frames[:10]:
+        src.process(f)
+    done0 = getattr(src, 'completed', 0)
+    calls = []
+    t0 = time.perf_counter()
+    for f in frames:
+        c0 = time.perf_counter()
+        src.process(f)
+        calls.append(time.perf_counter() - c0)
+    submit_wall = time.perf_counter() - t0
+    if hasattr(src, 'completed'):
+        # Let in-flight LIVE_STREAM results land before counting them
+        last, deadline = -1, time.perf_counter() + 2.0
+        while src.completed != last and time.perf_counter() < deadline:
+            last = src.completed
+            time.sleep(0.1)
+        completed = src.completed - done0
+        wall = time.perf_counter() - t0
+    else:
+        completed, wall = len(frames), submit_wall
+    src.close()
+    calls_ms = np.array(calls) * 1000
+    return {
+        'submit_fps': len(frames) / submit_wall,
+        'call_ms': float(calls_ms.mean()),
+        'call_p95_ms': float(np.percentile(calls_ms, 95)),
+        'results_fps': completed / wall,
+        'completed': completed,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--video', default='')
+    ap.add_argument('--frames', type=int, default=300)
+    ap.add_argument('--model', default=None)
+    ap.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    args = ap.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        print("No frames to benchmark")
+        sys.exit(1)
+    print(f"{len(frames)} frames, {frames[0].shape[1]}x{frames[0].shape[0]}\n")
+    print(f"{'backend':<10} {'submit fps':>11} {'call ms':>9} {'p95 ms':>8} {'results fps':>12} {'results':>8}")
+    for backend in args.backends:
+        try:
+            r = bench(backend, frames, args.model)
+        except Exception as e:
+            print(f"{backend:<10} unavailable: {e}")
+            continue
+        print(f"{backend:<10} {r['submit_fps']:>11.1f} {r['call_ms']:>9.2f} {r['call_p95_ms']:>8.2f} "
+              f"{r['results_fps']:>12.1f} {r['completed']:>8d}")
+
+
+if __name__ == "__main__":
+    main()
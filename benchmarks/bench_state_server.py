@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Loopback check and timing for state_server (UDP and WebSocket).
+
+    python benchmarks/bench_state_server.py
+    python benchmarks/bench_state_server.py --frames 2000 --landmarks
+
+For each transport it starts a server on an ephemeral localhost port,
+measures publish() cost with no clients, connects a client, publishes
+synthetic GestureStates at the given rate and checks every decoded record
+against what was published. Reports publish() overhead, publish-to-receive
+latency and records lost to coalescing. Exits 1 if a record decodes wrong.
+"""
+import argparse
+import base64
+import math
+import os
+import socket
+import statistics
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gesture_detector import GestureDetector
+from config import DEFAULT_THRESHOLDS, DEFAULT_SENSITIVITY
+from state_server import make_server, unpack
+from synthetic import steering_sweep
+
+
+def udp_client(port: int):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(1.0)
+    sock.sendto(b"hi", ('127.0.0.1', port))
+
+    def recv():
+        return sock.recv(2048)
+    return sock, recv
+
+
+def ws_client(port: int):
+    sock = socket.create_connection(('127.0.0.1', port))
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall((
+        f"GET / HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    ).encode())
+    buf = b""
+    while b"\r\n\r\n" not in buf:
+        buf += sock.recv(1024)
+    head, buf = buf.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 101"), head
+    sock.settimeout(1.0)
+    state = {'buf': buf}
+
+    def need(n):
+        while len(state['buf']) < n:
+            state['buf'] += sock.recv(65536)
+
+    def recv():
+        need(2)
+        b = state['buf']
+        n, off = b[1] & 0x7F, 2
+        if n == 126:
+            need(4); n, off = struct.unpack('!H', state['buf'][2:4])[0], 4
+        elif n == 127:
+            need(10); n, off = struct.unpack('!Q', state['buf'][2:10])[0], 10
+        need(off + n)
+        msg, state['buf'] = state['buf'][off:off + n], state['buf'][off + n:]
+        return msg
+    return sock, recv
+
+
+def f32(x: float) -> float:
+    return struct.unpack('<f', struct.pack('<f', x))[0]
+
+
+def run(kind: str, frames, rate: float, landmarks: bool) -> bool:
+    server = make_server(kind, port=0, landmarks=landmarks)
+    det = GestureDetector(dict(DEFAULT_THRESHOLDS), dict(DEFAULT_SENSITIVITY), backend=None)
+    states = []
+    for _, hands in frames:
+        s = det.process_landmarks(hands)
+        states.append((s, det.left, det.right))
+
+    # publish() with nobody listening
+    t0 = time.perf_counter()
+    for s, l, r in states:
+        server.publish(s, 0.0, l, r)
+    idle_us = (time.perf_counter() - t0) / len(states) * 1e6
+
+    sock, recv = udp_client(server.port) if kind == 'udp' else ws_client(server.port)
+    deadline = time.time() + 2.0
+    while not server.clients and time.time() < deadline:
+        time.sleep(0.01)
+
+    sent = {}
+    cost = []
+    period = 1.0 / rate
+    received = []
+
+    def reader():
+        while True:
+            try:
+                data = recv()
+            except (socket.timeout, OSError):
+                return
+            received.append((time.perf_counter(), data))
+    th = threading.Thread(target=reader, daemon=True)
+    th.start()
+
+    next_t = time.perf_counter()
+    for i, (s, l, r) in enumerate(states):
+        ts = float(i)
+        sent[i] = (time.perf_counter(), s, l, r)
+        t0 = time.perf_counter()
+        server.publish(s, ts, l, r)
+        cost.append((time.perf_counter() - t0) * 1e6)
+        next_t += period
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+    th.join(3.0)
+    server.close()
+    sock.close()
+
+    ok = True
+    latency = []
+    for t_recv, data in received:
+        rec = unpack(data)
+        # seq skips coalesced frames; the timestamp field carries the frame index
+        t_pub, s, l, r = sent[int(rec['timestamp'])]
+        latency.append((t_recv - t_pub) * 1e3)
+        good = (
+            rec['steering_angle'] == f32(s.steering_angle)
+            and rec['steering_force'] == f32(s.steering_force)
+            and rec['hands_distance'] == f32(s.hands_distance)
+            and rec['bits'] == s.bits()
+        )
+        if landmarks:
+            for hand, got in zip((l, r), rec['landmarks']):
+                if hand is None:
+                    good &= all(math.isnan(x) for pt in got for x in pt)
+                else:
+                    good &= all(f32(a) == b for pa, pb in zip(hand.landmarks, got) for a, b in zip(pa, pb))
+        if not good:
+            ok = False
+    n = len(received)
+    print(f"{kind:>4}: {n}/{len(states)} records ({len(states) - n} coalesced), "
+          f"{'OK' if ok and n else 'MISMATCH'}; publish {idle_us:.2f} us idle, "
+          f"{statistics.median(cost):.2f} us with client; latency median "
+          f"{statistics.median(latency) if latency else float('nan'):.3f} ms, "
+          f"p99 {sorted(latency)[int(0.99 * (n - 1))] if latency else float('nan'):.3f} ms")
+    return ok and n > 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--frames', type=int, default=600)
+    ap.add_argument('--rate', type=float, default=120.0, help='publish rate (frames/s)')
+    ap.add_argument('--landmarks', action='store_true')
+    ap.add_argument('--transports', nargs='+', default=['udp', 'ws'], choices=['udp', 'ws'])
+    args = ap.parse_args()
+    frames = list(steering_sweep(args.frames))
+    results = [run(kind, frames, args.rate, args.landmarks) for kind in args.transports]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
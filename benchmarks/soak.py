@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Soak test: hours of frames through the detector, overlay and key output.
+
+    python benchmarks/soak.py --duration 10m                  # synthetic streams
+    python benchmarks/soak.py --session sessions/me_1.npz --duration 12h --interval 5m
+    python benchmarks/soak.py --video gameplay.mp4 --duration 1h   # includes the landmark model
+
+Frames are looped for `--duration` at `--fps`. With --fps 0 they run as
+fast as possible on a VirtualClock that steps by each frame's own interval,
+so the detector's filters and the key PWM see the stream's timing, not the
+CPU's, and hours of play take minutes. Landmarks from the synthetic streams or a recorded session go through
+process_landmarks(); a video goes through process() and so also through
+MediaPipe. Every frame's keys then go through the GUI's own mapping
+(keyboard_controller.handle_gestures on a RecordingBackend, so nothing is
+typed), it is drawn, and the timeline is rendered.
+
+Every `--interval` the run samples RSS, memory traced by tracemalloc, live
+Python objects, the sizes of the detector's and controller's dicts that
+grow per key or hand, and p50/p95/p99 frame latency over the interval.
+The first sample after `--warmup` is the baseline; the run fails (exit 1)
+if at the end any of them has drifted past its limit, and prints the
+allocation sites that grew most either way.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clock import VirtualClock, millis, monotonic
+from config import Config
+from gesture_detector import GestureDetector
+from history import render_timeline
+from keyboard_controller import KeyboardController, RecordingBackend, handle_gestures
+from synthetic import STREAMS
+
+FRAME_SIZE = (640, 480)
+TIMELINE_SIZE = (640, 110)
+TOP_ALLOCATORS = 10
+
+
+def parse_duration(text: str) -> float:
+    """Seconds from '90', '90s', '15m' or '12h'."""
+    scale = {'s': 1, 'm': 60, 'h': 3600}.get(text[-1:].lower())
+    return float(text[:-1]) * scale if scale else float(text)
+
+
+def rss_mb() -> Optional[float]:
+    """Resident set size in MB, or None where it can't be read."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def landmark_frames(path: Optional[str]) -> Tuple[List[list], List[float]]:
+    """Per-frame List[HandResult] from a session file, or the synthetic
+    streams, and the seconds since each frame's predecessor."""
+    if path is None:
+        stream = [frame for gen in STREAMS.values() for frame in gen(900)]
+        times = np.array([t for t, _ in stream])
+        return [hands for _, hands in stream], _intervals(times)
+    import session
+
+    s = session.load(path)
+    out = []
+    for lm in s.landmarks.astype(float):
+        hands = []
+        # Slot order is (left, right); MediaPipe's "Left" label is the right slot
+        for slot, label in ((0, "Right"), (1, "Left")):
+            if not np.isnan(lm[slot, 0, 0]):
+                hands.append(([tuple(p) for p in lm[slot]], label))
+        out.append(hands)
+    return out, _intervals(s.timestamps)
+
+
+def _intervals(times: np.ndarray) -> List[float]:
+    dt = np.diff(times)
+    # Stream restarts (and the loop back to frame 0) step by a typical frame
+    typical = float(np.median(dt[dt > 0])) if np.any(dt > 0) else 1 / 30
+    return [typical] + [float(d) if d > 0 else typical for d in dt]
+
+
+class Soak:
+    def __init__(self, cfg: Config, args):
+        self.cfg = cfg
+        self.args = args
+        self.video = None
+        if args.video:
+            import cv2
+
+            self.video = cv2.VideoCapture(args.video)
+            if not self.video.isOpened():
+                raise SystemExit(f"Cannot open {args.video}")
+            self.frames: List[list] = []
+            fps = self.video.get(cv2.CAP_PROP_FPS)
+            self.intervals = [1 / fps if fps and fps > 0 else 1 / 30]
+        else:
+            self.frames, self.intervals = landmark_frames(args.session)
+        self.virtual = args.fps <= 0
+        self.clock = VirtualClock() if self.virtual else monotonic
+        self.detector = GestureDetector(
+            cfg.thresholds, cfg.sensitivity, backend=cfg.landmark_backend if self.video else None,
+            model_path=cfg.hand_model_path or None, rules=cfg.rules(), clock=self.clock,
+            graphs=cfg.inference_graphs, pool=cfg.inference_pool,
+        )
+        self.detector.motion_enabled = cfg.motion_bound()
+        self.enabled = dict(cfg.enabled_gestures)
+        self.detector.set_enabled(cfg.enabled_rules(self.enabled))
+        self.recorder = RecordingBackend(millis(self.clock))
+        self.keyboard = KeyboardController(cfg.max_keys, backend=self.recorder, clock=millis(self.clock))
+        self.active_keys: Set[str] = set()
+        self.blank = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), np.uint8)
+        self.canvas = self.blank.copy()
+        self.index = 0
+        self.key_events = 0
+
+    def _next_video_frame(self):
+        import cv2
+
+        ok, bgr = self.video.read()
+        if not ok:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, bgr = self.video.read()
+            if not ok:
+                raise SystemExit("Cannot read video frames")
+        return cv2.cvtColor(cv2.flip(bgr, 1), cv2.COLOR_BGR2RGB)
+
+    def step(self):
+        """One frame through detection, key output and drawing."""
+        det = self.detector
+        if self.virtual:
+            self.clock.advance(self.intervals[self.index % len(self.intervals)])
+        if self.video is not None:
+            frame = self._next_video_frame()
+            state, frame = det.process(frame, True, rgb=True)
+        else:
+            state = det.process_landmarks(self.frames[self.index % len(self.frames)])
+            np.copyto(self.canvas, self.blank)
+            frame = self.canvas
+        self.index += 1
+        self.active_keys = handle_gestures(self.keyboard, state, self.cfg, self.enabled, self.active_keys)
+        det.draw(frame, True, True, rgb=True)
+        rows = det.history.window(self.cfg.timeline_seconds)
+        render_timeline(rows, self.cfg.timeline_seconds, TIMELINE_SIZE[0], TIMELINE_SIZE[1],
+                        self.cfg.thresholds.get('visual_max_angle', 60.0))
+
+    def sizes(self) -> Dict[str, int]:
+        """Containers that grow with keys, gestures or hands seen; all should plateau."""
+        det, kb = self.detector, self.keyboard
+        return {
+            'stability_pending': len(det.stability.pending),
+            'stability_confirmed': len(det.stability.confirmed),
+            'trail_points': sum(len(q) for q in det.trail.points.values()),
+            'trail_ids': len(det.trail.points),
+            'pwm_state': len(kb._pwm_state),
+            'taps': len(kb._taps),
+            'pressed': len(kb._pressed),
+            'motion_trail': sum(len(h.trail) for m in det.motions for h in m.hands),
+        }
+
+    def close(self):
+        self.keyboard.release_all()
+        self.detector.release()
+        if self.video is not None:
+            self.video.release()
+
+
+def sample(soak: Soak, elapsed: float, latencies: List[float], trace: bool) -> Dict:
+    lat = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(lat, (50, 95, 99))
+    # The recorder would otherwise be the biggest leak of all
+    soak.key_events += len(soak.recorder.events)
+    soak.recorder.clear()
+    return {
+        'elapsed': elapsed,
+        'frames': soak.index,
+        'rss_mb': rss_mb(),
+        'traced_mb': tracemalloc.get_traced_memory()[0] / 2**20 if trace else None,
+        'objects': len(gc.get_objects()),
+        'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99),
+        'sizes': soak.sizes(),
+    }
+
+
+def _fmt(v, spec: str) -> str:
+    return '-' if v is None else format(v, spec)
+
+
+def print_sample(s: Dict, tag: str = ''):
+    sizes = ' '.join(f"{v}" for v in s['sizes'].values())
+    print(f"{s['elapsed']:>8.0f}s {s['frames']:>10} {_fmt(s['rss_mb'], '>8.1f')} {_fmt(s['traced_mb'], '>8.2f')}"
+          f" {s['objects']:>8} {s['p50_ms']:>7.2f} {s['p95_ms']:>7.2f} {s['p99_ms']:>7.2f}  {sizes}{tag}")
+
+
+def check(base: Dict, last: Dict, args) -> List[str]:
+    """Drift from the baseline sample past the limits, as messages."""
+    out = []
+    if base['rss_mb'] is not None and last['rss_mb'] - base['rss_mb'] > args.max_rss_mb:
+        out.append(f"RSS grew {last['rss_mb'] - base['rss_mb']:.1f} MB (limit {args.max_rss_mb})")
+    if base['traced_mb'] is not None and last['traced_mb'] - base['traced_mb'] > args.max_traced_mb:
+        out.append(f"traced memory grew {last['traced_mb'] - base['traced_mb']:.2f} MB (limit {args.max_traced_mb})")
+    if last['objects'] - base['objects'] > args.max_objects:
+        out.append(f"live objects grew by {last['objects'] - base['objects']} (limit {args.max_objects})")
+    for p in ('p50_ms', 'p99_ms'):
+        if last[p] > base[p] * (1 + args.max_latency_growth):
+            out.append(f"{p[:3]} latency {base[p]:.2f} -> {last[p]:.2f} ms (limit +{args.max_latency_growth:.0%})")
+    for name, n in last['sizes'].items():
+        # Bounded structures plateau once every key/hand has been seen
+        b = base['sizes'][name]
+        if n > 2 * b + 16:
+            out.append(f"{name} grew {b} -> {n}")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument('--session', help='replay a recorded session (.npz) instead of the synthetic streams')
+    src.add_argument('--video', help='run a video through the landmark model as well')
+    ap.add_argument('--duration', type=parse_duration, default=600.0, help="run time, e.g. 600, 30m, 12h")
+    ap.add_argument('--interval', type=parse_duration, default=30.0, help='time between samples')
+    ap.add_argument('--warmup', type=parse_duration, default=30.0, help='time before the baseline sample')
+    ap.add_argument('--fps', type=float, default=30.0, help='frame rate to pace at (0 = flat out on a virtual clock)')
+    ap.add_argument('--no-tracemalloc', action='store_true', help='skip allocation tracing (lower overhead)')
+    ap.add_argument('--max-rss-mb', type=float, default=32.0)
+    ap.add_argument('--max-traced-mb', type=float, default=4.0)
+    ap.add_argument('--max-objects', type=int, default=10000)
+    ap.add_argument('--max-latency-growth', type=float, default=0.5, help='allowed p50/p99 increase (0.5 = +50%%)')
+    ap.add_argument('--json', help='write all samples and the verdict to this file')
+    args = ap.parse_args()
+
+    cfg = Config.load()
+    soak = Soak(cfg, args)
+    trace = not args.no_tracemalloc
+    if trace:
+        tracemalloc.start()
+    print(f"Soak for {args.duration:.0f}s at {args.fps or 'max'} fps, sampling every {args.interval:.0f}s "
+          f"(baseline after {args.warmup:.0f}s)\n")
+    print(f"{'elapsed':>9} {'frames':>10} {'rss MB':>8} {'traced':>8} {'objects':>8} {'p50':>7} {'p95':>7} {'p99':>7}"
+          f"  {' '.join(soak.sizes())}")
+
+    samples: List[Dict] = []
+    base: Optional[Dict] = None
+    base_snapshot = None
+    latencies: List[float] = []
+    frame_s = 1.0 / args.fps if args.fps > 0 else 0.0
+    start = time.perf_counter()
+    next_sample = args.warmup
+    next_frame = start
+    try:
+        while True:
+            now = time.perf_counter()
+            elapsed = now - start
+            done = elapsed >= args.duration
+            if elapsed >= next_sample or done:
+                if base is None and trace:
+                    # Before sampling: the snapshot's own objects count from the baseline on
+                    base_snapshot = tracemalloc.take_snapshot()
+                s = sample(soak, elapsed, latencies, trace)
+                latencies = []
+                samples.append(s)
+                if base is None:
+                    base = s
+                print_sample(s, '  (baseline)' if s is base else '')
+                if done:
+                    break
+                while next_sample <= elapsed:
+                    next_sample += args.interval
+                continue
+            if frame_s:
+                if now < next_frame:
+                    time.sleep(min(next_frame - now, next_sample - elapsed, args.duration - elapsed))
+                    continue
+                # Behind by more than a frame (e.g. the sample above): don't try to catch up
+                next_frame = max(next_frame + frame_s, now)
+            t0 = time.perf_counter()
+            soak.step()
+            latencies.append(time.perf_counter() - t0)
+    except KeyboardInterrupt:
+        print("Interrupted")
+        if latencies:
+            samples.append(sample(soak, time.perf_counter() - start, latencies, trace))
+    finally:
+        soak.close()
+
+    if base is None or len(samples) < 2:
+        print("\nRun ended before a second sample; nothing to compare")
+        return
+    last = samples[-1]
+    print(f"\n{soak.index} frames, {soak.key_events} key events in {last['elapsed']:.0f}s")
+    if base_snapshot is not None:
+        diff = tracemalloc.take_snapshot().compare_to(base_snapshot, 'lineno')
+        print("\nTop allocation changes since the baseline:")
+        for stat in diff[:TOP_ALLOCATORS]:
+            print(f"  {stat.size_diff / 1024:>+9.1f} KiB {stat.count_diff:>+7}  {stat.traceback}")
+    problems = check(base, last, args)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'samples': samples, 'problems': problems}, f, indent=2)
+    if problems:
+        print(f"\nDRIFT: {'; '.join(problems)}")
+        sys.exit(1)
+    print("\nNo drift past the limits")
+
+
+if __name__ == "__main__":
+    main()
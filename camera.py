@@ -0,0 +1,129 @@
+import sys
+import time
+import cv2
+from typing import Callable, Dict, List, Optional, Tuple
+
+WIDTH, HEIGHT, FPS = 640, 480, 30
+
+# '' leaves the pixel format to the driver
+PIXEL_FORMATS = ['MJPG', 'YUYV', '']
+PROBE_WARMUP = 1.0  # Seconds a probed combination gets to deliver a real frame
+MEASURE_FRAMES = 5
+
+
+def candidate_backends() -> List[int]:
+    """Capture backends worth probing on this platform, most likely first."""
+    if sys.platform.startswith('win'):
+        return [cv2.CAP_DSHOW, cv2.CAP_MSMF]
+    if sys.platform == 'darwin':
+        return [cv2.CAP_AVFOUNDATION]
+    return [cv2.CAP_V4L2, cv2.CAP_ANY]
+
+
+def backend_name(api: int) -> str:
+    try:
+        return cv2.videoio_registry.getBackendName(api)
+    except Exception:
+        return str(api)
+
+
+def _open(index: int, backend: int, fourcc: str) -> Optional[cv2.VideoCapture]:
+    """Open with resolution/FPS/format applied at open time instead of one set() each."""
+    params = [cv2.CAP_PROP_FRAME_WIDTH, WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT, cv2.CAP_PROP_FPS, FPS]
+    if fourcc:
+        params += [cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc)]
+    try:
+        cap = cv2.VideoCapture(index, backend, params)
+    except Exception:
+        return None
+    if not cap.isOpened():
+        cap.release()
+        return None
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def warm_up(cap: cv2.VideoCapture, timeout: float = 2.0) -> bool:
+    """Read until the camera delivers a real (non-black) frame or time runs out."""
+    deadline = time.monotonic() + timeout
+    frame = None
+    while time.monotonic() < deadline:
+        ret, frame = cap.read(frame)
+        if ret and frame is not None and frame.any():
+            return True
+    return False
+
+
+def _measure(cap: cv2.VideoCapture, frames: int = MEASURE_FRAMES) -> float:
+    """Seconds to deliver `frames` frames after warm-up (lower is better)."""
+    t0 = time.monotonic()
+    frame = None
+    for _ in range(frames):
+        ret, frame = cap.read(frame)
+        if not ret:
+            return float('inf')
+    return time.monotonic() - t0
+
+
+def probe(
+    index: int, on_probe: Optional[Callable[[str, str], None]] = None
+) -> Tuple[Optional[cv2.VideoCapture], Optional[Dict]]:
+    """Try backend/pixel-format pairs, most likely first, and keep the fastest open.
+
+    Stops at the first pair that reads at the target FPS, so a working
+    camera is usually found on the first try. `on_probe(backend name,
+    fourcc)` is called before each attempt, e.g. to show progress.
+    """
+    best_cap, best_profile, best_time = None, None, float('inf')
+    for backend in candidate_backends():
+        for fourcc in PIXEL_FORMATS:
+            if on_probe:
+                on_probe(backend_name(backend), fourcc or 'default')
+            t0 = time.monotonic()
+            cap = _open(index, backend, fourcc)
+            if cap is None:
+                continue
+            if not warm_up(cap, PROBE_WARMUP):
+                cap.release()
+                continue
+            read = _measure(cap)
+            total = (time.monotonic() - t0) + read
+            if total < best_time:
+                if best_cap is not None:
+                    best_cap.release()
+                best_cap, best_time = cap, total
+                best_profile = {
+                    'backend': backend,
+                    'backend_name': backend_name(backend),
+                    'fourcc': fourcc,
+                    'probe_time': round(total, 3),
+                }
+                # Full frame rate (within 10%): nothing left to gain from probing on
+                if read * FPS <= MEASURE_FRAMES * 1.1:
+                    return best_cap, best_profile
+            else:
+                cap.release()
+    return best_cap, best_profile
+
+
+def open_camera(
+    index: int, profiles: Dict[str, Dict], on_probe: Optional[Callable[[str, str], None]] = None
+) -> Optional[cv2.VideoCapture]:
+    """Open a camera, reusing the cached backend/format for it when available.
+
+    `profiles` is Config.camera_profiles; it is updated in place when a probe
+    finds a new working combination (and pruned when a cached one fails).
+    """
+    key = str(index)
+    prof = profiles.get(key)
+    if prof:
+        cap = _open(index, prof['backend'], prof.get('fourcc', ''))
+        if cap is not None and warm_up(cap):
+            return cap
+        if cap is not None:
+            cap.release()
+        del profiles[key]
+    cap, prof = probe(index, on_probe)
+    if cap is not None:
+        profiles[key] = prof
+    return cap
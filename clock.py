@@ -0,0 +1,38 @@
+"""Clocks for everything that measures time between frames.
+
+A clock is any callable returning seconds as a float. GestureDetector,
+StabilityFilter, IdleMonitor and the GUI take one (KeyboardController
+takes milliseconds, see millis()). Live code uses the real monotonic
+clock, so a wall-clock adjustment can't stretch a filter delay or a PWM
+pulse. Replays, benchmarks and tests pass a VirtualClock and move it to
+each frame's timestamp, so a recording runs as fast as the CPU allows and
+gives the same results every time, whatever the machine's load.
+"""
+import time
+from typing import Callable
+
+Clock = Callable[[], float]
+
+# The real clock; only differences between its readings mean anything
+monotonic: Clock = time.monotonic
+
+
+class VirtualClock:
+    """Time that only moves when told to, e.g. to each replayed frame's timestamp."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def set(self, t: float):
+        self.now = t
+
+    def advance(self, dt: float):
+        self.now += dt
+
+
+def millis(clock: Clock) -> Callable[[], float]:
+    """`clock` in milliseconds, for KeyboardController and RecordingBackend."""
+    return lambda: clock() * 1000
@@ -1,123 +1,191 @@
-import json
-import os
-from dataclasses import dataclass, field, asdict
-from typing import Dict
-
-CONFIG_DIR = os.path.expanduser("~/.gesture_gaming")
-CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
-
-DEFAULT_KEYBINDINGS = {
-    "steer_left": "a",
-    "steer_right": "d",
-    "hands_close": "space",
-    "hands_far": "shift",
-    "left_forward": "up",
-    "left_backward": "down",
-    "right_forward": "w",
-    "right_backward": "s",
-}
-
-DEFAULT_ENABLED = {
-    "steer_left": True,
-    "steer_right": True,
-    "hands_close": True,
-    "hands_far": False,
-    "left_forward": False,
-    "left_backward": False,
-    "right_forward": True,
-    "right_backward": True,
-}
-
-DEFAULT_THRESHOLDS = {
-    "steering_angle": 35.0,
-    "hands_close_dist": 0.12,
-    "hands_far_dist": 0.55,
-    "finger_extend_thresh": 0.06,
-    "stability_delay": 0.18,
-    "dead_zone_ratio": 0.3,
-    "visual_max_angle": 60.0,
-    "steering_dy_scale": 180.0,
-}
-
-DEFAULT_SENSITIVITY = {
-    "steering": 1.0,
-    "fingers": 1.0,
-    "distance": 1.0,
-    "steering_strength": 1.0,
-}
-
-PROFILES = {
-    "racing": {
-        "max_keys": 4,
-        "stability_delay": 0.15,
-        "steering_angle": 30.0,
-        "dead_zone_ratio": 0.25,
-        "steering_strength": 1.5,
-    },
-    "action": {
-        "max_keys": 3,
-        "stability_delay": 0.18,
-        "steering_angle": 35.0,
-        "dead_zone_ratio": 0.3,
-        "steering_strength": 1.0,
-    },
-    "casual": {
-        "max_keys": 2,
-        "stability_delay": 0.22,
-        "steering_angle": 40.0,
-        "dead_zone_ratio": 0.35,
-        "steering_strength": 0.8,
-    },
-}
-
-@dataclass
-class Config:
-    keybindings: Dict[str, str] = field(default_factory=lambda: DEFAULT_KEYBINDINGS.copy())
-    enabled_gestures: Dict[str, bool] = field(default_factory=lambda: DEFAULT_ENABLED.copy())
-    thresholds: Dict[str, float] = field(default_factory=lambda: DEFAULT_THRESHOLDS.copy())
-    sensitivity: Dict[str, float] = field(default_factory=lambda: DEFAULT_SENSITIVITY.copy())
-    camera_index: int = 0
-    max_keys: int = 4
-    stability_mode: bool = True
-    show_skeleton: bool = True
-    show_trails: bool = True
-    mirror_mode: bool = True
-
-    def save(self):
-        os.makedirs(CONFIG_DIR, exist_ok=True)
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(asdict(self), f, indent=2)
-
-    @classmethod
-    def load(cls) -> 'Config':
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    data = json.load(f)
-                c = cls()
-                for k, v in data.items():
-                    if hasattr(c, k):
-                        if isinstance(getattr(c, k), dict) and isinstance(v, dict):
-                            getattr(c, k).update(v)
-                        else:
-                            setattr(c, k, v)
-                return c
-            except Exception:
-                pass
-        return cls()
-
-    def apply_profile(self, name: str):
-        if name in PROFILES:
-            p = PROFILES[name]
-            self.max_keys = p.get("max_keys", self.max_keys)
-            for key in ["stability_delay", "steering_angle", "dead_zone_ratio"]:
-                if key in p:
-                    self.thresholds[key] = p[key]
-            if "steering_strength" in p:
-                self.sensitivity["steering_strength"] = p["steering_strength"]
-
-    def reset(self):
-        self.keybindings = DEFAULT_KEYBINDINGS.copy()
-        self.enabled_gestures = DEFAULT_ENABLED.copy()
-        self.thresholds = DEFAULT_THRESHOLDS.copy()
-        self.sensitivity = DEFAULT_SENSITIVITY.copy()
+import copy
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+from gesture_rules import BUILTIN_RULES
+from motion_gestures import MOTION_NAMES
+
+CONFIG_DIR = os.path.expanduser("~/.gesture_gaming")
+CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+
+DEFAULT_KEYBINDINGS = {
+    "steer_left": "a",
+    "steer_right": "d",
+    "hands_close": "space",
+    "hands_far": "shift",
+    "left_forward": "up",
+    "left_backward": "down",
+    "right_forward": "w",
+    "right_backward": "s",
+}
+# Motion gestures (swipes, pushes, taps, holds) are unbound until given a key
+DEFAULT_KEYBINDINGS.update({name: "" for name in MOTION_NAMES})
+
+DEFAULT_ENABLED = {
+    "steer_left": True,
+    "steer_right": True,
+    "hands_close": True,
+    "hands_far": False,
+    "left_forward": False,
+    "left_backward": False,
+    "right_forward": True,
+    "right_backward": True,
+}
+
+DEFAULT_THRESHOLDS = {
+    "steering_angle": 35.0,
+    "hands_close_dist": 0.12,
+    "hands_far_dist": 0.55,
+    "finger_extend_thresh": 0.06,
+    "stability_delay": 0.18,
+    "dead_zone_ratio": 0.3,
+    "visual_max_angle": 60.0,
+    "steering_dy_scale": 180.0,
+    "motion_threshold": 2.0,
+    "motion_refresh": 6,
+    "predict_horizon_ms": 0.0,
+    "swipe_dist": 0.18,
+    "swipe_window": 0.3,
+    "push_ratio": 1.3,
+    "pinch_ratio": 0.35,
+    "double_tap_window": 0.4,
+    "hold_ms": 600,
+    "motion_cooldown": 0.5,
+}
+
+DEFAULT_SENSITIVITY = {
+    "steering": 1.0,
+    "fingers": 1.0,
+    "distance": 1.0,
+    "steering_strength": 1.0,
+}
+
+PROFILES = {
+    "racing": {
+        "max_keys": 4,
+        "stability_delay": 0.15,
+        "steering_angle": 30.0,
+        "dead_zone_ratio": 0.25,
+        "steering_strength": 1.5,
+    },
+    "action": {
+        "max_keys": 3,
+        "stability_delay": 0.18,
+        "steering_angle": 35.0,
+        "dead_zone_ratio": 0.3,
+        "steering_strength": 1.0,
+    },
+    "casual": {
+        "max_keys": 2,
+        "stability_delay": 0.22,
+        "steering_angle": 40.0,
+        "dead_zone_ratio": 0.35,
+        "steering_strength": 0.8,
+    },
+}
+
+@dataclass
+class Config:
+    keybindings: Dict[str, str] = field(default_factory=lambda: DEFAULT_KEYBINDINGS.copy())
+    enabled_gestures: Dict[str, bool] = field(default_factory=lambda: DEFAULT_ENABLED.copy())
+    thresholds: Dict[str, float] = field(default_factory=lambda: DEFAULT_THRESHOLDS.copy())
+    sensitivity: Dict[str, float] = field(default_factory=lambda: DEFAULT_SENSITIVITY.copy())
+    camera_index: int = 0
+    max_keys: int = 4
+    stability_mode: bool = True
+    show_skeleton: bool = True
+    show_trails: bool = True
+    mirror_mode: bool = True
+    capture_timeout: float = 2.0  # Seconds before a cap.read() counts as stalled
+    camera_profiles: Dict[str, Dict] = field(default_factory=dict)  # Probed backend/format per camera index
+    idle_timeout: float = 10.0  # Seconds without hands before power saving (0 = never)
+    idle_fps: int = 10
+    idle_refresh: int = 30  # Max frames between forced inferences while idle
+    paused_fps: int = 0  # Camera FPS while paused (0 = keep the current rate)
+    players: List[Dict] = field(default_factory=list)  # Per-player sections for multiplayer.py
+    global_max_keys: int = 8  # Key limit shared by all players in multiplayer mode
+    player_assignment: str = 'region'  # Players sharing a camera: 'region' or 'tracking'
+    landmark_backend: str = 'solutions'  # 'solutions' (legacy, blocking) or 'tasks' (LIVE_STREAM)
+    hand_model_path: str = ''  # hand_landmarker.task for the tasks backend ('' = default location)
+    inference_graphs: int = 1  # >1: that many graphs on consecutive frames (graph_pool.py)
+    inference_pool: str = 'thread'  # Where pooled graphs run: 'thread' or 'process'
+    custom_profiles: Dict[str, Dict] = field(default_factory=dict)  # Saved profiles (e.g. from tune.py)
+    state_server: str = ''  # Stream GestureState to local clients: '' (off), 'udp' or 'ws'
+    state_port: int = 47800
+    state_landmarks: bool = False  # Include hand landmarks in streamed records
+    preview_port: int = 0  # MJPEG preview of the annotated view over HTTP (0 = off)
+    preview_host: str = '127.0.0.1'  # '0.0.0.0' to watch from other machines
+    preview_fps: float = 10.0
+    timeline_seconds: float = 10.0  # Gesture timeline under the camera view (0 = hidden)
+    gesture_rules: Dict[str, Dict] = field(default_factory=dict)  # Extra pose gestures / built-in overrides (gesture_rules.py)
+
+    def save(self):
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        with open(CONFIG_FILE, 'w') as f:
+            json.dump(asdict(self), f, indent=2)
+
+    @classmethod
+    def load(cls) -> 'Config':
+        if os.path.exists(CONFIG_FILE):
+            try:
+                with open(CONFIG_FILE, 'r') as f:
+                    data = json.load(f)
+                c = cls()
+                c._merge(data)
+                return c
+            except Exception:
+                pass
+        return cls()
+
+    def _merge(self, data: Dict):
+        for k, v in data.items():
+            if hasattr(self, k):
+                if isinstance(getattr(self, k), dict) and isinstance(v, dict):
+                    getattr(self, k).update(v)
+                else:
+                    setattr(self, k, v)
+
+    def for_player(self, index: int) -> 'Config':
+        """Config for one multiplayer seat: these settings overlaid with players[index]."""
+        c = copy.deepcopy(self)
+        c.players = []
+        c._merge(copy.deepcopy(self.players[index]))
+        return c
+
+    def profile_names(self) -> List[str]:
+        return list(PROFILES) + [n for n in self.custom_profiles if n not in PROFILES]
+
+    def apply_profile(self, name: str):
+        p = PROFILES.get(name) or self.custom_profiles.get(name)
+        if p:
+            self.max_keys = p.get("max_keys", self.max_keys)
+            for key in p:
+                if key in self.thresholds:
+                    self.thresholds[key] = p[key]
+            if "steering_strength" in p:
+                self.sensitivity["steering_strength"] = p["steering_strength"]
+
+    def rules(self) -> Dict[str, Dict]:
+        """Built-in gesture rules with gesture_rules added or replacing them by name."""
+        return dict(BUILTIN_RULES, **self.gesture_rules)
+
+    def custom_gestures(self) -> List[str]:
+        """Names of the pose gestures defined only in gesture_rules."""
+        return [name for name in self.gesture_rules if name not in BUILTIN_RULES]
+
+    def enabled_rules(self, enabled: Optional[Dict[str, bool]] = None) -> List[str]:
+        """Rule names switched on in `enabled` (default enabled_gestures); unlisted rules are on."""
+        enabled = self.enabled_gestures if enabled is None else enabled
+        return [name for name in self.rules() if enabled.get(name, True)]
+
+    def motion_bound(self) -> bool:
+        """True if any motion gesture has a key (the detector skips them otherwise)."""
+        return any(self.keybindings.get(name) for name in MOTION_NAMES)
+
+    def reset(self):
+        self.keybindings = DEFAULT_KEYBINDINGS.copy()
+        self.enabled_gestures = DEFAULT_ENABLED.copy()
+        self.thresholds = DEFAULT_THRESHOLDS.copy()
+        self.sensitivity = DEFAULT_SENSITIVITY.copy()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Extract hand landmarks from recorded videos into session files.
+
+    python extract.py recordings/ sessions/ --workers 8
+
+Every video under the input directory becomes one session (.npz, see
+session.py) at the same relative path under the output directory, with
+unlabeled frames and the video's own timestamps. Those replay through
+gesture_batch, benchmarks and tune.py like a recorded session.
+
+Videos are spread over a process pool, largest first. Each video gets a
+fresh landmark model (the configured backend, with GestureDetector's
+settings), so hand tracking never carries over from one video into the
+next. A decode thread per worker reads and converts frames ahead of
+inference, so the model is never waiting on the decoder. Sessions are
+written to a temporary file and renamed when complete, so an interrupted
+run resumes by skipping videos whose session already exists (--overwrite
+redoes them).
+
+Frames are mirrored like the live app's Mirror Mode unless --no-mirror is
+given, so hand sides come out as they would in the GUI.
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v')
+DECODE_AHEAD = 16  # Frames a worker's decode thread may read ahead of inference
+PROGRESS_EVERY = 50  # Frames between updates of the shared progress counter
+
+
+def find_videos(root: str) -> List[str]:
+    out = []
+    for dirpath, _, files in os.walk(root):
+        out += [os.path.join(dirpath, f) for f in files if f.lower().endswith(VIDEO_EXTENSIONS)]
+    return sorted(out)
+
+
+def output_path(video: str, root: str, out_dir: str) -> str:
+    return os.path.join(out_dir, os.path.splitext(os.path.relpath(video, root))[0] + '.npz')
+
+
+def frame_count(video: str) -> int:
+    import cv2
+
+    cap = cv2.VideoCapture(video)
+    try:
+        return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        cap.release()
+
+
+# ---------------------------------------------------------------- workers
+
+_backend = 'solutions'
+_model_path: Optional[str] = None
+_mirror = True
+_progress = None  # Shared frame counter for the progress line
+
+
+def _init_worker(backend: str, model_path: Optional[str], mirror: bool, progress):
+    global _backend, _model_path, _mirror, _progress
+    import cv2
+
+    # One process per core already; OpenCV's own threads would only contend
+    cv2.setNumThreads(1)
+    _backend, _model_path, _mirror, _progress = backend, model_path, mirror, progress
+
+
+def _build_source():
+    # Built per video rather than in the initializer: a pool respawns workers
+    # whose initializer fails, forever
+    from landmark_sources import make_source
+
+    return make_source(_backend, 2, _model_path, video=True)
+
+
+def _decode(cap, fps: float, frames: queue.Queue, stop: threading.Event, errors: List[str]):
+    """Read, mirror and convert frames ahead of inference; None marks the end.
+
+    A decode error is appended to `errors`; the end is marked either way.
+    """
+    import cv2
+
+    i = 0
+    try:
+        while not stop.is_set():
+            ok, bgr = cap.read()
+            if not ok:
+                break
+            if _mirror:
+                bgr = cv2.flip(bgr, 1)
+            frames.put((i / fps, cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)))
+            i += 1
+    except Exception as e:
+        errors.append(f"decoding failed at frame {i}: {e}")
+    finally:
+        frames.put(None)
+
+
+def _extract(job: Tuple[str, str]) -> Tuple[str, int, float, Optional[str]]:
+    """(video, frames, seconds, error) after writing the video's session."""
+    import cv2
+    import session
+
+    video, out = job
+    t0 = time.time()
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        return video, 0, 0.0, "cannot open video"
+    try:
+        source = _build_source()
+    except Exception as e:
+        cap.release()
+        return video, 0, 0.0, f"cannot load the landmark model: {e}"
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    fps = fps if fps and fps > 0 else 30.0
+    tasks = _backend == 'tasks'
+
+    frames: queue.Queue = queue.Queue(DECODE_AHEAD)
+    stop = threading.Event()
+    errors: List[str] = []
+    decoder = threading.Thread(target=_decode, args=(cap, fps, frames, stop, errors), daemon=True)
+    decoder.start()
+    timestamps: List[float] = []
+    landmarks: List[np.ndarray] = []
+    pending = 0
+    try:
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+            t, rgb = item
+            results = source.process(rgb, int(t * 1000)) if tasks else source.process(rgb)
+            lm = np.full((2, 21, 2), np.nan, np.float32)
+            for pts, label in results:
+                # Same slots as GestureDetector: MediaPipe's "Left" is the right hand
+                lm[1 if label == "Left" else 0] = pts
+            timestamps.append(t)
+            landmarks.append(lm)
+            pending += 1
+            if pending == PROGRESS_EVERY:
+                with _progress.get_lock():
+                    _progress.value += pending
+                pending = 0
+    except Exception as e:
+        return video, len(timestamps), time.time() - t0, f"inference failed: {e}"
+    finally:
+        stop.set()
+        # Unblock the decoder if it is waiting on a full queue
+        while decoder.is_alive():
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                decoder.join(0.01)
+        cap.release()
+        source.close()
+        with _progress.get_lock():
+            _progress.value += pending
+    if errors:
+        # Nothing is written: a session cut short would pass for a complete one
+        return video, len(timestamps), time.time() - t0, errors[0]
+
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    tmp = out[:-len('.npz')] + '.partial.npz'
+    arr = np.stack(landmarks) if landmarks else np.zeros((0, 2, 21, 2), np.float32)
+    session.save(tmp, timestamps, arr, meta={
+        'video': os.path.abspath(video), 'fps': fps, 'mirror': _mirror, 'backend': _backend,
+    })
+    os.replace(tmp, out)
+    return video, len(timestamps), time.time() - t0, None
+
+
+# ---------------------------------------------------------------- main
+
+def run(args):
+    videos = find_videos(args.input)
+    if not videos:
+        print(f"No videos found under {args.input}")
+        sys.exit(1)
+    jobs = [(v, output_path(v, args.input, args.output)) for v in videos]
+    done = [j for j in jobs if os.path.exists(j[1])]
+    if not args.overwrite:
+        jobs = [j for j in jobs if not os.path.exists(j[1])]
+    if not jobs:
+        print(f"  All {len(videos)} videos already extracted")
+        return
+
+    cfg = Config.load()
+    backend = args.backend or cfg.landmark_backend
+    sizes: Dict[str, int] = {v: frame_count(v) for v, _ in jobs}
+    # Longest first so one long video doesn't start last and run alone
+    jobs.sort(key=lambda j: -sizes[j[0]])
+    total = sum(sizes.values())
+    workers = min(args.workers or os.cpu_count() or 1, len(jobs))
+    skipped = f", {len(done)} already done" if done and not args.overwrite else ""
+    print(f"  {len(jobs)} videos ({total} frames{skipped}) on {workers} workers, backend '{backend}'")
+
+    ctx = multiprocessing.get_context('spawn')
+    progress = ctx.Value('q', 0)
+    t0 = time.time()
+    failed = 0
+    with ctx.Pool(workers, _init_worker, (backend, cfg.hand_model_path or None, not args.no_mirror, progress)) as pool:
+        results = pool.imap_unordered(_extract, jobs)
+        finished = 0
+        while finished < len(jobs):
+            try:
+                video, n, secs, error = results.next(timeout=2.0)
+            except multiprocessing.TimeoutError:
+                frames = progress.value
+                elapsed = time.time() - t0
+                rate = frames / elapsed if elapsed > 0 else 0.0
+                pct = f" ({frames / total:.0%})" if total else ""
+                print(f"  ... {frames}{pct} frames, {rate:.0f} frames/s")
+                continue
+            finished += 1
+            name = os.path.relpath(video, args.input)
+            if error:
+                failed += 1
+                print(f"  [{finished}/{len(jobs)}] {name}: FAILED, {error}")
+            else:
+                print(f"  [{finished}/{len(jobs)}] {name}: {n} frames in {secs:.1f}s ({n / secs if secs else 0:.0f} fps)")
+    elapsed = time.time() - t0
+    frames = progress.value
+    print(f"  Done in {elapsed:.1f}s: {frames} frames, {frames / elapsed if elapsed else 0:.0f} frames/s"
+          + (f", {failed} failed" if failed else ""))
+    if failed:
+        sys.exit(1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Extract hand landmarks from a directory of videos into session files.")
+    ap.add_argument('input', help='directory searched recursively for videos')
+    ap.add_argument('output', help='directory for the session files')
+    ap.add_argument('--workers', type=int, help='processes (default: one per CPU)')
+    ap.add_argument('--backend', choices=('solutions', 'tasks'), help='landmark backend (default: from config.json)')
+    ap.add_argument('--no-mirror', action='store_true', help="don't mirror frames (video is already mirrored)")
+    ap.add_argument('--overwrite', action='store_true', help='redo videos that already have a session')
+    run(ap.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import threading
+import cv2
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class FramePool:
+    """Pool of preallocated frame buffers, reused through OpenCV's dst= outputs."""
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self._free: Dict[Tuple, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.allocated = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+            self.allocated += 1
+        return np.empty(shape, dtype)
+
+    def release(self, buf: Optional[np.ndarray]):
+        if buf is None:
+            return
+        key = (buf.shape, buf.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.size and not any(b is buf for b in free):
+                free.append(buf)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+
+class FramePipeline:
+    """Capture -> mirror -> RGB, done once per frame into pooled buffers.
+
+    The RGB buffer returned by `next` is shared by inference, drawing and
+    display; hand it back with `release` once the frame has been shown.
+    """
+
+    def __init__(self, pool: Optional[FramePool] = None):
+        self.pool = pool or FramePool()
+        self._shape: Optional[Tuple[int, ...]] = None
+
+    def read(self, cap) -> Optional[np.ndarray]:
+        """Read a BGR frame into a pooled buffer (None if the read failed)."""
+        raw = self.pool.acquire(self._shape) if self._shape else None
+        ret, frame = cap.read(raw) if raw is not None else cap.read()
+        if not ret or frame is None:
+            self.pool.release(raw)
+            return None
+        if frame is not raw:
+            # First frame, or the camera changed resolution
+            self.pool.release(raw)
+            self._shape = frame.shape
+        return frame
+
+    def prepare(self, frame: np.ndarray, mirror: bool) -> np.ndarray:
+        """Convert a BGR frame to RGB (and mirror it) into a pooled buffer."""
+        rgb = self.pool.acquire(frame.shape)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        if mirror:
+            cv2.flip(rgb, 1, dst=rgb)
+        return rgb
+
+    def next(self, cap, mirror: bool) -> Optional[np.ndarray]:
+        frame = self.read(cap)
+        if frame is None:
+            return None
+        rgb = self.prepare(frame, mirror)
+        self.pool.release(frame)
+        return rgb
+
+    def release(self, buf: Optional[np.ndarray]):
+        self.pool.release(buf)
@@ -0,0 +1,150 @@
+"""Whole-session gesture evaluation with NumPy.
+
+`evaluate` takes a (T, 2, 21, 2) landmark array (hand slots: left, right;
+NaN where a hand is missing) plus per-frame timestamps and returns every
+GestureState field as a column. Smoothers and stability filters are
+replayed in closed form rather than frame by frame, and every step
+follows the streaming code's arithmetic, so the columns equal what
+GestureDetector.process_landmarks() produces for the same frames when its
+stability filter sees the same timestamps. Steering prediction
+(predict_horizon_ms) is not modelled; sessions are evaluated without it.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+import gesture_vec
+from gesture_detector import GESTURE_NAMES
+from gesture_rules import BUILTIN_RULES, RuleSet
+from landmark_sources import HandResult
+
+
+@dataclass
+class BatchResult:
+    steering_angle: np.ndarray
+    steering_force: np.ndarray
+    hands_distance: np.ndarray
+    flags: Dict[str, np.ndarray]  # GESTURE_NAMES and rule names -> (T,) bool
+
+    def bits(self) -> np.ndarray:
+        """(T,) int32 packed like GestureState.bits()."""
+        out = np.zeros(len(self.steering_angle), np.int32)
+        for i, name in enumerate(GESTURE_NAMES):
+            out |= self.flags[name].astype(np.int32) << i
+        return out
+
+
+def stack_hands(frames: Sequence[List[HandResult]]) -> np.ndarray:
+    """Landmark source output per frame -> (T, 2, 21, 2), slotted like _assign_hands."""
+    lm = np.full((len(frames), 2, 21, 2), np.nan)
+    for t, hands in enumerate(frames):
+        for pts, label in hands:
+            # MediaPipe's "Left" label goes to the right slot
+            lm[t, 1 if label == "Left" else 0] = pts
+    return lm
+
+
+def rolling_mean(values: np.ndarray, size: int) -> np.ndarray:
+    """Smoother(size).add() applied to each value in turn."""
+    n = len(values)
+    acc = np.zeros(n)
+    # sum() over the window, oldest first; leading zeros stand in for a short window
+    padded = np.concatenate([np.zeros(size - 1), values])
+    for k in range(size):
+        acc = acc + padded[k:k + n]
+    return acc / np.minimum(np.arange(1, n + 1), size)
+
+
+def stability(active: np.ndarray, times: np.ndarray, delay: float) -> np.ndarray:
+    """StabilityFilter.update() for one key over a sequence of updates.
+
+    A change is confirmed on the first later update at least `delay` after
+    the change began; a change that reverts before then is dropped. Runs
+    of equal input are handled as a whole, so the only per-run state is
+    whether the run differs from the confirmed value when it starts.
+    """
+    n = len(active)
+    if n == 0:
+        return np.zeros(0, bool)
+    idx = np.arange(n)
+    new_run = np.r_[True, active[1:] != active[:-1]]
+    starts = np.flatnonzero(new_run)
+    run_of = np.cumsum(new_run) - 1
+    begin = starts[run_of]
+
+    ok = (times - times[begin] >= delay) & (idx != begin)
+    first = np.minimum.reduceat(np.where(ok, idx, n), starts)
+    confirmable = first < n
+
+    # A run is pending (differs from the confirmed value) unless the run
+    # before it was itself pending and never confirmed. Within a streak of
+    # unconfirmable runs that alternates; the first run compares to False.
+    k = np.arange(len(starts))
+    anchor = np.maximum.accumulate(np.where(np.r_[True, confirmable[:-1]], k, 0))
+    run_val = active[starts]
+    pending = np.where(anchor == 0, run_val, (k - anchor) % 2 == 0)
+
+    hits = first[pending & confirmable]
+    last = np.full(n, -1)
+    last[hits] = hits
+    last = np.maximum.accumulate(last)
+    return np.where(last >= 0, active[np.maximum(last, 0)], False)
+
+
+def evaluate(
+    landmarks: np.ndarray,
+    timestamps: np.ndarray,
+    thresholds: Dict,
+    sensitivity: Dict,
+    use_stability: bool = True,
+    rules: Optional[Dict[str, Dict]] = None,
+) -> BatchResult:
+    """Evaluate a whole session; see the module docstring for the layout.
+
+    `rules` as for GestureDetector; flags holds every rule's column.
+    """
+    lm = np.asarray(landmarks, dtype=np.float64)
+    times = np.asarray(timestamps, dtype=np.float64)
+    T = len(lm)
+    has = ~np.isnan(lm[:, :, 0, 0])
+    both = has[:, 0] & has[:, 1]
+    delay = thresholds.get('stability_delay', 0.18)
+
+    def check(raw: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        # Stability keys are only updated on frames where the gesture is evaluated
+        out = np.zeros(T, bool)
+        sel = raw[mask]
+        out[mask] = stability(sel, times[mask], delay) if use_stability else sel
+        return out
+
+    flags = {name: np.zeros(T, bool) for name in GESTURE_NAMES}
+    flags['left_detected'] = has[:, 0].copy()
+    flags['right_detected'] = has[:, 1].copy()
+
+    thresh = thresholds.get('finger_extend_thresh', 0.06) / sensitivity.get('fingers', 1.0)
+    fingers = np.where(has, gesture_vec.finger_bits(lm, thresh), -1)
+
+    angle = np.zeros(T)
+    force = np.zeros(T)
+    dist = np.zeros(T)
+    pair = lm[both]
+    palms = gesture_vec.palm(pair)
+    dist[both] = rolling_mean(gesture_vec.distance(palms[:, 0], palms[:, 1]), 5)
+    raw_angle = gesture_vec.steering_angle(
+        pair[:, 0, 0], pair[:, 1, 0], thresholds.get('steering_dy_scale', 180.0)
+    )
+    angle[both] = rolling_mean(raw_angle, 12)
+
+    dead_zone = thresholds.get('dead_zone_ratio', 0.3)
+    normalized = gesture_vec.normalize_angle(angle, thresholds.get('visual_max_angle', 60.0))
+    force[both] = gesture_vec.progressive_force(normalized[both], dead_zone)
+
+    ruleset = RuleSet(BUILTIN_RULES if rules is None else rules, thresholds, sensitivity)
+    measures = np.stack([dist, normalized, angle], axis=1)
+    measures[~both] = np.nan
+    matched, evaluated = ruleset.evaluate_array(fingers[:, 0], fingers[:, 1], measures)
+    for i, name in enumerate(ruleset.names):
+        flags[name] = check((matched >> i) & 1 == 1, (evaluated >> i) & 1 == 1)
+
+    return BatchResult(angle, force, dist, flags)
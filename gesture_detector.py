@@ -1,440 +1,714 @@
-import cv2
-import mediapipe as mp
-import numpy as np
-from typing import Dict, Tuple, Optional, List
-from dataclasses import dataclass, field
-from utils import distance, Smoother, StabilityFilter, Trail
-
-
-@dataclass
-class Hand:
-    landmarks: list
-    side: str
-    wrist: Tuple[float, float]
-    thumb_tip: Tuple[float, float]
-    index_tip: Tuple[float, float]
-    middle_tip: Tuple[float, float]
-    ring_tip: Tuple[float, float]
-    pinky_tip: Tuple[float, float]
-    index_mcp: Tuple[float, float]
-    middle_mcp: Tuple[float, float]
-    ring_mcp: Tuple[float, float]
-    pinky_mcp: Tuple[float, float]
-    thumb_mcp: Tuple[float, float]
-    palm: Tuple[float, float]
-
-
-@dataclass
-class GestureState:
-    steer_left: bool = False
-    steer_right: bool = False
-    steering_angle: float = 0.0
-    steering_force: float = 0.0  # Progressive force 0.0 to 1.0
-    hands_close: bool = False
-    hands_far: bool = False
-    hands_distance: float = 0.0
-    left_forward: bool = False
-    left_backward: bool = False
-    right_forward: bool = False
-    right_backward: bool = False
-    left_detected: bool = False
-    right_detected: bool = False
-    active: List[str] = field(default_factory=list)
-
-
-class GestureDetector:
-    def __init__(self, thresholds: Dict, sensitivity: Dict):
-        self.thresholds = thresholds
-        self.sensitivity = sensitivity
-
-        self.mp_hands = mp.solutions.hands
-        self.hands = None
-        self._init()
-
-        # Smoothers and filters
-        self.steer_smooth = Smoother(12)
-        self.dist_smooth = Smoother(5)
-        self.stability = StabilityFilter(thresholds.get('stability_delay', 0.18))
-        self.trail = Trail()
-
-        self.left: Optional[Hand] = None
-        self.right: Optional[Hand] = None
-        self.state = GestureState()
-
-        # Visual steering state in [-1, 1] (for the ball position)
-        self.visual_steer_pos: float = 0.0
-
-    def _init(self):
-        if self.hands:
-            self.hands.close()
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.4,
-            min_tracking_confidence=0.35,
-            model_complexity=1,
-        )
-
-    def reset(self):
-        self._init()
-        self.steer_smooth.reset()
-        self.dist_smooth.reset()
-        self.stability.reset()
-        self.trail.clear()
-        self.visual_steer_pos = 0.0
-
-    def update_thresholds(self, t: Dict):
-        self.thresholds = t
-        self.stability.set_delay(t.get('stability_delay', 0.18))
-
-    def update_sensitivity(self, s: Dict):
-        self.sensitivity = s
-
-    def _extract(self, lm, side: str) -> Hand:
-        pts = [(l.x, l.y) for l in lm.landmark]
-        palm = (
-            sum(pts[i][0] for i in [0, 5, 9, 13, 17]) / 5,
-            sum(pts[i][1] for i in [0, 5, 9, 13, 17]) / 5,
-        )
-        return Hand(
-            landmarks=pts,
-            side=side,
-            wrist=pts[0],
-            thumb_tip=pts[4],
-            index_tip=pts[8],
-            middle_tip=pts[12],
-            ring_tip=pts[16],
-            pinky_tip=pts[20],
-            index_mcp=pts[5],
-            middle_mcp=pts[9],
-            ring_mcp=pts[13],
-            pinky_mcp=pts[17],
-            thumb_mcp=pts[2],
-            palm=palm,
-        )
-
-    def _is_finger_extended(
-        self,
-        tip: Tuple[float, float],
-        mcp: Tuple[float, float],
-        wrist: Tuple[float, float],
-        thresh: float,
-    ) -> bool:
-        tip_to_wrist = distance(tip, wrist)
-        mcp_to_wrist = distance(mcp, wrist)
-        return tip_to_wrist > mcp_to_wrist + thresh
-
-    def _is_thumb_extended(self, hand: Hand, thresh: float) -> bool:
-        thumb_to_pinky_mcp = distance(hand.thumb_tip, hand.pinky_mcp)
-        wrist_to_pinky_mcp = distance(hand.wrist, hand.pinky_mcp)
-        return thumb_to_pinky_mcp > wrist_to_pinky_mcp * 0.8
-
-    def _detect_finger_gesture(self, hand: Hand) -> Tuple[bool, bool]:
-        thresh = self.thresholds.get('finger_extend_thresh', 0.06)
-        sens = self.sensitivity.get('fingers', 1.0)
-        thresh = thresh / sens
-
-        index_ext = self._is_finger_extended(hand.index_tip, hand.index_mcp, hand.wrist, thresh)
-        middle_ext = self._is_finger_extended(hand.middle_tip, hand.middle_mcp, hand.wrist, thresh)
-        ring_ext = self._is_finger_extended(hand.ring_tip, hand.ring_mcp, hand.wrist, thresh)
-        pinky_ext = self._is_finger_extended(hand.pinky_tip, hand.pinky_mcp, hand.wrist, thresh)
-        thumb_ext = self._is_thumb_extended(hand, thresh)
-
-        forward = index_ext and middle_ext and not ring_ext and not pinky_ext
-        backward = thumb_ext and not index_ext and not middle_ext and not ring_ext and not pinky_ext
-        return forward, backward
-
-    def _calculate_steering_angle(
-        self, left_wrist: Tuple[float, float], right_wrist: Tuple[float, float]
-    ) -> float:
-        """Return a pseudo-angle proportional to vertical wrist difference."""
-        dy = right_wrist[1] - left_wrist[1]
-        scale = self.thresholds.get('steering_dy_scale', 180.0)
-        angle_deg = -dy * scale
-        return angle_deg
-
-    def _calculate_progressive_force(self, normalized_pos: float) -> float:
-        """Calculate progressive steering force based on position.
-        
-        Force increases linearly from dead zone edge to outer edge.
-        
-        Args:
-            normalized_pos: Position in [-1, 1] where 0 is center
-            
-        Returns:
-            Force value in [0, 1]
-        """
-        dead_zone = self.thresholds.get('dead_zone_ratio', 0.3)
-        
-        abs_pos = abs(normalized_pos)
-        
-        # Inside dead zone - no force
-        if abs_pos <= dead_zone:
-            return 0.0
-        
-        # Calculate position within active steering zone
-        # 0 at dead zone edge, 1 at full edge
-        active_range = 1.0 - dead_zone
-        if active_range <= 0:
-            return 0.0
-        
-        # Linear progression from dead zone edge to outer edge
-        force = (abs_pos - dead_zone) / active_range
-        
-        return min(1.0, max(0.0, force))
-
-    def process(self, frame: np.ndarray, use_stability: bool = True) -> Tuple[GestureState, np.ndarray]:
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        try:
-            results = self.hands.process(rgb)
-        except Exception:
-            self.reset()
-            results = self.hands.process(rgb)
-
-        self.left = None
-        self.right = None
-        s = GestureState()
-
-        # Hand detection
-        if results and results.multi_hand_landmarks and results.multi_handedness:
-            for lm, info in zip(results.multi_hand_landmarks, results.multi_handedness):
-                label = info.classification[0].label
-                hand = self._extract(lm, label)
-                if label == "Left":
-                    self.right = hand
-                    s.right_detected = True
-                else:
-                    self.left = hand
-                    s.left_detected = True
-
-        active: List[str] = []
-
-        def check(key, val):
-            return self.stability.update(key, val) if use_stability else val
-
-        # Finger gestures (forward/backward)
-        if self.left:
-            fwd, bwd = self._detect_finger_gesture(self.left)
-            s.left_forward = check('l_fwd', fwd)
-            s.left_backward = check('l_bwd', bwd)
-            if s.left_forward:
-                active.append("L-FORWARD")
-            if s.left_backward:
-                active.append("L-BACKWARD")
-
-        if self.right:
-            fwd, bwd = self._detect_finger_gesture(self.right)
-            s.right_forward = check('r_fwd', fwd)
-            s.right_backward = check('r_bwd', bwd)
-            if s.right_forward:
-                active.append("R-FORWARD")
-            if s.right_backward:
-                active.append("R-BACKWARD")
-
-        # Two-hand gestures: distance + steering
-        if self.left and self.right:
-            # Distance (close / far)
-            raw_dist = distance(self.left.palm, self.right.palm)
-            dist = self.dist_smooth.add(raw_dist)
-            s.hands_distance = dist
-
-            sens_dist = self.sensitivity.get('distance', 1.0)
-            close_t = self.thresholds.get('hands_close_dist', 0.12) / sens_dist
-            far_t = self.thresholds.get('hands_far_dist', 0.55) * sens_dist
-
-            s.hands_close = check('close', dist < close_t)
-            s.hands_far = check('far', dist > far_t)
-            if s.hands_close:
-                active.append("CLOSE")
-            if s.hands_far:
-                active.append("FAR")
-
-            # Steering calculation
-            raw_angle = self._calculate_steering_angle(self.left.wrist, self.right.wrist)
-            smooth_angle = self.steer_smooth.add(raw_angle)
-            s.steering_angle = smooth_angle
-
-            # Normalize to [-1, 1]
-            max_display_angle = self.thresholds.get('visual_max_angle', 60.0)
-            normalized = max(-1.0, min(1.0, smooth_angle / max_display_angle))
-            
-            # Calculate progressive force (0 in dead zone, increases linearly outside)
-            s.steering_force = self._calculate_progressive_force(normalized)
-            
-            # Get dead zone parameter
-            dead_zone = self.thresholds.get('dead_zone_ratio', 0.3)
-            
-            # Steer left/right when outside dead zone (ANY amount of force triggers steering)
-            # The force level determines PWM duty cycle, not whether to steer
-            s.steer_left = check('steer_l', normalized < -dead_zone)
-            s.steer_right = check('steer_r', normalized > dead_zone)
-
-            if s.steer_left:
-                active.append(f"STEER-L ({s.steering_force:.0%})")
-            if s.steer_right:
-                active.append(f"STEER-R ({s.steering_force:.0%})")
-
-            # Update visual ball position smoothly
-            alpha = 0.25
-            self.visual_steer_pos += (normalized - self.visual_steer_pos) * alpha
-
-        s.active = active
-        self.state = s
-        return s, frame
-
-    def draw(self, frame: np.ndarray, skeleton: bool = True, trails: bool = True) -> np.ndarray:
-        h, w = frame.shape[:2]
-        
-        # Get zone parameters
-        dead_zone = self.thresholds.get('dead_zone_ratio', 0.3)
-
-        def draw_hand(hand: Hand, color, highlight):
-            if not skeleton:
-                return
-            conns = [
-                (0, 1), (1, 2), (2, 3), (3, 4),
-                (0, 5), (5, 6), (6, 7), (7, 8),
-                (0, 9), (9, 10), (10, 11), (11, 12),
-                (0, 13), (13, 14), (14, 15), (15, 16),
-                (0, 17), (17, 18), (18, 19), (19, 20),
-                (5, 9), (9, 13), (13, 17),
-            ]
-            for a, b in conns:
-                p1 = (int(hand.landmarks[a][0] * w), int(hand.landmarks[a][1] * h))
-                p2 = (int(hand.landmarks[b][0] * w), int(hand.landmarks[b][1] * h))
-                cv2.line(frame, p1, p2, color, 2, cv2.LINE_AA)
-
-            for i, pt in enumerate(hand.landmarks):
-                px, py = int(pt[0] * w), int(pt[1] * h)
-                r = 5 if i in [4, 8, 12] else 3
-                col = highlight if i in [4, 8, 12] else color
-                cv2.circle(frame, (px, py), r, col, -1, cv2.LINE_AA)
-
-            if trails:
-                px, py = int(hand.palm[0] * w), int(hand.palm[1] * h)
-                self.trail.add(hand.side, (px, py))
-
-        # Draw hands
-        if self.left:
-            draw_hand(self.left, (0, 200, 150), (0, 255, 220))
-        if self.right:
-            draw_hand(self.right, (200, 120, 0), (255, 160, 40))
-
-        # Draw trails
-        if trails:
-            for tid, col in [("Right", (0, 200, 150)), ("Left", (200, 120, 0))]:
-                pts = self.trail.get(tid)
-                for i in range(1, len(pts)):
-                    a = i / len(pts)
-                    cv2.line(
-                        frame,
-                        pts[i - 1],
-                        pts[i],
-                        tuple(int(c * a) for c in col),
-                        max(1, int(3 * a)),
-                        cv2.LINE_AA,
-                    )
-
-        # Draw steering bar
-        if self.left and self.right:
-            # Line between wrists
-            lx, ly = int(self.left.wrist[0] * w), int(self.left.wrist[1] * h)
-            rx, ry = int(self.right.wrist[0] * w), int(self.right.wrist[1] * h)
-            cv2.line(frame, (lx, ly), (rx, ry), (0, 200, 255), 3, cv2.LINE_AA)
-
-            bar_y = h - 50
-            bar_left = 80
-            bar_right = w - 80
-            bar_width = bar_right - bar_left
-            bar_center = (bar_left + bar_right) // 2
-
-            # Background bar
-            cv2.rectangle(frame, (bar_left, bar_y - 20), (bar_right, bar_y + 20), (50, 50, 50), -1)
-            cv2.rectangle(frame, (bar_left, bar_y - 20), (bar_right, bar_y + 20), (80, 80, 100), 2)
-
-            # Calculate dead zone boundaries in pixels
-            dead_half = int(dead_zone * bar_width / 2)
-            left_dead = bar_center - dead_half
-            right_dead = bar_center + dead_half
-
-            # Draw gradient zones - left side (green gradient)
-            for x in range(bar_left, left_dead):
-                # Calculate intensity based on distance from dead zone
-                dist_from_dead = left_dead - x
-                max_dist = left_dead - bar_left
-                if max_dist > 0:
-                    intensity = dist_from_dead / max_dist
-                else:
-                    intensity = 0
-                g = int(60 + 140 * intensity)  # Green increases toward edge
-                cv2.line(frame, (x, bar_y - 18), (x, bar_y + 18), (0, g, 40), 1)
-
-            # Dead zone (center - gray)
-            cv2.rectangle(frame, (left_dead, bar_y - 18), (right_dead, bar_y + 18), (70, 70, 70), -1)
-
-            # Draw gradient zones - right side (blue gradient)
-            for x in range(right_dead, bar_right):
-                # Calculate intensity based on distance from dead zone
-                dist_from_dead = x - right_dead
-                max_dist = bar_right - right_dead
-                if max_dist > 0:
-                    intensity = dist_from_dead / max_dist
-                else:
-                    intensity = 0
-                b = int(60 + 140 * intensity)  # Blue increases toward edge
-                cv2.line(frame, (x, bar_y - 18), (x, bar_y + 18), (40, 40, b), 1)
-
-            # Zone boundary lines
-            cv2.line(frame, (left_dead, bar_y - 20), (left_dead, bar_y + 20), (100, 200, 100), 2)
-            cv2.line(frame, (right_dead, bar_y - 20), (right_dead, bar_y + 20), (100, 100, 200), 2)
-            cv2.line(frame, (bar_center, bar_y - 15), (bar_center, bar_y + 15), (200, 200, 200), 1)
-
-            # Ball position
-            angle_norm = max(-1.0, min(1.0, self.visual_steer_pos))
-            indicator_x = int(bar_center + angle_norm * (bar_width / 2))
-            indicator_x = max(bar_left + 12, min(bar_right - 12, indicator_x))
-
-            # Ball color based on force level
-            force = self.state.steering_force
-            if self.state.steer_left:
-                # Green intensity based on force
-                g = int(100 + 155 * force)
-                ind_color = (0, g, int(50 + 50 * force))
-                cv2.putText(frame, f"<< LEFT {force:.0%}", (bar_left, bar_y - 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, ind_color, 2)
-            elif self.state.steer_right:
-                # Blue intensity based on force
-                b = int(100 + 155 * force)
-                ind_color = (int(50 + 50 * force), int(50 + 50 * force), b)
-                cv2.putText(frame, f"RIGHT {force:.0%} >>", (bar_right - 150, bar_y - 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, ind_color, 2)
-            else:
-                ind_color = (180, 180, 180)
-
-            # Draw ball with glow effect based on force
-            if force > 0:
-                glow_radius = int(14 + 8 * force)
-                glow_color = tuple(int(c * 0.4) for c in ind_color)
-                cv2.circle(frame, (indicator_x, bar_y), glow_radius, glow_color, -1)
-            
-            cv2.circle(frame, (indicator_x, bar_y), 14, ind_color, -1)
-            cv2.circle(frame, (indicator_x, bar_y), 14, (255, 255, 255), 2)
-
-            # Debug text
-            ang = self.state.steering_angle
-            cv2.putText(frame, f"angle: {ang:5.1f}  force: {force:.0%}",
-                       (bar_center - 100, bar_y + 45),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.45, (180, 180, 180), 1)
-            cv2.putText(frame, "STEER", (bar_left - 5, bar_y - 25),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
-            
-            # Zone labels
-            cv2.putText(frame, "DEAD", (bar_center - 20, bar_y + 5),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.35, (120, 120, 120), 1)
-
-        return frame
-
-    def release(self):
-        if self.hands:
-            self.hands.close()
-            self.hands = None
+import cv2
+import numpy as np
+from typing import Dict, Iterable, Tuple, Optional, List
+from dataclasses import dataclass
+from functools import partial
+from utils import distance, Predictor, Smoother, StabilityFilter, Trail
+from clock import Clock, monotonic
+from supervisor import InferenceSupervisor
+from motion_gate import MotionGate
+from player_assignment import PlayerAssigner, Seat
+from landmark_sources import HandResult, make_source
+from graph_pool import GraphPool
+from history import GestureHistory
+from motion_gestures import MotionRecognizer
+from gesture_rules import BUILTIN_RULES, RuleSet
+import gesture_vec
+
+# Motion threshold while idle if gating is off (motion_threshold 0): a hand
+# coming back must still wake inference on its first frame
+IDLE_MOTION_THRESHOLD = 2.0
+
+
+@dataclass
+class Hand:
+    landmarks: list
+    side: str
+    wrist: Tuple[float, float]
+    thumb_tip: Tuple[float, float]
+    index_tip: Tuple[float, float]
+    middle_tip: Tuple[float, float]
+    ring_tip: Tuple[float, float]
+    pinky_tip: Tuple[float, float]
+    index_mcp: Tuple[float, float]
+    middle_mcp: Tuple[float, float]
+    ring_mcp: Tuple[float, float]
+    pinky_mcp: Tuple[float, float]
+    thumb_mcp: Tuple[float, float]
+    palm: Tuple[float, float]
+
+
+@dataclass
+class GestureState:
+    steer_left: bool = False
+    steer_right: bool = False
+    steering_angle: float = 0.0
+    steering_force: float = 0.0  # Progressive force 0.0 to 1.0
+    hands_close: bool = False
+    hands_far: bool = False
+    hands_distance: float = 0.0
+    left_forward: bool = False
+    left_backward: bool = False
+    right_forward: bool = False
+    right_backward: bool = False
+    left_detected: bool = False
+    right_detected: bool = False
+    events: Tuple[str, ...] = ()  # Motion gestures that fired this frame (motion_gestures)
+    extra: Tuple[str, ...] = ()  # Active gestures from Config.gesture_rules beyond the built-ins
+
+    @property
+    def active(self) -> List[str]:
+        """Display labels of the active gestures (built on demand, not per frame)."""
+        out = [text for on, text in (
+            (self.left_forward, "L-FORWARD"), (self.left_backward, "L-BACKWARD"),
+            (self.right_forward, "R-FORWARD"), (self.right_backward, "R-BACKWARD"),
+            (self.hands_close, "CLOSE"), (self.hands_far, "FAR"),
+        ) if on]
+        if self.steer_left:
+            out.append(f"STEER-L ({self.steering_force:.0%})")
+        if self.steer_right:
+            out.append(f"STEER-R ({self.steering_force:.0%})")
+        out += [name.upper() for name in self.extra]
+        return out
+
+    def bits(self) -> int:
+        """Pack the boolean gesture flags into an int (bit i = GESTURE_NAMES[i])."""
+        # Spelled out rather than looped over GESTURE_NAMES: called for every frame
+        return (
+            self.steer_left | self.steer_right << 1 | self.hands_close << 2 | self.hands_far << 3
+            | self.left_forward << 4 | self.left_backward << 5 | self.right_forward << 6
+            | self.right_backward << 7 | self.left_detected << 8 | self.right_detected << 9
+        )
+
+
+# Order of the gesture flags in GestureState.bits()
+GESTURE_NAMES = (
+    'steer_left', 'steer_right', 'hands_close', 'hands_far',
+    'left_forward', 'left_backward', 'right_forward', 'right_backward',
+    'left_detected', 'right_detected',
+)
+# Flags that are GestureState fields; other rule names go to GestureState.extra
+BUILTIN = frozenset(GESTURE_NAMES)
+
+
+class EvalPlan:
+    """What GestureDetector computes per frame for the enabled gestures."""
+
+    def __init__(self, rules: RuleSet):
+        self.rules = rules
+        self.fingers = rules.finger_hands  # (left, right): finger bits needed
+
+
+class GestureDetector:
+    def __init__(
+        self,
+        thresholds: Dict,
+        sensitivity: Dict,
+        seats: int = 1,
+        assignment: str = 'region',
+        backend: str = 'solutions',
+        model_path: Optional[str] = None,
+        rules: Optional[Dict[str, Dict]] = None,
+        clock: Optional[Clock] = None,
+        graphs: int = 1,
+        pool: str = 'thread',
+    ):
+        """`seats` > 1 tracks up to 2*seats hands and splits them into players.
+
+        `backend` picks the landmark source ('solutions' or 'tasks', see
+        landmark_sources); the gesture logic is the same for both. With
+        backend=None no model is loaded and only process_landmarks() works.
+        `rules` are the pose gestures (gesture_rules; default the built-ins).
+        `clock` (seconds, see clock.py) times filters, motion and prediction;
+        pass a VirtualClock to replay frames faster than real time.
+        `graphs` > 1 runs that many landmark graphs on consecutive frames
+        (graph_pool; `pool` is 'thread' or 'process'): more frames per
+        second at the cost of a few frames of lag. A pool has no warm
+        standby, which would be a second pool of as many graphs.
+        """
+        self.thresholds = thresholds
+        self.sensitivity = sensitivity
+        self.seats = max(1, seats)
+        self.backend = backend
+        self.model_path = model_path
+        self.clock = clock or monotonic
+        self.graphs = max(1, graphs)
+        self.pool = pool
+
+        self.supervisor: Optional[InferenceSupervisor] = None
+        self._init()
+
+        # Smoothers and filters
+        self.steer_smooth = Smoother(12)
+        self.dist_smooth = Smoother(5)
+        self.steer_smooths = [self.steer_smooth] + [Smoother(12) for _ in range(self.seats - 1)]
+        self.dist_smooths = [self.dist_smooth] + [Smoother(5) for _ in range(self.seats - 1)]
+        self.steer_predictors = [Predictor() for _ in range(self.seats)]
+        self.rules = BUILTIN_RULES if rules is None else rules
+        self.plan = EvalPlan(RuleSet(self.rules, thresholds, sensitivity))
+        self.stability = StabilityFilter(thresholds.get('stability_delay', 0.18), self.clock)
+        self.trail = Trail()
+        self.motion_gate = MotionGate(
+            thresholds.get('motion_threshold', 2.0), thresholds.get('motion_refresh', 6)
+        )
+        self.idle = False
+        self.idle_refresh = 30
+
+        self.left: Optional[Hand] = None
+        self.right: Optional[Hand] = None
+        self.state = GestureState()
+        # Seat 0's per-frame results, for the GUI timeline and debugging
+        self.history = GestureHistory()
+
+        # Multi-seat mode: hands and states per player, seat 0 mirrors left/right/state
+        self.assigner = PlayerAssigner(self.seats, assignment)
+        # Motion gestures per seat; off unless some are bound (set motion_enabled)
+        self.motion_enabled = False
+        self.motions = [MotionRecognizer(thresholds) for _ in range(self.seats)]
+        self.seat_hands: List[Seat] = [(None, None)] * self.seats
+        self.seat_states: List[GestureState] = [GestureState() for _ in range(self.seats)]
+
+        # Visual steering state in [-1, 1] (for the ball position)
+        self.visual_steer_pos: float = 0.0
+
+        # Measured capture-to-landmarks latency and frame interval (s), for prediction
+        self.latency = 0.0
+        self.frame_interval = 1 / 30
+        self._last_update: Optional[float] = None
+
+    def _build_source(self):
+        if self.graphs > 1:
+            # Pool workers need one result per frame, so 'tasks' runs in VIDEO mode there
+            return GraphPool(partial(make_source, self.backend, 2 * self.seats, self.model_path, video=True),
+                             self.graphs, self.pool)
+        return make_source(self.backend, 2 * self.seats, self.model_path)
+
+    def _init(self):
+        if self.supervisor:
+            self.supervisor.close()
+        # A standby pool would double the graphs' memory and startup for a rare
+        # failure; a pool that fails is rebuilt while frames are skipped instead
+        standby = self.graphs == 1
+        self.supervisor = InferenceSupervisor(self._build_source, standby) if self.backend else None
+
+    def reset(self):
+        """Full reset: rebuild the graph and clear all filters."""
+        self._init()
+        self.clear()
+
+    def clear(self):
+        """Forget hands, smoothers, filters and trails but keep the graph (warm resume)."""
+        self.left = self.right = None
+        self.seat_hands = [(None, None)] * self.seats
+        self.state = GestureState()
+        self.seat_states = [GestureState() for _ in range(self.seats)]
+        self._last_update = None
+        for sm in self.steer_smooths + self.dist_smooths:
+            sm.reset()
+        for pr in self.steer_predictors:
+            pr.reset()
+        self.assigner.reset()
+        for m in self.motions:
+            m.reset()
+        self.stability.reset()
+        self.trail.clear()
+        self.motion_gate.reset()
+        self.visual_steer_pos = 0.0
+
+    def update_thresholds(self, t: Dict):
+        self.thresholds = t
+        for m in self.motions:
+            m.thresholds = t
+        self.plan = EvalPlan(self.plan.rules.rebind(t, self.sensitivity))
+        self.stability.set_delay(t.get('stability_delay', 0.18))
+        self._configure_gate()
+
+    def _configure_gate(self):
+        threshold = self.thresholds.get('motion_threshold', 2.0)
+        if self.idle:
+            self.motion_gate.configure(threshold or IDLE_MOTION_THRESHOLD, self.idle_refresh)
+        else:
+            self.motion_gate.configure(threshold, self.thresholds.get('motion_refresh', 6))
+
+    def set_idle(self, idle: bool, refresh: int = 30):
+        """Idle mode: static frames are inferred only one in `refresh`.
+
+        The motion diff always runs while idle, with IDLE_MOTION_THRESHOLD if
+        gating is off, so motion (such as a hand entering) triggers inference
+        on that same frame and waking up never waits for the refresh interval.
+        """
+        self.idle = idle
+        self.idle_refresh = max(1, int(refresh))
+        self._configure_gate()
+
+    def update_sensitivity(self, s: Dict):
+        self.sensitivity = s
+        # A new plan, as in set_enabled: never rebind the one a frame may be evaluating
+        self.plan = EvalPlan(self.plan.rules.rebind(self.thresholds, s))
+
+    def set_enabled(self, enabled: Optional[Iterable[str]] = None):
+        """Evaluate only these gestures (None: all rules).
+
+        Rebuilds the per-frame plan: disabled rules are dropped from the
+        rule set (and so from stability filtering), finger bits are only
+        computed for hands some rule looks at. Flags of disabled gestures
+        stay False; steering and hands_distance are always measured, since
+        the timeline and the state stream read them.
+        """
+        names = set(self.rules) if enabled is None else set(enabled)
+        rules = {name: spec for name, spec in self.rules.items() if name in names}
+        # Swapped in one assignment: a frame on the capture thread sees the old or the new plan
+        self.plan = EvalPlan(RuleSet(rules, self.thresholds, self.sensitivity))
+
+    def _extract(self, pts: List[Tuple[float, float]], side: str) -> Hand:
+        palm = (
+            sum(pts[i][0] for i in [0, 5, 9, 13, 17]) / 5,
+            sum(pts[i][1] for i in [0, 5, 9, 13, 17]) / 5,
+        )
+        return Hand(
+            landmarks=pts,
+            side=side,
+            wrist=pts[0],
+            thumb_tip=pts[4],
+            index_tip=pts[8],
+            middle_tip=pts[12],
+            ring_tip=pts[16],
+            pinky_tip=pts[20],
+            index_mcp=pts[5],
+            middle_mcp=pts[9],
+            ring_mcp=pts[13],
+            pinky_mcp=pts[17],
+            thumb_mcp=pts[2],
+            palm=palm,
+        )
+
+    def _is_finger_extended(
+        self,
+        tip: Tuple[float, float],
+        mcp: Tuple[float, float],
+        wrist: Tuple[float, float],
+        thresh: float,
+    ) -> bool:
+        tip_to_wrist = distance(tip, wrist)
+        mcp_to_wrist = distance(mcp, wrist)
+        return tip_to_wrist > mcp_to_wrist + thresh
+
+    def _is_thumb_extended(self, hand: Hand, thresh: float) -> bool:
+        thumb_to_pinky_mcp = distance(hand.thumb_tip, hand.pinky_mcp)
+        wrist_to_pinky_mcp = distance(hand.wrist, hand.pinky_mcp)
+        return thumb_to_pinky_mcp > wrist_to_pinky_mcp * 0.8
+
+    def _finger_bits(self, hand: Hand) -> int:
+        """Extended fingers as bits, thumb to pinky (gesture_rules.FINGERS)."""
+        thresh = self.thresholds.get('finger_extend_thresh', 0.06)
+        sens = self.sensitivity.get('fingers', 1.0)
+        thresh = thresh / sens
+
+        bits = 1 if self._is_thumb_extended(hand, thresh) else 0
+        if self._is_finger_extended(hand.index_tip, hand.index_mcp, hand.wrist, thresh):
+            bits |= 2
+        if self._is_finger_extended(hand.middle_tip, hand.middle_mcp, hand.wrist, thresh):
+            bits |= 4
+        if self._is_finger_extended(hand.ring_tip, hand.ring_mcp, hand.wrist, thresh):
+            bits |= 8
+        if self._is_finger_extended(hand.pinky_tip, hand.pinky_mcp, hand.wrist, thresh):
+            bits |= 16
+        return bits
+
+    def _calculate_steering_angle(
+        self, left_wrist: Tuple[float, float], right_wrist: Tuple[float, float]
+    ) -> float:
+        """Return a pseudo-angle proportional to vertical wrist difference."""
+        dy = right_wrist[1] - left_wrist[1]
+        scale = self.thresholds.get('steering_dy_scale', 180.0)
+        angle_deg = -dy * scale
+        return angle_deg
+
+    def _calculate_progressive_force(self, normalized_pos: float) -> float:
+        """Calculate progressive steering force based on position.
+        
+        Force increases linearly from dead zone edge to outer edge.
+        
+        Args:
+            normalized_pos: Position in [-1, 1] where 0 is center
+            
+        Returns:
+            Force value in [0, 1]
+        """
+        dead_zone = self.thresholds.get('dead_zone_ratio', 0.3)
+        
+        abs_pos = abs(normalized_pos)
+        
+        # Inside dead zone - no force
+        if abs_pos <= dead_zone:
+            return 0.0
+        
+        # Calculate position within active steering zone
+        # 0 at dead zone edge, 1 at full edge
+        active_range = 1.0 - dead_zone
+        if active_range <= 0:
+            return 0.0
+        
+        # Linear progression from dead zone edge to outer edge
+        force = (abs_pos - dead_zone) / active_range
+        
+        return min(1.0, max(0.0, force))
+
+    def process(
+        self, frame: np.ndarray, use_stability: bool = True, rgb: bool = False,
+        captured_at: Optional[float] = None,
+    ) -> Tuple[GestureState, np.ndarray]:
+        """Run detection on a frame; pass rgb=True if it is already RGB.
+
+        `captured_at` (self.clock() when the frame was read) lets the latency
+        estimate used by steering prediction include capture and conversion.
+        """
+        start = captured_at if captured_at is not None else self.clock()
+        image = frame if rgb else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        # Static or idle frame: keep the previous landmarks and skip inference.
+        # The classification below still runs so stability timers keep advancing.
+        if self.motion_gate.should_infer(image):
+            results = self.supervisor.process(image)
+            if results is None:
+                # Inference failed and the supervisor swapped graphs; hold the last state
+                self.state.events = ()
+                return self.state, frame
+            self._assign_hands(results)
+            # A graph pool returns an earlier frame's landmarks: count its lag too
+            lag = getattr(self.supervisor.active, 'lag', 0) * self.frame_interval
+            self.latency += (self.clock() - start + lag - self.latency) * 0.1
+        return self._update_state(use_stability), frame
+
+    def process_landmarks(self, hands: List[HandResult], use_stability: bool = True) -> GestureState:
+        """Classify already-extracted landmarks (no frame, no model)."""
+        self._assign_hands(hands)
+        return self._update_state(use_stability)
+
+    def _update_state(self, use_stability: bool) -> GestureState:
+        now = self.clock()
+        if self._last_update is not None and now - self._last_update < 0.5:
+            self.frame_interval += (now - self._last_update - self.frame_interval) * 0.1
+        self._last_update = now
+        if self.seats > 1:
+            self.seat_states = self._classify_seats(use_stability)
+            s = self.seat_states[0]
+        else:
+            s = self._classify(use_stability)
+        if self.motion_enabled:
+            if self.seats > 1:
+                for motion, (left, right), st in zip(self.motions, self.seat_hands, self.seat_states):
+                    st.events = motion.update(now, left, right)
+            else:
+                s.events = self.motions[0].update(now, self.left, self.right)
+        self.state = s
+        self.history.append(now, s.steering_angle, s.steering_force, s.hands_distance, s.bits())
+        return s
+
+    def _assign_hands(self, results: List[HandResult]):
+        self.left = None
+        self.right = None
+        hands = []
+        for pts, label in results:
+            hand = self._extract(pts, label)
+            hands.append(hand)
+            if label == "Left":
+                self.right = hand
+            else:
+                self.left = hand
+        if self.seats > 1:
+            self.seat_hands = self.assigner.assign(hands)
+            self.left, self.right = self.seat_hands[0]
+
+    def _classify(self, use_stability: bool = True) -> GestureState:
+        """Turn the current left/right hands into a GestureState."""
+        plan = self.plan
+        left, right = self.left, self.right
+        raw_dist = raw_angle = None
+        if left and right:
+            raw_dist = distance(left.palm, right.palm)
+            raw_angle = self._calculate_steering_angle(left.wrist, right.wrist)
+        # A hand no rule looks at is only "present" (bits 0)
+        return self._make_state(
+            (self._finger_bits(left) if plan.fingers[0] else 0) if left else None,
+            (self._finger_bits(right) if plan.fingers[1] else 0) if right else None,
+            raw_dist, raw_angle, use_stability, plan=plan,
+        )
+
+    def _classify_seats(self, use_stability: bool = True) -> List[GestureState]:
+        """Steering, distance and finger logic for every seat in one array pass."""
+        plan = self.plan
+        lm = np.full((self.seats, 2, 21, 2), np.nan)
+        for p, (left, right) in enumerate(self.seat_hands):
+            if left:
+                lm[p, 0] = left.landmarks
+            if right:
+                lm[p, 1] = right.landmarks
+        has = ~np.isnan(lm[:, :, 0, 0])
+
+        thresh = self.thresholds.get('finger_extend_thresh', 0.06) / self.sensitivity.get('fingers', 1.0)
+        fingers = np.zeros((self.seats, 2), np.int64)
+        for side in (0, 1):
+            if plan.fingers[side]:
+                fingers[:, side] = gesture_vec.finger_bits(lm[:, side], thresh)
+        palms = gesture_vec.palm(lm)
+        raw_dist = gesture_vec.distance(palms[:, 0], palms[:, 1])
+        raw_angle = gesture_vec.steering_angle(
+            lm[:, 0, 0], lm[:, 1, 0], self.thresholds.get('steering_dy_scale', 180.0)
+        )
+
+        states = []
+        for p in range(self.seats):
+            both = has[p, 0] and has[p, 1]
+            states.append(self._make_state(
+                int(fingers[p, 0]) if has[p, 0] else None,
+                int(fingers[p, 1]) if has[p, 1] else None,
+                float(raw_dist[p]) if both else None,
+                float(raw_angle[p]) if both else None,
+                use_stability, seat=p, plan=plan,
+            ))
+        return states
+
+    def _make_state(
+        self,
+        left_fingers: Optional[int],
+        right_fingers: Optional[int],
+        raw_dist: Optional[float],
+        raw_angle: Optional[float],
+        use_stability: bool = True,
+        seat: int = 0,
+        plan: Optional['EvalPlan'] = None,
+    ) -> GestureState:
+        """Apply smoothing, rules and stability to one player's raw measurements.
+
+        `left_fingers`/`right_fingers` are finger bits (None for a missing
+        hand). Seat 0 uses the detector's own smoothers and stability keys,
+        so the single-player path is unchanged; other seats get their own.
+        `plan` is the EvalPlan the caller read (default self.plan).
+        """
+        plan = plan or self.plan
+        s = GestureState()
+        s.left_detected = left_fingers is not None
+        s.right_detected = right_fingers is not None
+        prefix = f"p{seat}:" if seat else ""
+        measures = None
+
+        # Two-hand measurements: distance + steering
+        if raw_dist is not None:
+            s.hands_distance = self.dist_smooths[seat].add(raw_dist)
+
+            # Steering calculation
+            smooth_angle = self.steer_smooths[seat].add(raw_angle)
+            horizon_ms = self.thresholds.get('predict_horizon_ms', 0.0)
+            if horizon_ms > 0:
+                # Extrapolate past the moving average's lag ((n-1)/2 frames) and
+                # the pipeline latency, capped at the configured horizon
+                pred = self.steer_predictors[seat]
+                pred.max_horizon = horizon_ms / 1000
+                pred.update(self._last_update, raw_angle)
+                lag = (len(self.steer_smooths[seat].vals) - 1) / 2 * self.frame_interval + self.latency
+                smooth_angle += pred.ahead(lag)
+            s.steering_angle = smooth_angle
+
+            # Normalize to [-1, 1]
+            max_display_angle = self.thresholds.get('visual_max_angle', 60.0)
+            normalized = max(-1.0, min(1.0, smooth_angle / max_display_angle))
+            
+            # Calculate progressive force (0 in dead zone, increases linearly outside)
+            # The force level determines PWM duty cycle, not whether to steer
+            s.steering_force = self._calculate_progressive_force(normalized)
+            measures = (s.hands_distance, normalized, smooth_angle)
+
+            # Update visual ball position smoothly
+            if seat == 0:
+                alpha = 0.25
+                self.visual_steer_pos += (normalized - self.visual_steer_pos) * alpha
+
+        # All gesture rules at once; stability only for the ones this frame could evaluate
+        matched, evaluated = plan.rules.evaluate(left_fingers, right_fingers, measures)
+        if evaluated:
+            extra = []
+            for bit, name in zip(plan.rules.bits, plan.rules.names):
+                if not evaluated & bit:
+                    continue
+                on = matched & bit != 0
+                if use_stability:
+                    on = self.stability.update(prefix + name if prefix else name, on)
+                if not on:
+                    continue
+                if name in BUILTIN:
+                    setattr(s, name, True)
+                else:
+                    extra.append(name)
+            if extra:
+                s.extra = tuple(extra)
+        return s
+
+    def draw(
+        self, frame: np.ndarray, skeleton: bool = True, trails: bool = True, rgb: bool = False
+    ) -> np.ndarray:
+        """Draw the overlay in place; colors are BGR unless rgb=True."""
+        h, w = frame.shape[:2]
+
+        # Overlay colors are written as BGR; swap them when drawing on RGB frames
+        def bgr(col):
+            return (col[2], col[1], col[0]) if rgb else col
+
+        # Get zone parameters
+        dead_zone = self.thresholds.get('dead_zone_ratio', 0.3)
+
+        def draw_hand(hand: Hand, color, highlight, trail=True):
+            if not skeleton:
+                return
+            conns = [
+                (0, 1), (1, 2), (2, 3), (3, 4),
+                (0, 5), (5, 6), (6, 7), (7, 8),
+                (0, 9), (9, 10), (10, 11), (11, 12),
+                (0, 13), (13, 14), (14, 15), (15, 16),
+                (0, 17), (17, 18), (18, 19), (19, 20),
+                (5, 9), (9, 13), (13, 17),
+            ]
+            for a, b in conns:
+                p1 = (int(hand.landmarks[a][0] * w), int(hand.landmarks[a][1] * h))
+                p2 = (int(hand.landmarks[b][0] * w), int(hand.landmarks[b][1] * h))
+                cv2.line(frame, p1, p2, color, 2, cv2.LINE_AA)
+
+            for i, pt in enumerate(hand.landmarks):
+                px, py = int(pt[0] * w), int(pt[1] * h)
+                r = 5 if i in [4, 8, 12] else 3
+                col = highlight if i in [4, 8, 12] else color
+                cv2.circle(frame, (px, py), r, col, -1, cv2.LINE_AA)
+
+            if trails and trail:
+                px, py = int(hand.palm[0] * w), int(hand.palm[1] * h)
+                self.trail.add(hand.side, (px, py))
+
+        # Draw hands
+        if self.left:
+            draw_hand(self.left, bgr((0, 200, 150)), bgr((0, 255, 220)))
+        if self.right:
+            draw_hand(self.right, bgr((200, 120, 0)), bgr((255, 160, 40)))
+        # Other players in multi-seat mode (no trails; those are keyed by side)
+        for seat in self.seat_hands[1:]:
+            for hand in seat:
+                if hand:
+                    draw_hand(hand, bgr((180, 90, 200)), bgr((220, 140, 255)), trail=False)
+
+        # Draw trails
+        if trails:
+            for tid, col in [("Right", bgr((0, 200, 150))), ("Left", bgr((200, 120, 0)))]:
+                pts = self.trail.get(tid)
+                for i in range(1, len(pts)):
+                    a = i / len(pts)
+                    cv2.line(
+                        frame,
+                        pts[i - 1],
+                        pts[i],
+                        tuple(int(c * a) for c in col),
+                        max(1, int(3 * a)),
+                        cv2.LINE_AA,
+                    )
+
+        # Draw steering bar
+        if self.left and self.right:
+            # Line between wrists
+            lx, ly = int(self.left.wrist[0] * w), int(self.left.wrist[1] * h)
+            rx, ry = int(self.right.wrist[0] * w), int(self.right.wrist[1] * h)
+            cv2.line(frame, (lx, ly), (rx, ry), bgr((0, 200, 255)), 3, cv2.LINE_AA)
+
+            bar_y = h - 50
+            bar_left = 80
+            bar_right = w - 80
+            bar_width = bar_right - bar_left
+            bar_center = (bar_left + bar_right) // 2
+
+            # Background bar
+            cv2.rectangle(frame, (bar_left, bar_y - 20), (bar_right, bar_y + 20), (50, 50, 50), -1)
+            cv2.rectangle(frame, (bar_left, bar_y - 20), (bar_right, bar_y + 20), bgr((80, 80, 100)), 2)
+
+            # Calculate dead zone boundaries in pixels
+            dead_half = int(dead_zone * bar_width / 2)
+            left_dead = bar_center - dead_half
+            right_dead = bar_center + dead_half
+
+            # Draw gradient zones - left side (green gradient)
+            for x in range(bar_left, left_dead):
+                # Calculate intensity based on distance from dead zone
+                dist_from_dead = left_dead - x
+                max_dist = left_dead - bar_left
+                if max_dist > 0:
+                    intensity = dist_from_dead / max_dist
+                else:
+                    intensity = 0
+                g = int(60 + 140 * intensity)  # Green increases toward edge
+                cv2.line(frame, (x, bar_y - 18), (x, bar_y + 18), bgr((0, g, 40)), 1)
+
+            # Dead zone (center - gray)
+            cv2.rectangle(frame, (left_dead, bar_y - 18), (right_dead, bar_y + 18), (70, 70, 70), -1)
+
+            # Draw gradient zones - right side (blue gradient)
+            for x in range(right_dead, bar_right):
+                # Calculate intensity based on distance from dead zone
+                dist_from_dead = x - right_dead
+                max_dist = bar_right - right_dead
+                if max_dist > 0:
+                    intensity = dist_from_dead / max_dist
+                else:
+                    intensity = 0
+                b = int(60 + 140 * intensity)  # Blue increases toward edge
+                cv2.line(frame, (x, bar_y - 18), (x, bar_y + 18), bgr((40, 40, b)), 1)
+
+            # Zone boundary lines
+            cv2.line(frame, (left_dead, bar_y - 20), (left_dead, bar_y + 20), bgr((100, 200, 100)), 2)
+            cv2.line(frame, (right_dead, bar_y - 20), (right_dead, bar_y + 20), bgr((100, 100, 200)), 2)
+            cv2.line(frame, (bar_center, bar_y - 15), (bar_center, bar_y + 15), (200, 200, 200), 1)
+
+            # Ball position
+            angle_norm = max(-1.0, min(1.0, self.visual_steer_pos))
+            indicator_x = int(bar_center + angle_norm * (bar_width / 2))
+            indicator_x = max(bar_left + 12, min(bar_right - 12, indicator_x))
+
+            # Ball color based on force level
+            force = self.state.steering_force
+            if self.state.steer_left:
+                # Green intensity based on force
+                g = int(100 + 155 * force)
+                ind_color = bgr((0, g, int(50 + 50 * force)))
+                cv2.putText(frame, f"<< LEFT {force:.0%}", (bar_left, bar_y - 30),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, ind_color, 2)
+            elif self.state.steer_right:
+                # Blue intensity based on force
+                b = int(100 + 155 * force)
+                ind_color = bgr((int(50 + 50 * force), int(50 + 50 * force), b))
+                cv2.putText(frame, f"RIGHT {force:.0%} >>", (bar_right - 150, bar_y - 30),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, ind_color, 2)
+            else:
+                ind_color = (180, 180, 180)
+
+            # Draw ball with glow effect based on force
+            if force > 0:
+                glow_radius = int(14 + 8 * force)
+                glow_color = tuple(int(c * 0.4) for c in ind_color)
+                cv2.circle(frame, (indicator_x, bar_y), glow_radius, glow_color, -1)
+            
+            cv2.circle(frame, (indicator_x, bar_y), 14, ind_color, -1)
+            cv2.circle(frame, (indicator_x, bar_y), 14, (255, 255, 255), 2)
+
+            # Debug text
+            ang = self.state.steering_angle
+            cv2.putText(frame, f"angle: {ang:5.1f}  force: {force:.0%}",
+                       (bar_center - 100, bar_y + 45),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.45, (180, 180, 180), 1)
+            cv2.putText(frame, "STEER", (bar_left - 5, bar_y - 25),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
+            
+            # Zone labels
+            cv2.putText(frame, "DEAD", (bar_center - 20, bar_y + 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.35, (120, 120, 120), 1)
+
+        return frame
+
+    def release(self):
+        if self.supervisor:
+            self.supervisor.close()
+            self.supervisor = None
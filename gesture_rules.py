@@ -0,0 +1,221 @@
+"""Declarative pose gestures.
+
+A rule says which hand(s) it looks at, which fingers must be extended or
+folded, and conditions on the two-hand measurements:
+
+    "peace_left": {"hand": "left", "fingers": "?11??"},
+    "wide_tilt":  {"hand": "both", "distance": [">", 0.3, "<", 0.6], "angle": [">", 20]},
+
+- hand: 'left', 'right', 'any' (either hand matches) or 'both' (both
+  hands present and, if `fingers` is given, both match it).
+- fingers: one character per finger, thumb to pinky: '1' extended,
+  '0' folded, '?' either.
+- distance / steer / angle: pairs of operator ('<' or '>') and value. The
+  value is a number or a threshold name, '-' in front negates it.
+  distance is the smoothed palm-to-palm distance (thresholds are scaled by
+  the 'distance' sensitivity: divided for '<', multiplied for '>'), steer
+  the steering position in [-1, 1] and angle the smoothed steering angle
+  in degrees. These need both hands.
+
+The built-in gestures are the rules in BUILTIN_RULES; Config.gesture_rules
+adds rules or replaces built-ins by name.
+
+A RuleSet compiles all rules into lookup tables so a frame costs the same
+however many rules there are: each hand's extended fingers form a 5-bit
+number that indexes a table of matching rules, and each measurement falls
+into one interval between the rules' condition values, which indexes
+another. Results are bitmasks over the rules (bit i = names[i]). The same
+tables index whole NumPy arrays for gesture_batch.
+"""
+import copy
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FINGERS = ('thumb', 'index', 'middle', 'ring', 'pinky')  # Bit i of a hand's finger bits
+MEASURES = ('distance', 'steer', 'angle')
+HANDS = ('left', 'right', 'any', 'both')
+MAX_RULES = 63  # Masks are int64 in batch evaluation
+
+BUILTIN_RULES = {
+    'steer_left': {'hand': 'both', 'steer': ['<', '-dead_zone_ratio']},
+    'steer_right': {'hand': 'both', 'steer': ['>', 'dead_zone_ratio']},
+    'hands_close': {'hand': 'both', 'distance': ['<', 'hands_close_dist']},
+    'hands_far': {'hand': 'both', 'distance': ['>', 'hands_far_dist']},
+    'left_forward': {'hand': 'left', 'fingers': '?1100'},
+    'left_backward': {'hand': 'left', 'fingers': '10000'},
+    'right_forward': {'hand': 'right', 'fingers': '?1100'},
+    'right_backward': {'hand': 'right', 'fingers': '10000'},
+}
+
+# Values for threshold names missing from the thresholds passed in
+FALLBACK = {'hands_close_dist': 0.12, 'hands_far_dist': 0.55, 'dead_zone_ratio': 0.3}
+
+
+@dataclass
+class Rule:
+    name: str
+    hand: str
+    care: int = 0  # Finger bits the rule looks at
+    want: int = 0  # Required values of those bits
+    conditions: List[Tuple[str, str, object]] = field(default_factory=list)  # (measure, op, value)
+
+
+def parse(name: str, spec: Dict) -> Rule:
+    hand = spec.get('hand', 'any')
+    if hand not in HANDS:
+        raise ValueError(f"Rule '{name}': hand must be one of {HANDS}")
+    rule = Rule(name, hand)
+    fingers = spec.get('fingers')
+    if fingers is not None:
+        if len(fingers) != 5 or set(fingers) - set('01?'):
+            raise ValueError(f"Rule '{name}': fingers must be 5 of '1', '0', '?' (thumb to pinky)")
+        for i, c in enumerate(fingers):
+            if c != '?':
+                rule.care |= 1 << i
+                rule.want |= (c == '1') << i
+    for measure in MEASURES:
+        pairs = spec.get(measure)
+        if pairs is None:
+            continue
+        if len(pairs) % 2 or not pairs:
+            raise ValueError(f"Rule '{name}': {measure} takes operator/value pairs")
+        for op, value in zip(pairs[::2], pairs[1::2]):
+            if op not in ('<', '>'):
+                raise ValueError(f"Rule '{name}': unknown operator {op!r}")
+            rule.conditions.append((measure, op, value))
+    if rule.conditions and hand != 'both':
+        raise ValueError(f"Rule '{name}': {', '.join(MEASURES)} conditions need hand 'both'")
+    if fingers is None and not rule.conditions:
+        raise ValueError(f"Rule '{name}' has no fingers or conditions")
+    return rule
+
+
+class RuleSet:
+    def __init__(self, rules: Dict[str, Dict], thresholds: Optional[Dict] = None, sensitivity: Optional[Dict] = None):
+        self.rules = [parse(name, spec) for name, spec in rules.items()]
+        if len(self.rules) > MAX_RULES:
+            raise ValueError(f"At most {MAX_RULES} gesture rules")
+        self.names = tuple(r.name for r in self.rules)
+        self.bits = tuple(1 << i for i in range(len(self.rules)))
+        # What the rules read, so callers can skip computing the rest
+        self.finger_hands = tuple(
+            any(r.care and r.hand in (side, 'any', 'both') for r in self.rules) for side in ('left', 'right')
+        )
+        self.measures = {m for r in self.rules for m, _, _ in r.conditions}
+
+        # Per hand: finger bits -> mask of rules whose pattern they match
+        self.finger_table = [
+            sum(1 << i for i, r in enumerate(self.rules) if bits & r.care == r.want) for bits in range(32)
+        ]
+
+        def mask(hand):
+            return sum(1 << i for i, r in enumerate(self.rules) if r.hand == hand)
+
+        self.left, self.right, self.any, self.both = (mask(h) for h in HANDS)
+        # Hands present (bit 0 left, bit 1 right) -> rules that are evaluated
+        self.evaluated = [
+            (self.left if has & 1 else 0) | (self.right if has & 2 else 0)
+            | (self.any if has else 0) | (self.both if has == 3 else 0)
+            for has in range(4)
+        ]
+        self.bind(thresholds or {}, sensitivity or {})
+
+    def bind(self, thresholds: Dict, sensitivity: Dict):
+        """Resolve threshold names and rebuild the measurement tables.
+
+        Mutates this set: use rebind() for one another thread may be evaluating.
+        """
+        sens = sensitivity.get('distance', 1.0)
+        lo: Dict[str, Dict[int, float]] = {m: {} for m in MEASURES}
+        hi: Dict[str, Dict[int, float]] = {m: {} for m in MEASURES}
+        for i, r in enumerate(self.rules):
+            for measure, op, value in r.conditions:
+                v = self._value(r.name, value, thresholds)
+                if measure == 'distance':
+                    v = v / sens if op == '<' else v * sens
+                bounds = hi if op == '<' else lo
+                # Several conditions on one measurement: keep the tightest
+                prev = bounds[measure].get(i)
+                bounds[measure][i] = v if prev is None else (min(prev, v) if op == '<' else max(prev, v))
+
+        # Per measurement: sorted breakpoints and, for each interval
+        # (below b0, == b0, between b0 and b1, == b1, ...), the rules it satisfies
+        self.tables: List[Tuple[List[float], List[int], int]] = []
+        for m in MEASURES:
+            users = set(lo[m]) | set(hi[m])
+            free = sum(1 << i for i in range(len(self.rules)) if i not in users)
+            points = sorted(set(lo[m].values()) | set(hi[m].values()))
+            probes = []
+            for k, p in enumerate(points):
+                probes.append(p - 1.0 if k == 0 else (points[k - 1] + p) / 2)
+                probes.append(p)
+            probes.append(points[-1] + 1.0 if points else 0.0)
+            masks = [
+                free | sum(1 << i for i in users if lo[m].get(i, -np.inf) < x < hi[m].get(i, np.inf))
+                for x in probes
+            ]
+            # NaN (measurement missing): only rules that don't use it
+            self.tables.append((points, masks, free))
+        self.conditions = [(i, t[0], t[1]) for i, t in enumerate(self.tables) if t[0]]
+
+    def rebind(self, thresholds: Dict, sensitivity: Dict) -> 'RuleSet':
+        """A copy bound to new thresholds; this set is left untouched."""
+        rs = copy.copy(self)
+        rs.bind(thresholds, sensitivity)
+        return rs
+
+    @staticmethod
+    def _value(name: str, value, thresholds: Dict) -> float:
+        if not isinstance(value, str):
+            return float(value)
+        sign, key = (-1.0, value[1:]) if value.startswith('-') else (1.0, value)
+        if key in thresholds:
+            return sign * thresholds[key]
+        if key in FALLBACK:
+            return sign * FALLBACK[key]
+        raise ValueError(f"Rule '{name}': unknown threshold '{key}'")
+
+    def evaluate(
+        self, left: Optional[int], right: Optional[int], measures: Optional[Sequence[float]] = None
+    ) -> Tuple[int, int]:
+        """(matched, evaluated) rule masks for one player's frame.
+
+        `left`/`right` are finger bits or None for a missing hand;
+        `measures` is (distance, steer, angle), or None without both hands.
+        """
+        has = (left is not None) | (right is not None) << 1
+        evaluated = self.evaluated[has]
+        if not evaluated:
+            return 0, 0
+        fl = self.finger_table[left] if left is not None else 0
+        fr = self.finger_table[right] if right is not None else 0
+        matched = (fl & self.left) | (fr & self.right) | ((fl | fr) & self.any) | (fl & fr & self.both)
+        # Rules with conditions all need both hands, so without measures they aren't evaluated
+        if measures is not None:
+            for i, points, masks in self.conditions:
+                x = measures[i]
+                k = bisect_left(points, x)
+                matched &= masks[2 * k + 1 if k < len(points) and points[k] == x else 2 * k]
+        return matched & evaluated, evaluated
+
+    def evaluate_array(self, left: np.ndarray, right: np.ndarray, measures: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """evaluate() over arrays: finger bits (N,) with -1 for a missing
+        hand and measures (N, 3) with NaN without both hands; int64 masks."""
+        has_l, has_r = left >= 0, right >= 0
+        table = np.array(self.finger_table, np.int64)
+        fl = np.where(has_l, table[np.maximum(left, 0)], 0)
+        fr = np.where(has_r, table[np.maximum(right, 0)], 0)
+        evaluated = np.array(self.evaluated, np.int64)[has_l.astype(np.intp) | has_r.astype(np.intp) << 1]
+        matched = (fl & self.left) | (fr & self.right) | ((fl | fr) & self.any) | (fl & fr & self.both)
+        for (points, masks, free), x in zip(self.tables, np.asarray(measures).T):
+            if not points:
+                continue
+            pts = np.array(points)
+            k = np.searchsorted(pts, x, 'left')
+            exact = (k < len(pts)) & (pts[np.minimum(k, len(pts) - 1)] == x)
+            m = np.array(masks, np.int64)[2 * k + exact]
+            matched &= np.where(np.isnan(x), free, m)
+        return matched & evaluated, evaluated
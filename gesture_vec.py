@@ -0,0 +1,69 @@
+"""Vectorized gesture math over landmark arrays.
+
+Landmarks are float64 arrays of shape (..., 21, 2) in normalized image
+coordinates. Missing hands are NaN, which makes every comparison False.
+Each function repeats GestureDetector's scalar formula operation for
+operation, so the results are bit-identical to the per-frame path.
+"""
+import numpy as np
+
+WRIST, THUMB_TIP, PINKY_MCP = 0, 4, 17
+PALM_IDX = (0, 5, 9, 13, 17)
+# (tip, mcp) for index, middle, ring, pinky
+FINGERS = ((8, 5), (12, 9), (16, 13), (20, 17))
+
+
+def distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    # Multiply rather than ** 2: scalar float ** 2 goes through pow(), which can differ by an ulp
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def palm(lm: np.ndarray) -> np.ndarray:
+    acc = lm[..., PALM_IDX[0], :]
+    for i in PALM_IDX[1:]:
+        acc = acc + lm[..., i, :]
+    return acc / 5
+
+
+def fingers_extended(lm: np.ndarray, thresh) -> np.ndarray:
+    """(..., 4) bool: index, middle, ring, pinky extended."""
+    wrist = lm[..., WRIST, :]
+    out = [
+        distance(lm[..., tip, :], wrist) > distance(lm[..., mcp, :], wrist) + thresh
+        for tip, mcp in FINGERS
+    ]
+    return np.stack(out, axis=-1)
+
+
+def thumb_extended(lm: np.ndarray) -> np.ndarray:
+    pinky_mcp = lm[..., PINKY_MCP, :]
+    return distance(lm[..., THUMB_TIP, :], pinky_mcp) > distance(lm[..., WRIST, :], pinky_mcp) * 0.8
+
+
+def finger_bits(lm: np.ndarray, thresh) -> np.ndarray:
+    """(...) int: bit 0 thumb, bits 1-4 index to pinky extended (gesture_rules.FINGERS)."""
+    ext = fingers_extended(lm, thresh)
+    out = thumb_extended(lm).astype(np.int64)
+    for i in range(4):
+        out |= ext[..., i].astype(np.int64) << (i + 1)
+    return out
+
+
+def steering_angle(left_wrist: np.ndarray, right_wrist: np.ndarray, scale: float) -> np.ndarray:
+    dy = right_wrist[..., 1] - left_wrist[..., 1]
+    return -dy * scale
+
+
+def normalize_angle(angle: np.ndarray, max_angle: float) -> np.ndarray:
+    return np.clip(angle / max_angle, -1.0, 1.0)
+
+
+def progressive_force(normalized: np.ndarray, dead_zone: float) -> np.ndarray:
+    abs_pos = np.abs(normalized)
+    active_range = 1.0 - dead_zone
+    if active_range <= 0:
+        return np.zeros_like(abs_pos)
+    force = np.clip((abs_pos - dead_zone) / active_range, 0.0, 1.0)
+    return np.where(abs_pos <= dead_zone, 0.0, force)
@@ -0,0 +1,226 @@
+"""Several landmark graphs working on consecutive frames.
+
+One graph handles one frame at a time, so frames per second can't exceed
+1 / inference latency however many cores are idle. GraphPool is a landmark
+source (process/close, see landmark_sources) that holds `size` graphs and
+hands frame k to graph k % size, so up to `size` frames are in inference
+at once. Finished results go into a reorder buffer and come out strictly in
+capture order: process() returns the newest result whose predecessors
+have all been delivered, so the steering and stability logic downstream
+never sees time go backwards. A graph's exception keeps its place too: it
+is raised by the first process() call after every earlier frame has been
+returned.
+
+The price is lag: a result is returned `lag` frames after its own frame
+was submitted (about size - 1 at full load), like TasksLiveSource's one
+inference. Each graph also tracks hands over every size-th frame only,
+which at 60 FPS with 3 graphs is like tracking a 20 FPS camera.
+
+mode='thread' runs each graph on its own thread; MediaPipe releases the
+GIL during inference, so they overlap. mode='process' gives each graph its
+own process and passes frames through shared memory, for when the Python
+side of the graphs becomes the limit. `factory` builds one graph and must
+be picklable for processes (e.g. functools.partial of make_source).
+"""
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from landmark_sources import HandResult
+
+MODES = ('thread', 'process')
+
+
+class _ThreadGraph:
+    def __init__(self, factory: Callable[[], object]):
+        self.source = factory()
+        self.busy = False
+        self._inbox: queue.Queue = queue.Queue(1)
+        self._results: queue.Queue = queue.Queue(1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._inbox.get()
+            if item is None:
+                return
+            seq, rgb = item
+            try:
+                result = self.source.process(rgb)
+            except Exception as e:
+                result = e
+            self._results.put((seq, result))
+
+    def submit(self, seq: int, rgb: np.ndarray):
+        # The caller may reuse its frame buffer as soon as we return
+        self._inbox.put((seq, rgb.copy()))
+        self.busy = True
+
+    def poll(self, block: bool) -> Optional[Tuple[int, object]]:
+        try:
+            item = self._results.get(block)
+        except queue.Empty:
+            return None
+        self.busy = False
+        return item
+
+    def close(self):
+        self._inbox.put(None)
+        self._thread.join(2.0)
+        # A graph stuck in inference is left to die with the process
+        if not self._thread.is_alive():
+            self.source.close()
+
+
+def _process_main(conn, factory: Callable[[], object]):
+    """Graph process: build the graph, then answer (seq, shape, shm name) requests."""
+    try:
+        source = factory()
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+        return
+    conn.send(('ready', None))
+    shm: Optional[shared_memory.SharedMemory] = None
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                return
+            seq, shape, name = msg
+            if shm is None or shm.name != name:
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name)
+            rgb = np.ndarray(shape, np.uint8, buffer=shm.buf)
+            try:
+                result = source.process(rgb)
+            except Exception as e:
+                result = RuntimeError(f"{type(e).__name__}: {e}")
+            del rgb  # No view may outlive the mapping
+            conn.send((seq, result))
+    finally:
+        if shm is not None:
+            shm.close()
+        source.close()
+
+
+class _ProcessGraph:
+    def __init__(self, factory: Callable[[], object], ctx):
+        self.busy = False
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._conn, child = ctx.Pipe()
+        self._proc = ctx.Process(target=_process_main, args=(child, factory), daemon=True)
+        self._proc.start()
+        child.close()
+        kind, error = self._conn.recv()
+        if kind == 'error':
+            self._proc.join(2.0)
+            raise RuntimeError(f"Graph process failed to start: {error}")
+
+    def submit(self, seq: int, rgb: np.ndarray):
+        if self._shm is None or self._shm.size < rgb.nbytes:
+            # The graph is idle, so the old block can go; it re-attaches by name
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(create=True, size=rgb.nbytes)
+        np.copyto(np.ndarray(rgb.shape, np.uint8, buffer=self._shm.buf), rgb)
+        self._conn.send((seq, rgb.shape, self._shm.name))
+        self.busy = True
+
+    def poll(self, block: bool) -> Optional[Tuple[int, object]]:
+        if not block and not self._conn.poll():
+            return None
+        try:
+            item = self._conn.recv()
+        except EOFError:
+            item = (None, RuntimeError("Graph process exited"))
+        self.busy = False
+        return item
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._proc.join(2.0)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._conn.close()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class GraphPool:
+    def __init__(self, factory: Callable[[], object], size: int = 2, mode: str = 'thread'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown graph pool mode: {mode}")
+        self.size = max(1, size)
+        self.graphs: List = []
+        try:
+            if mode == 'thread':
+                for _ in range(self.size):
+                    self.graphs.append(_ThreadGraph(factory))
+            else:
+                ctx = multiprocessing.get_context('spawn')
+                for _ in range(self.size):
+                    self.graphs.append(_ProcessGraph(factory, ctx))
+        except Exception:
+            self.close()
+            raise
+        self._seq = 0  # Next frame to submit
+        self._next = 0  # Next frame to deliver
+        self._done: Dict[int, object] = {}  # Reorder buffer: finished frames not yet delivered
+        self._latest: List[HandResult] = []
+        self.lag = 0  # Frames between the newest submitted and the newest delivered
+
+    def _collect(self, graph, block: bool):
+        item = graph.poll(block)
+        if item is not None:
+            seq, result = item
+            if seq is None:
+                raise result
+            self._done[seq] = result
+
+    def process(self, rgb: np.ndarray) -> List[HandResult]:
+        graph = self.graphs[self._seq % self.size]
+        if graph.busy:
+            # Still on the frame from one lap ago, the oldest in flight
+            self._collect(graph, True)
+        graph.submit(self._seq, rgb)
+        self._seq += 1
+        for g in self.graphs:
+            if g.busy:
+                self._collect(g, False)
+        delivered = False
+        while self._next in self._done:
+            result = self._done[self._next]
+            if isinstance(result, Exception):
+                if delivered:
+                    # Hand out the frames before it first; it raises on the next call
+                    break
+                del self._done[self._next]
+                self._next += 1
+                self.lag = self._seq - self._next
+                raise result
+            del self._done[self._next]
+            self._next += 1
+            self._latest = result
+            delivered = True
+        self.lag = self._seq - self._next
+        return self._latest
+
+    def close(self):
+        for g in self.graphs:
+            try:
+                g.close()
+            except Exception:
+                pass
+        self.graphs = []
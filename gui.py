@@ -1,541 +1,774 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import cv2
-from PIL import Image, ImageTk
-import time
-from typing import Optional, Set
-from config import Config, PROFILES
-from gesture_detector import GestureDetector, GestureState
-from keyboard_controller import KeyboardController
-from utils import key_display
-
-COLORS = {
-    'bg_dark': '#05080f',
-    'bg_medium': '#0a1020',
-    'bg_card': '#101828',
-    'bg_card_light': '#182030',
-    'accent': '#00e5ff',
-    'accent2': '#b388ff',
-    'text': '#e8eaed',
-    'text_dim': '#6b7280',
-    'success': '#00e676',
-    'warning': '#ffab00',
-    'border': '#1e3a5f',
-}
-
-class NeonButton(tk.Canvas):
-    def __init__(self, parent, text, command=None, width=160, height=48, primary=True, color=None):
-        super().__init__(parent, width=width, height=height, bg=COLORS['bg_medium'], highlightthickness=0, cursor='hand2')
-        self.command = command
-        self.text = text
-        self.w, self.h = width, height
-        self.primary = primary
-        self.color = color or COLORS['accent']
-        self.hover = False
-        self._draw()
-        self.bind('<Enter>', lambda e: self._set_hover(True))
-        self.bind('<Leave>', lambda e: self._set_hover(False))
-        self.bind('<Button-1>', lambda e: self._click())
-    def _set_hover(self, state):
-        self.hover = state
-        self._draw()
-    def _click(self):
-        if self.command: self.command()
-    def _draw(self):
-        self.delete('all')
-        r = 10
-        if self.primary:
-            fill = self.color if self.hover else COLORS['bg_card']
-            text_col = COLORS['bg_dark'] if self.hover else self.color
-            outline = self.color
-        else:
-            fill = COLORS['bg_card_light'] if self.hover else COLORS['bg_card']
-            outline = self.color if self.hover else COLORS['border']
-            text_col = self.color if self.hover else COLORS['text']
-        self._rounded_rect(2, 2, self.w-2, self.h-2, r, fill=fill, outline=outline, width=2)
-        self.create_text(self.w//2, self.h//2, text=self.text, fill=text_col, font=('Segoe UI', 11, 'bold'))
-    def _rounded_rect(self, x1, y1, x2, y2, r, **kwargs):
-        points = [x1+r,y1, x2-r,y1, x2,y1, x2,y1+r, x2,y2-r, x2,y2, x2-r,y2, x1+r,y2, x1,y2, x1,y2-r, x1,y1+r, x1,y1]
-        return self.create_polygon(points, smooth=True, **kwargs)
-
-class NeonSlider(tk.Canvas):
-    def __init__(self, parent, variable, from_=0, to=100, width=280, height=40):
-        super().__init__(parent, width=width, height=height, bg=COLORS['bg_card'], highlightthickness=0, cursor='hand2')
-        self.var = variable
-        self.from_, self.to = from_, to
-        self.w, self.h = width, height
-        self.dragging = False
-        self.bind('<Button-1>', self._click)
-        self.bind('<B1-Motion>', self._drag)
-        self.bind('<ButtonRelease-1>', lambda e: setattr(self, 'dragging', False))
-        self.var.trace_add('write', lambda *a: self._draw())
-        self._draw()
-    def _val_to_x(self, val):
-        return 15 + (val - self.from_) / (self.to - self.from_) * (self.w - 50)
-    def _x_to_val(self, x):
-        ratio = max(0, min(1, (x - 15) / (self.w - 50)))
-        return self.from_ + ratio * (self.to - self.from_)
-    def _click(self, e):
-        self.var.set(self._x_to_val(e.x))
-        self.dragging = True
-    def _drag(self, e):
-        if self.dragging: self.var.set(self._x_to_val(e.x))
-    def _draw(self):
-        self.delete('all')
-        y = self.h // 2
-        self.create_line(15, y, self.w-35, y, fill=COLORS['border'], width=6, capstyle='round')
-        x = self._val_to_x(self.var.get())
-        self.create_line(15, y, x, y, fill=COLORS['accent'], width=6, capstyle='round')
-        self.create_oval(x-9, y-9, x+9, y+9, fill=COLORS['accent'], outline=COLORS['text'], width=2)
-        val = self.var.get()
-        txt = f"{val:.2f}" if val < 10 else f"{int(val)}"
-        self.create_text(self.w-15, y, text=txt, fill=COLORS['text'], font=('Consolas', 10, 'bold'), anchor='e')
-
-class NeonToggle(tk.Canvas):
-    def __init__(self, parent, variable, width=50, height=26):
-        super().__init__(parent, width=width, height=height, bg=COLORS['bg_card'], highlightthickness=0, cursor='hand2')
-        self.var = variable
-        self.w, self.h = width, height
-        self.bind('<Button-1>', self._toggle)
-        self.var.trace_add('write', lambda *a: self._draw())
-        self._draw()
-    def _toggle(self, e=None):
-        self.var.set(not self.var.get())
-    def _draw(self):
-        self.delete('all')
-        on = self.var.get()
-        r = self.h // 2 - 2
-        bg = COLORS['accent'] if on else COLORS['border']
-        points = [r+2,2, self.w-r-2,2, self.w-2,2, self.w-2,r+2, self.w-2,self.h-r-2, self.w-2,self.h-2, self.w-r-2,self.h-2, r+2,self.h-2, 2,self.h-2, 2,self.h-r-2, 2,r+2, 2,2]
-        self.create_polygon(points, smooth=True, fill=bg, outline='')
-        cx = self.w - r - 4 if on else r + 4
-        self.create_oval(cx-r+2, 4, cx+r-2, self.h-4, fill=COLORS['text'], outline='')
-
-class ScrollFrame(tk.Frame):
-    def __init__(self, parent, bg=COLORS['bg_medium']):
-        super().__init__(parent, bg=bg)
-        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, bd=0)
-        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
-        self.inner = tk.Frame(self.canvas, bg=bg)
-        self.inner.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        self.win = self.canvas.create_window((0, 0), window=self.inner, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.bind('<Configure>', lambda e: self.canvas.itemconfig(self.win, width=e.width))
-        self.canvas.bind('<Enter>', lambda e: self.canvas.bind_all("<MouseWheel>", self._scroll))
-        self.canvas.bind('<Leave>', lambda e: self.canvas.unbind_all("<MouseWheel>"))
-    def _scroll(self, e):
-        self.canvas.yview_scroll(int(-1*(e.delta/120)), "units")
-
-class App:
-    def __init__(self):
-        self.cfg = Config.load()
-        self.root = tk.Tk()
-        self.root.title("GESTURE GAMING CONTROL")
-        self.root.configure(bg=COLORS['bg_dark'])
-        self.root.state('zoomed')
-        self.root.minsize(1400, 800)
-        self.detector: Optional[GestureDetector] = None
-        self.keyboard = KeyboardController(self.cfg.max_keys)
-        self.cap: Optional[cv2.VideoCapture] = None
-        self.running = False
-        self.state = GestureState()
-        self.active_keys: Set[str] = set()
-        self.last_time = 0
-        self.fps = 0
-        self._build_ui()
-        self._load_config()
-        self.root.protocol("WM_DELETE_WINDOW", self._close)
-
-    def _build_ui(self):
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure('TCombobox', fieldbackground=COLORS['bg_card'], background=COLORS['bg_card'], foreground=COLORS['text'], arrowcolor=COLORS['accent'])
-        main = tk.Frame(self.root, bg=COLORS['bg_dark'])
-        main.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-        left = tk.Frame(main, bg=COLORS['bg_medium'], width=340)
-        left.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 15))
-        left.pack_propagate(False)
-        self._build_left(left)
-        center = tk.Frame(main, bg=COLORS['bg_dark'])
-        center.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 15))
-        self._build_center(center)
-        right = tk.Frame(main, bg=COLORS['bg_medium'], width=400)
-        right.pack(side=tk.RIGHT, fill=tk.Y)
-        right.pack_propagate(False)
-        self._build_right(right)
-
-    def _build_left(self, parent):
-        scroll = ScrollFrame(parent, bg=COLORS['bg_medium'])
-        scroll.pack(fill=tk.BOTH, expand=True)
-        c = scroll.inner
-        tk.Label(c, text="🎮 CONTROLS", bg=COLORS['bg_medium'], fg=COLORS['accent'], font=('Segoe UI', 24, 'bold')).pack(anchor=tk.W, padx=20, pady=(25, 5))
-        tk.Label(c, text="Gesture Gaming System v3.0", bg=COLORS['bg_medium'], fg=COLORS['text_dim'], font=('Segoe UI', 10)).pack(anchor=tk.W, padx=20, pady=(0, 20))
-        btn_frame = tk.Frame(c, bg=COLORS['bg_medium'])
-        btn_frame.pack(fill=tk.X, padx=20, pady=10)
-        self.start_btn = NeonButton(btn_frame, "▶ START", self._start, width=145, height=52)
-        self.start_btn.pack(side=tk.LEFT, padx=(0, 10))
-        self.stop_btn = NeonButton(btn_frame, "⏹ STOP", self._stop, width=145, height=52, primary=False)
-        self.stop_btn.pack(side=tk.LEFT)
-        card = self._card(c, "CAMERA")
-        row = tk.Frame(card, bg=COLORS['bg_card'])
-        row.pack(fill=tk.X, padx=15, pady=12)
-        tk.Label(row, text="Select Camera:", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 11)).pack(side=tk.LEFT)
-        self.cam_var = tk.StringVar(value="0")
-        ttk.Combobox(row, textvariable=self.cam_var, values=["0","1","2"], width=5, state="readonly").pack(side=tk.RIGHT)
-        card = self._card(c, "OPTIONS")
-        self.opt_vars = {}
-        for name, default in [("Show Skeleton", True), ("Show Trails", True), ("Mirror Mode", True), ("Stability Filter", True), ("Enable Keyboard", True)]:
-            row = tk.Frame(card, bg=COLORS['bg_card'])
-            row.pack(fill=tk.X, padx=15, pady=6)
-            tk.Label(row, text=name, bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 11)).pack(side=tk.LEFT)
-            var = tk.BooleanVar(value=default)
-            NeonToggle(row, var).pack(side=tk.RIGHT)
-            self.opt_vars[name] = var
-        self.opt_vars["Enable Keyboard"].trace_add('write', lambda *a: self.keyboard.set_enabled(self.opt_vars["Enable Keyboard"].get()))
-        row = tk.Frame(card, bg=COLORS['bg_card'])
-        row.pack(fill=tk.X, padx=15, pady=(10, 15))
-        tk.Label(row, text="Max Keys:", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 11)).pack(side=tk.LEFT)
-        self.maxk_var = tk.StringVar(value=str(self.cfg.max_keys))
-        maxk = ttk.Combobox(row, textvariable=self.maxk_var, values=["1","2","3","4","5"], width=4, state="readonly")
-        maxk.pack(side=tk.RIGHT)
-        maxk.bind('<<ComboboxSelected>>', lambda e: self._maxk_change())
-        card = self._card(c, "STATUS")
-        self.fps_lbl = tk.Label(card, text="FPS: --", bg=COLORS['bg_card'], fg=COLORS['success'], font=('Consolas', 20, 'bold'))
-        self.fps_lbl.pack(anchor=tk.W, padx=15, pady=8)
-        self.hands_lbl = tk.Label(card, text="Hands: None", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 12))
-        self.hands_lbl.pack(anchor=tk.W, padx=15, pady=3)
-        self.keys_lbl = tk.Label(card, text="Active: 0/4", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 12))
-        self.keys_lbl.pack(anchor=tk.W, padx=15, pady=(3, 15))
-        card = self._card(c, "PROFILES")
-        for name in PROFILES:
-            NeonButton(card, f"⚡ {name.upper()}", lambda n=name: self._apply_profile(n), width=280, height=44, primary=False, color=COLORS['accent2']).pack(pady=6, padx=15)
-        tk.Frame(c, height=30, bg=COLORS['bg_medium']).pack()
-
-    def _build_center(self, parent):
-        tk.Label(parent, text="📹 CAMERA FEED", bg=COLORS['bg_dark'], fg=COLORS['accent'], font=('Segoe UI', 20, 'bold')).pack(anchor=tk.W, pady=(0, 12))
-        cam_border = tk.Frame(parent, bg=COLORS['accent'])
-        cam_border.pack()
-        cam_inner = tk.Frame(cam_border, bg=COLORS['bg_dark'], width=640, height=480)
-        cam_inner.pack(padx=3, pady=3)
-        cam_inner.pack_propagate(False)
-        self.cam_lbl = tk.Label(cam_inner, text="\n\n📷 Camera Not Started\n\nClick START", bg=COLORS['bg_dark'], fg=COLORS['text_dim'], font=('Segoe UI', 16))
-        self.cam_lbl.pack(fill=tk.BOTH, expand=True)
-        gest = tk.Frame(parent, bg=COLORS['bg_card'])
-        gest.pack(fill=tk.X, pady=15)
-        tk.Label(gest, text="⚡ ACTIVE GESTURES", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 14, 'bold')).pack(anchor=tk.W, padx=20, pady=(15, 8))
-        self.gest_lbl = tk.Label(gest, text="None", bg=COLORS['bg_card'], fg=COLORS['success'], font=('Consolas', 15, 'bold'), wraplength=600)
-        self.gest_lbl.pack(anchor=tk.W, padx=25, pady=(0, 8))
-        self.pressed_lbl = tk.Label(gest, text="Keys: None", bg=COLORS['bg_card'], fg=COLORS['warning'], font=('Consolas', 12))
-        self.pressed_lbl.pack(anchor=tk.W, padx=25, pady=(0, 8))
-        self.force_lbl = tk.Label(gest, text="Steering: 0% | Pulse: OFF", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Consolas', 12))
-        self.force_lbl.pack(anchor=tk.W, padx=25, pady=(0, 15))
-        info = tk.Frame(parent, bg=COLORS['bg_card'])
-        info.pack(fill=tk.X, pady=5)
-        tk.Label(info, text="💡 GESTURES: Forward=Point 2 fingers | Backward=Thumbs up | Steer=Tilt hands", bg=COLORS['bg_card'], fg=COLORS['text_dim'], font=('Segoe UI', 10)).pack(padx=15, pady=10)
-
-    def _build_right(self, parent):
-        tk.Label(parent, text="⚙️ SETTINGS", bg=COLORS['bg_medium'], fg=COLORS['accent'], font=('Segoe UI', 24, 'bold')).pack(pady=(25, 5), padx=20, anchor=tk.W)
-        scroll = ScrollFrame(parent, bg=COLORS['bg_medium'])
-        scroll.pack(fill=tk.BOTH, expand=True)
-        c = scroll.inner
-        card = self._card(c, "GESTURE BINDINGS")
-        self.key_entries = {}
-        self.gesture_enabled = {}
-        bindings = [("steer_left", "Steer Left"), ("steer_right", "Steer Right"), ("hands_close", "Hands Close"), ("hands_far", "Hands Far"), ("left_forward", "L Forward"), ("left_backward", "L Backward"), ("right_forward", "R Forward"), ("right_backward", "R Backward")]
-        for key, label in bindings:
-            row = tk.Frame(card, bg=COLORS['bg_card'])
-            row.pack(fill=tk.X, padx=12, pady=4)
-            var = tk.BooleanVar(value=self.cfg.enabled_gestures.get(key, True))
-            NeonToggle(row, var, width=44, height=22).pack(side=tk.LEFT, padx=(0, 8))
-            self.gesture_enabled[key] = var
-            tk.Label(row, text=label, bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10), width=11, anchor='w').pack(side=tk.LEFT)
-            entry = tk.Entry(row, width=8, bg=COLORS['bg_medium'], fg=COLORS['accent'], font=('Consolas', 11), relief=tk.FLAT, insertbackground=COLORS['accent'])
-            entry.pack(side=tk.RIGHT, padx=5)
-            self.key_entries[key] = entry
-
-        # STEERING ZONES CARD
-        card = self._card(c, "STEERING ZONES")
-        
-        # Dead zone width slider
-        row = tk.Frame(card, bg=COLORS['bg_card'])
-        row.pack(fill=tk.X, padx=12, pady=6)
-        tk.Label(row, text="Dead Zone (Center)", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
-        self.dead_zone_var = tk.DoubleVar(value=self.cfg.thresholds.get('dead_zone_ratio', 0.3))
-        NeonSlider(row, self.dead_zone_var, from_=0.1, to=0.6, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
-        self.dead_zone_lbl = tk.Label(row, text=f"{self.dead_zone_var.get():.0%}", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Consolas', 10))
-        self.dead_zone_lbl.pack(anchor=tk.E)
-        self.dead_zone_var.trace_add('write', self._on_zone_change)
-        
-        # Steering strength slider (controls PWM aggressiveness)
-        row = tk.Frame(card, bg=COLORS['bg_card'])
-        row.pack(fill=tk.X, padx=12, pady=6)
-        tk.Label(row, text="Steering Strength", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
-        self.steer_strength_var = tk.DoubleVar(value=self.cfg.sensitivity.get('steering_strength', 1.0))
-        NeonSlider(row, self.steer_strength_var, from_=0.5, to=2.0, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
-        self.steer_strength_lbl = tk.Label(row, text=f"{self.steer_strength_var.get():.1f}x", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Consolas', 10))
-        self.steer_strength_lbl.pack(anchor=tk.E)
-        self.steer_strength_var.trace_add('write', self._on_strength_change)
-
-        card = self._card(c, "THRESHOLDS")
-        self.thresh_vars = {}
-        thresholds = [("steering_angle", "Steering Angle", 15, 50), ("finger_extend_thresh", "Finger Extend", 0.02, 0.12), ("hands_close_dist", "Hands Close", 0.05, 0.25), ("hands_far_dist", "Hands Far", 0.40, 0.70), ("stability_delay", "Stability (s)", 0.08, 0.30)]
-        for key, label, mn, mx in thresholds:
-            row = tk.Frame(card, bg=COLORS['bg_card'])
-            row.pack(fill=tk.X, padx=12, pady=6)
-            tk.Label(row, text=label, bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
-            var = tk.DoubleVar(value=self.cfg.thresholds.get(key, (mn+mx)/2))
-            NeonSlider(row, var, from_=mn, to=mx, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
-            self.thresh_vars[key] = var
-        card = self._card(c, "SENSITIVITY")
-        self.sens_vars = {}
-        for key in ["steering", "fingers", "distance"]:
-            row = tk.Frame(card, bg=COLORS['bg_card'])
-            row.pack(fill=tk.X, padx=12, pady=6)
-            tk.Label(row, text=key.title(), bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
-            var = tk.DoubleVar(value=self.cfg.sensitivity.get(key, 1.0))
-            NeonSlider(row, var, from_=0.5, to=2.0, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
-            self.sens_vars[key] = var
-        btn_frame = tk.Frame(c, bg=COLORS['bg_medium'])
-        btn_frame.pack(fill=tk.X, pady=20, padx=12)
-        NeonButton(btn_frame, "💾 SAVE", self._save, width=160, height=48).pack(side=tk.LEFT, padx=(0, 10))
-        NeonButton(btn_frame, "↺ RESET", self._reset, width=160, height=48, primary=False).pack(side=tk.LEFT)
-        tk.Frame(c, height=30, bg=COLORS['bg_medium']).pack()
-
-    def _on_zone_change(self, *args):
-        """Handle zone slider changes in real-time."""
-        dead = self.dead_zone_var.get()
-        
-        self.dead_zone_lbl.config(text=f"{dead:.0%}")
-        
-        # Update config
-        self.cfg.thresholds['dead_zone_ratio'] = dead
-        
-        # Update detector if running
-        if self.detector:
-            self.detector.update_thresholds(self.cfg.thresholds)
-
-    def _on_strength_change(self, *args):
-        """Handle steering strength slider changes in real-time."""
-        strength = self.steer_strength_var.get()
-        
-        self.steer_strength_lbl.config(text=f"{strength:.1f}x")
-        
-        # Update config
-        self.cfg.sensitivity['steering_strength'] = strength
-        
-        # Update keyboard controller
-        self.keyboard.set_steering_strength(strength)
-
-    def _card(self, parent, title):
-        card = tk.Frame(parent, bg=COLORS['bg_card'])
-        card.pack(fill=tk.X, padx=10, pady=8)
-        header = tk.Frame(card, bg=COLORS['bg_card'])
-        header.pack(fill=tk.X, padx=12, pady=(12, 8))
-        tk.Frame(header, bg=COLORS['accent'], width=4, height=20).pack(side=tk.LEFT, padx=(0, 10))
-        tk.Label(header, text=title, bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 13, 'bold')).pack(side=tk.LEFT)
-        return card
-
-    def _load_config(self):
-        for k, e in self.key_entries.items():
-            e.delete(0, tk.END)
-            e.insert(0, self.cfg.keybindings.get(k, ''))
-        for k, v in self.gesture_enabled.items():
-            v.set(self.cfg.enabled_gestures.get(k, True))
-        for k, v in self.thresh_vars.items():
-            v.set(self.cfg.thresholds.get(k, 0.5))
-        for k, v in self.sens_vars.items():
-            v.set(self.cfg.sensitivity.get(k, 1.0))
-        self.opt_vars["Show Skeleton"].set(self.cfg.show_skeleton)
-        self.opt_vars["Show Trails"].set(self.cfg.show_trails)
-        self.opt_vars["Mirror Mode"].set(self.cfg.mirror_mode)
-        self.opt_vars["Stability Filter"].set(self.cfg.stability_mode)
-        self.cam_var.set(str(self.cfg.camera_index))
-        self.maxk_var.set(str(self.cfg.max_keys))
-        # Load zone values
-        self.dead_zone_var.set(self.cfg.thresholds.get('dead_zone_ratio', 0.3))
-        self.steer_strength_var.set(self.cfg.sensitivity.get('steering_strength', 1.0))
-        self.keyboard.set_steering_strength(self.steer_strength_var.get())
-
-    def _maxk_change(self):
-        try:
-            v = int(self.maxk_var.get())
-            self.keyboard.set_max(v)
-            self.cfg.max_keys = v
-        except: pass
-
-    def _apply_profile(self, name):
-        self.cfg.apply_profile(name)
-        self._load_config()
-        if self.detector:
-            self.detector.update_thresholds(self.cfg.thresholds)
-            self.detector.update_sensitivity(self.cfg.sensitivity)
-        self.keyboard.set_max(self.cfg.max_keys)
-        self.keyboard.set_steering_strength(self.cfg.sensitivity.get('steering_strength', 1.0))
-        messagebox.showinfo("Profile", f"{name.upper()} profile loaded!")
-
-    def _save(self):
-        for k, e in self.key_entries.items():
-            self.cfg.keybindings[k] = e.get().strip()
-        for k, v in self.gesture_enabled.items():
-            self.cfg.enabled_gestures[k] = v.get()
-        for k, v in self.thresh_vars.items():
-            self.cfg.thresholds[k] = v.get()
-        for k, v in self.sens_vars.items():
-            self.cfg.sensitivity[k] = v.get()
-        # Save zone values
-        self.cfg.thresholds['dead_zone_ratio'] = self.dead_zone_var.get()
-        self.cfg.sensitivity['steering_strength'] = self.steer_strength_var.get()
-        if self.detector:
-            self.detector.update_thresholds(self.cfg.thresholds)
-            self.detector.update_sensitivity(self.cfg.sensitivity)
-        self.cfg.save()
-        messagebox.showinfo("Saved", "Settings saved!")
-
-    def _reset(self):
-        self.cfg.reset()
-        self._load_config()
-        if self.detector:
-            self.detector.update_thresholds(self.cfg.thresholds)
-            self.detector.update_sensitivity(self.cfg.sensitivity)
-
-    def _start(self):
-        if self.running: return
-        idx = int(self.cam_var.get())
-        self.cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
-        if not self.cap.isOpened(): self.cap = cv2.VideoCapture(idx)
-        if not self.cap.isOpened():
-            messagebox.showerror("Error", f"Cannot open camera {idx}")
-            return
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        for _ in range(5): self.cap.read()
-        self.detector = GestureDetector(self.cfg.thresholds, self.cfg.sensitivity)
-        self.running = True
-        self.last_time = time.time()
-        self._loop()
-
-    def _stop(self):
-        self.running = False
-        if self.cap: self.cap.release(); self.cap = None
-        if self.detector: self.detector.release(); self.detector = None
-        self.keyboard.release_all()
-        self.active_keys.clear()
-        self.cam_lbl.config(image='', text="\n\n📷 Camera Stopped\n\nClick START")
-        self.fps_lbl.config(text="FPS: --")
-        self.hands_lbl.config(text="Hands: None")
-        self.gest_lbl.config(text="None")
-        self.pressed_lbl.config(text="Keys: None")
-        self.force_lbl.config(text="Steering: 0% | Pulse: OFF")
-
-    def _loop(self):
-        if not self.running or not self.cap: return
-        ret, frame = self.cap.read()
-        if not ret:
-            self.root.after(10, self._loop)
-            return
-        now = time.time()
-        dt = now - self.last_time
-        self.last_time = now
-        self.fps = 1.0 / dt if dt > 0 else 0
-        if self.opt_vars["Mirror Mode"].get(): frame = cv2.flip(frame, 1)
-        if self.detector:
-            try:
-                self.state, frame = self.detector.process(frame, self.opt_vars["Stability Filter"].get())
-                frame = self.detector.draw(frame, self.opt_vars["Show Skeleton"].get(), self.opt_vars["Show Trails"].get())
-                self._handle_gestures()
-            except Exception as e:
-                print(f"Error: {e}")
-                if self.detector: self.detector.reset()
-        cv2.putText(frame, f"FPS: {int(self.fps)}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 230, 255), 2)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = ImageTk.PhotoImage(Image.fromarray(rgb))
-        self.cam_lbl.imgtk = img
-        self.cam_lbl.config(image=img, text="")
-        self.fps_lbl.config(text=f"FPS: {int(self.fps)}")
-        hands = []
-        if self.state.left_detected: hands.append("Left")
-        if self.state.right_detected: hands.append("Right")
-        self.hands_lbl.config(text=f"Hands: {', '.join(hands) if hands else 'None'}")
-        self.keys_lbl.config(text=f"Active: {self.keyboard.count()}/{self.keyboard.max_keys}")
-        self.gest_lbl.config(text="  |  ".join(self.state.active) if self.state.active else "None")
-        pressed = self.keyboard.get_pressed()
-        self.pressed_lbl.config(text=f"Keys: {' + '.join(key_display(k) for k in pressed) if pressed else 'None'}")
-        
-        # Show steering force and pulse state
-        force = self.state.steering_force
-        pulse_state = "OFF"
-        steer_key = None
-        if self.state.steer_left:
-            steer_key = self.cfg.keybindings.get('steer_left', '')
-        elif self.state.steer_right:
-            steer_key = self.cfg.keybindings.get('steer_right', '')
-        
-        if steer_key:
-            pwm = self.keyboard.get_pwm_state(steer_key)
-            if pwm:
-                pulse_state = "ON" if pwm['is_on'] else "off"
-        
-        self.force_lbl.config(text=f"Steering: {force:.0%} | Pulse: {pulse_state}")
-        self.root.after(1, self._loop)
-
-    def _handle_gestures(self):
-        s = self.state
-        
-        # Handle steering with PWM
-        steer_left_key = self.cfg.keybindings.get('steer_left', '')
-        steer_right_key = self.cfg.keybindings.get('steer_right', '')
-        
-        # PWM steering for left
-        if s.steer_left and self.gesture_enabled.get('steer_left', tk.BooleanVar(value=True)).get():
-            if steer_left_key:
-                self.keyboard.press_pwm(steer_left_key, s.steering_force)
-        else:
-            if steer_left_key:
-                self.keyboard.release(steer_left_key)
-        
-        # PWM steering for right
-        if s.steer_right and self.gesture_enabled.get('steer_right', tk.BooleanVar(value=True)).get():
-            if steer_right_key:
-                self.keyboard.press_pwm(steer_right_key, s.steering_force)
-        else:
-            if steer_right_key:
-                self.keyboard.release(steer_right_key)
-        
-        # Handle other gestures (non-PWM)
-        other_mapping = {
-            'hands_close': s.hands_close, 'hands_far': s.hands_far,
-            'left_forward': s.left_forward, 'left_backward': s.left_backward,
-            'right_forward': s.right_forward, 'right_backward': s.right_backward,
-        }
-        new_active = set()
-        for gesture, active in other_mapping.items():
-            if not self.gesture_enabled.get(gesture, tk.BooleanVar(value=True)).get(): continue
-            key = self.cfg.keybindings.get(gesture, '')
-            if not key: continue
-            if active:
-                if self.keyboard.press(key): new_active.add(key)
-            elif key in self.active_keys:
-                self.keyboard.release(key)
-        for key in self.active_keys - new_active:
-            if key not in [steer_left_key, steer_right_key]:
-                self.keyboard.release(key)
-        self.active_keys = new_active
-
-    def _close(self):
-        self._stop()
-        self.cfg.show_skeleton = self.opt_vars["Show Skeleton"].get()
-        self.cfg.show_trails = self.opt_vars["Show Trails"].get()
-        self.cfg.mirror_mode = self.opt_vars["Mirror Mode"].get()
-        self.cfg.stability_mode = self.opt_vars["Stability Filter"].get()
-        self.cfg.camera_index = int(self.cam_var.get())
-        self.cfg.thresholds['dead_zone_ratio'] = self.dead_zone_var.get()
-        self.cfg.sensitivity['steering_strength'] = self.steer_strength_var.get()
-        self.cfg.save()
-        self.root.destroy()
-
-    def run(self):
-        self.root.mainloop()
+import tkinter as tk
+import _tkinter
+from tkinter import ttk, messagebox
+import cv2
+from PIL import Image, ImageTk
+import threading
+import time
+from typing import Optional, Set
+from config import Config
+from gesture_detector import GestureDetector, GestureState
+from keyboard_controller import KeyboardController, handle_gestures
+from frame_pool import FramePipeline
+from supervisor import CaptureWatchdog
+from camera import open_camera, FPS
+from idle import IdleMonitor
+from state_server import StateServer, make_server
+from preview_server import PreviewServer
+from history import render_timeline
+from utils import key_display
+from clock import millis, monotonic
+
+TIMELINE_SIZE = (640, 110)
+STOP_TIMEOUT = 1.0  # Seconds STOP waits for the capture thread before abandoning it
+
+COLORS = {
+    'bg_dark': '#05080f',
+    'bg_medium': '#0a1020',
+    'bg_card': '#101828',
+    'bg_card_light': '#182030',
+    'accent': '#00e5ff',
+    'accent2': '#b388ff',
+    'text': '#e8eaed',
+    'text_dim': '#6b7280',
+    'success': '#00e676',
+    'warning': '#ffab00',
+    'border': '#1e3a5f',
+}
+
+class NeonButton(tk.Canvas):
+    def __init__(self, parent, text, command=None, width=160, height=48, primary=True, color=None):
+        super().__init__(parent, width=width, height=height, bg=COLORS['bg_medium'], highlightthickness=0, cursor='hand2')
+        self.command = command
+        self.enabled = True
+        self.text = text
+        self.w, self.h = width, height
+        self.primary = primary
+        self.color = color or COLORS['accent']
+        self.hover = False
+        self._draw()
+        self.bind('<Enter>', lambda e: self._set_hover(True))
+        self.bind('<Leave>', lambda e: self._set_hover(False))
+        self.bind('<Button-1>', lambda e: self._click())
+    def _set_hover(self, state):
+        self.hover = state
+        self._draw()
+    def _click(self):
+        if self.command and self.enabled: self.command()
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.config(cursor='hand2' if enabled else 'watch')
+    def _draw(self):
+        self.delete('all')
+        r = 10
+        if self.primary:
+            fill = self.color if self.hover else COLORS['bg_card']
+            text_col = COLORS['bg_dark'] if self.hover else self.color
+            outline = self.color
+        else:
+            fill = COLORS['bg_card_light'] if self.hover else COLORS['bg_card']
+            outline = self.color if self.hover else COLORS['border']
+            text_col = self.color if self.hover else COLORS['text']
+        self._rounded_rect(2, 2, self.w-2, self.h-2, r, fill=fill, outline=outline, width=2)
+        self.create_text(self.w//2, self.h//2, text=self.text, fill=text_col, font=('Segoe UI', 11, 'bold'))
+    def _rounded_rect(self, x1, y1, x2, y2, r, **kwargs):
+        points = [x1+r,y1, x2-r,y1, x2,y1, x2,y1+r, x2,y2-r, x2,y2, x2-r,y2, x1+r,y2, x1,y2, x1,y2-r, x1,y1+r, x1,y1]
+        return self.create_polygon(points, smooth=True, **kwargs)
+
+class NeonSlider(tk.Canvas):
+    def __init__(self, parent, variable, from_=0, to=100, width=280, height=40):
+        super().__init__(parent, width=width, height=height, bg=COLORS['bg_card'], highlightthickness=0, cursor='hand2')
+        self.var = variable
+        self.from_, self.to = from_, to
+        self.w, self.h = width, height
+        self.dragging = False
+        self.bind('<Button-1>', self._click)
+        self.bind('<B1-Motion>', self._drag)
+        self.bind('<ButtonRelease-1>', lambda e: setattr(self, 'dragging', False))
+        self.var.trace_add('write', lambda *a: self._draw())
+        self._draw()
+    def _val_to_x(self, val):
+        return 15 + (val - self.from_) / (self.to - self.from_) * (self.w - 50)
+    def _x_to_val(self, x):
+        ratio = max(0, min(1, (x - 15) / (self.w - 50)))
+        return self.from_ + ratio * (self.to - self.from_)
+    def _click(self, e):
+        self.var.set(self._x_to_val(e.x))
+        self.dragging = True
+    def _drag(self, e):
+        if self.dragging: self.var.set(self._x_to_val(e.x))
+    def _draw(self):
+        self.delete('all')
+        y = self.h // 2
+        self.create_line(15, y, self.w-35, y, fill=COLORS['border'], width=6, capstyle='round')
+        x = self._val_to_x(self.var.get())
+        self.create_line(15, y, x, y, fill=COLORS['accent'], width=6, capstyle='round')
+        self.create_oval(x-9, y-9, x+9, y+9, fill=COLORS['accent'], outline=COLORS['text'], width=2)
+        val = self.var.get()
+        txt = f"{val:.2f}" if val < 10 else f"{int(val)}"
+        self.create_text(self.w-15, y, text=txt, fill=COLORS['text'], font=('Consolas', 10, 'bold'), anchor='e')
+
+class NeonToggle(tk.Canvas):
+    def __init__(self, parent, variable, width=50, height=26):
+        super().__init__(parent, width=width, height=height, bg=COLORS['bg_card'], highlightthickness=0, cursor='hand2')
+        self.var = variable
+        self.w, self.h = width, height
+        self.bind('<Button-1>', self._toggle)
+        self.var.trace_add('write', lambda *a: self._draw())
+        self._draw()
+    def _toggle(self, e=None):
+        self.var.set(not self.var.get())
+    def _draw(self):
+        self.delete('all')
+        on = self.var.get()
+        r = self.h // 2 - 2
+        bg = COLORS['accent'] if on else COLORS['border']
+        points = [r+2,2, self.w-r-2,2, self.w-2,2, self.w-2,r+2, self.w-2,self.h-r-2, self.w-2,self.h-2, self.w-r-2,self.h-2, r+2,self.h-2, 2,self.h-2, 2,self.h-r-2, 2,r+2, 2,2]
+        self.create_polygon(points, smooth=True, fill=bg, outline='')
+        cx = self.w - r - 4 if on else r + 4
+        self.create_oval(cx-r+2, 4, cx+r-2, self.h-4, fill=COLORS['text'], outline='')
+
+class ScrollFrame(tk.Frame):
+    def __init__(self, parent, bg=COLORS['bg_medium']):
+        super().__init__(parent, bg=bg)
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, bd=0)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.inner = tk.Frame(self.canvas, bg=bg)
+        self.inner.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.win = self.canvas.create_window((0, 0), window=self.inner, anchor="nw")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.bind('<Configure>', lambda e: self.canvas.itemconfig(self.win, width=e.width))
+        self.canvas.bind('<Enter>', lambda e: self.canvas.bind_all("<MouseWheel>", self._scroll))
+        self.canvas.bind('<Leave>', lambda e: self.canvas.unbind_all("<MouseWheel>"))
+    def _scroll(self, e):
+        self.canvas.yview_scroll(int(-1*(e.delta/120)), "units")
+
+class App:
+    def __init__(self):
+        self.cfg = Config.load()
+        self.root = tk.Tk()
+        self.root.title("GESTURE GAMING CONTROL")
+        self.root.configure(bg=COLORS['bg_dark'])
+        self.root.state('zoomed')
+        self.root.minsize(1400, 800)
+        self.detector: Optional[GestureDetector] = None
+        self.clock = monotonic  # Shared by detection, idle, FPS and key timing
+        self.keyboard = KeyboardController(self.cfg.max_keys, clock=millis(self.clock))
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.frames = FramePipeline()
+        self.watchdog: Optional[CaptureWatchdog] = None
+        self.idle = IdleMonitor(self.cfg.idle_timeout, self.clock)
+        self.photo: Optional[ImageTk.PhotoImage] = None
+        self.running = False
+        self.paused = False  # Camera and graph stay open, nothing is inferred or pressed
+        self.state = GestureState()
+        self.active_keys: Set[str] = set()
+        self.last_time = 0
+        self.fps = 0
+        self.state_server: Optional[StateServer] = None
+        if self.cfg.state_server:
+            try:
+                self.state_server = make_server(self.cfg.state_server, port=self.cfg.state_port, landmarks=self.cfg.state_landmarks)
+            except (OSError, ValueError) as e:
+                print(f"State server disabled: {e}")
+        self.worker: Optional[threading.Thread] = None
+        self._stopping = False
+        self._result: Optional[dict] = None  # Newest capture result not yet drawn
+        self._result_lock = threading.Lock()
+        self._notified = False
+        self.shown_idle = False
+        self.preview: Optional[PreviewServer] = None
+        if self.cfg.preview_port:
+            try:
+                self.preview = PreviewServer(self.cfg.preview_host, self.cfg.preview_port, self.cfg.preview_fps)
+            except OSError as e:
+                print(f"Preview server disabled: {e}")
+        self._build_ui()
+        self._load_config()
+        for var in list(self.opt_vars.values()) + list(self.gesture_enabled.values()):
+            var.trace_add('write', lambda *a: self._sync_opts())
+        self._sync_opts()
+        self.root.bind('<<FrameReady>>', self._render)
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
+
+    def _build_ui(self):
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure('TCombobox', fieldbackground=COLORS['bg_card'], background=COLORS['bg_card'], foreground=COLORS['text'], arrowcolor=COLORS['accent'])
+        main = tk.Frame(self.root, bg=COLORS['bg_dark'])
+        main.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        left = tk.Frame(main, bg=COLORS['bg_medium'], width=340)
+        left.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 15))
+        left.pack_propagate(False)
+        self._build_left(left)
+        center = tk.Frame(main, bg=COLORS['bg_dark'])
+        center.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 15))
+        self._build_center(center)
+        right = tk.Frame(main, bg=COLORS['bg_medium'], width=400)
+        right.pack(side=tk.RIGHT, fill=tk.Y)
+        right.pack_propagate(False)
+        self._build_right(right)
+
+    def _build_left(self, parent):
+        scroll = ScrollFrame(parent, bg=COLORS['bg_medium'])
+        scroll.pack(fill=tk.BOTH, expand=True)
+        c = scroll.inner
+        tk.Label(c, text="🎮 CONTROLS", bg=COLORS['bg_medium'], fg=COLORS['accent'], font=('Segoe UI', 24, 'bold')).pack(anchor=tk.W, padx=20, pady=(25, 5))
+        tk.Label(c, text="Gesture Gaming System v3.0", bg=COLORS['bg_medium'], fg=COLORS['text_dim'], font=('Segoe UI', 10)).pack(anchor=tk.W, padx=20, pady=(0, 20))
+        btn_frame = tk.Frame(c, bg=COLORS['bg_medium'])
+        btn_frame.pack(fill=tk.X, padx=20, pady=10)
+        self.start_btn = NeonButton(btn_frame, "▶ START", self._start, width=145, height=52)
+        self.start_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.stop_btn = NeonButton(btn_frame, "⏸ PAUSE", self._pause, width=145, height=52, primary=False)
+        self.stop_btn.pack(side=tk.LEFT)
+        card = self._card(c, "CAMERA")
+        row = tk.Frame(card, bg=COLORS['bg_card'])
+        row.pack(fill=tk.X, padx=15, pady=12)
+        tk.Label(row, text="Select Camera:", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 11)).pack(side=tk.LEFT)
+        self.cam_var = tk.StringVar(value="0")
+        ttk.Combobox(row, textvariable=self.cam_var, values=["0","1","2"], width=5, state="readonly").pack(side=tk.RIGHT)
+        card = self._card(c, "OPTIONS")
+        self.opt_vars = {}
+        for name, default in [("Show Skeleton", True), ("Show Trails", True), ("Mirror Mode", True), ("Stability Filter", True), ("Enable Keyboard", True)]:
+            row = tk.Frame(card, bg=COLORS['bg_card'])
+            row.pack(fill=tk.X, padx=15, pady=6)
+            tk.Label(row, text=name, bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 11)).pack(side=tk.LEFT)
+            var = tk.BooleanVar(value=default)
+            NeonToggle(row, var).pack(side=tk.RIGHT)
+            self.opt_vars[name] = var
+        self.opt_vars["Enable Keyboard"].trace_add('write', lambda *a: self.keyboard.set_enabled(self.opt_vars["Enable Keyboard"].get()))
+        row = tk.Frame(card, bg=COLORS['bg_card'])
+        row.pack(fill=tk.X, padx=15, pady=(10, 15))
+        tk.Label(row, text="Max Keys:", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 11)).pack(side=tk.LEFT)
+        self.maxk_var = tk.StringVar(value=str(self.cfg.max_keys))
+        maxk = ttk.Combobox(row, textvariable=self.maxk_var, values=["1","2","3","4","5"], width=4, state="readonly")
+        maxk.pack(side=tk.RIGHT)
+        maxk.bind('<<ComboboxSelected>>', lambda e: self._maxk_change())
+        card = self._card(c, "STATUS")
+        self.fps_lbl = tk.Label(card, text="FPS: --", bg=COLORS['bg_card'], fg=COLORS['success'], font=('Consolas', 20, 'bold'))
+        self.fps_lbl.pack(anchor=tk.W, padx=15, pady=8)
+        self.hands_lbl = tk.Label(card, text="Hands: None", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 12))
+        self.hands_lbl.pack(anchor=tk.W, padx=15, pady=3)
+        self.keys_lbl = tk.Label(card, text="Active: 0/4", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 12))
+        self.keys_lbl.pack(anchor=tk.W, padx=15, pady=3)
+        self.health_lbl = tk.Label(card, text="Recoveries: 0 | Stalls: 0", bg=COLORS['bg_card'], fg=COLORS['text_dim'], font=('Segoe UI', 10))
+        self.health_lbl.pack(anchor=tk.W, padx=15, pady=(3, 15))
+        card = self._card(c, "PROFILES")
+        for name in self.cfg.profile_names():
+            NeonButton(card, f"⚡ {name.upper()}", lambda n=name: self._apply_profile(n), width=280, height=44, primary=False, color=COLORS['accent2']).pack(pady=6, padx=15)
+        tk.Frame(c, height=30, bg=COLORS['bg_medium']).pack()
+
+    def _build_center(self, parent):
+        tk.Label(parent, text="📹 CAMERA FEED", bg=COLORS['bg_dark'], fg=COLORS['accent'], font=('Segoe UI', 20, 'bold')).pack(anchor=tk.W, pady=(0, 12))
+        cam_border = tk.Frame(parent, bg=COLORS['accent'])
+        cam_border.pack()
+        cam_inner = tk.Frame(cam_border, bg=COLORS['bg_dark'], width=640, height=480)
+        cam_inner.pack(padx=3, pady=3)
+        cam_inner.pack_propagate(False)
+        self.cam_lbl = tk.Label(cam_inner, text="\n\n📷 Camera Not Started\n\nClick START", bg=COLORS['bg_dark'], fg=COLORS['text_dim'], font=('Segoe UI', 16))
+        self.cam_lbl.pack(fill=tk.BOTH, expand=True)
+        gest = tk.Frame(parent, bg=COLORS['bg_card'])
+        gest.pack(fill=tk.X, pady=15)
+        tk.Label(gest, text="⚡ ACTIVE GESTURES", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 14, 'bold')).pack(anchor=tk.W, padx=20, pady=(15, 8))
+        self.gest_lbl = tk.Label(gest, text="None", bg=COLORS['bg_card'], fg=COLORS['success'], font=('Consolas', 15, 'bold'), wraplength=600)
+        self.gest_lbl.pack(anchor=tk.W, padx=25, pady=(0, 8))
+        self.pressed_lbl = tk.Label(gest, text="Keys: None", bg=COLORS['bg_card'], fg=COLORS['warning'], font=('Consolas', 12))
+        self.pressed_lbl.pack(anchor=tk.W, padx=25, pady=(0, 8))
+        self.force_lbl = tk.Label(gest, text="Steering: 0% | Pulse: OFF", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Consolas', 12))
+        self.force_lbl.pack(anchor=tk.W, padx=25, pady=(0, 15))
+        self.timeline_lbl = None
+        self.timeline_photo: Optional[ImageTk.PhotoImage] = None
+        if self.cfg.timeline_seconds > 0:
+            tl = tk.Frame(parent, bg=COLORS['bg_card'])
+            tl.pack(fill=tk.X, pady=(0, 10))
+            tk.Label(tl, text=f"📈 LAST {self.cfg.timeline_seconds:g}s  (angle, distance, gestures)", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 11, 'bold')).pack(anchor=tk.W, padx=20, pady=(10, 4))
+            self.timeline_lbl = tk.Label(tl, bg=COLORS['bg_dark'])
+            self.timeline_lbl.pack(padx=20, pady=(0, 10))
+        info = tk.Frame(parent, bg=COLORS['bg_card'])
+        info.pack(fill=tk.X, pady=5)
+        tk.Label(info, text="💡 GESTURES: Forward=Point 2 fingers | Backward=Thumbs up | Steer=Tilt hands", bg=COLORS['bg_card'], fg=COLORS['text_dim'], font=('Segoe UI', 10)).pack(padx=15, pady=10)
+
+    def _build_right(self, parent):
+        tk.Label(parent, text="⚙️ SETTINGS", bg=COLORS['bg_medium'], fg=COLORS['accent'], font=('Segoe UI', 24, 'bold')).pack(pady=(25, 5), padx=20, anchor=tk.W)
+        scroll = ScrollFrame(parent, bg=COLORS['bg_medium'])
+        scroll.pack(fill=tk.BOTH, expand=True)
+        c = scroll.inner
+        card = self._card(c, "GESTURE BINDINGS")
+        self.key_entries = {}
+        self.gesture_enabled = {}
+        bindings = [("steer_left", "Steer Left"), ("steer_right", "Steer Right"), ("hands_close", "Hands Close"), ("hands_far", "Hands Far"), ("left_forward", "L Forward"), ("left_backward", "L Backward"), ("right_forward", "R Forward"), ("right_backward", "R Backward")]
+        for key, label in bindings:
+            row = tk.Frame(card, bg=COLORS['bg_card'])
+            row.pack(fill=tk.X, padx=12, pady=4)
+            var = tk.BooleanVar(value=self.cfg.enabled_gestures.get(key, True))
+            NeonToggle(row, var, width=44, height=22).pack(side=tk.LEFT, padx=(0, 8))
+            self.gesture_enabled[key] = var
+            tk.Label(row, text=label, bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10), width=11, anchor='w').pack(side=tk.LEFT)
+            entry = tk.Entry(row, width=8, bg=COLORS['bg_medium'], fg=COLORS['accent'], font=('Consolas', 11), relief=tk.FLAT, insertbackground=COLORS['accent'])
+            entry.pack(side=tk.RIGHT, padx=5)
+            self.key_entries[key] = entry
+
+        # STEERING ZONES CARD
+        card = self._card(c, "STEERING ZONES")
+        
+        # Dead zone width slider
+        row = tk.Frame(card, bg=COLORS['bg_card'])
+        row.pack(fill=tk.X, padx=12, pady=6)
+        tk.Label(row, text="Dead Zone (Center)", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
+        self.dead_zone_var = tk.DoubleVar(value=self.cfg.thresholds.get('dead_zone_ratio', 0.3))
+        NeonSlider(row, self.dead_zone_var, from_=0.1, to=0.6, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
+        self.dead_zone_lbl = tk.Label(row, text=f"{self.dead_zone_var.get():.0%}", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Consolas', 10))
+        self.dead_zone_lbl.pack(anchor=tk.E)
+        self.dead_zone_var.trace_add('write', self._on_zone_change)
+        
+        # Steering strength slider (controls PWM aggressiveness)
+        row = tk.Frame(card, bg=COLORS['bg_card'])
+        row.pack(fill=tk.X, padx=12, pady=6)
+        tk.Label(row, text="Steering Strength", bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
+        self.steer_strength_var = tk.DoubleVar(value=self.cfg.sensitivity.get('steering_strength', 1.0))
+        NeonSlider(row, self.steer_strength_var, from_=0.5, to=2.0, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
+        self.steer_strength_lbl = tk.Label(row, text=f"{self.steer_strength_var.get():.1f}x", bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Consolas', 10))
+        self.steer_strength_lbl.pack(anchor=tk.E)
+        self.steer_strength_var.trace_add('write', self._on_strength_change)
+
+        card = self._card(c, "THRESHOLDS")
+        self.thresh_vars = {}
+        thresholds = [("steering_angle", "Steering Angle", 15, 50), ("finger_extend_thresh", "Finger Extend", 0.02, 0.12), ("hands_close_dist", "Hands Close", 0.05, 0.25), ("hands_far_dist", "Hands Far", 0.40, 0.70), ("stability_delay", "Stability (s)", 0.08, 0.30), ("predict_horizon_ms", "Prediction (ms)", 0, 150)]
+        for key, label, mn, mx in thresholds:
+            row = tk.Frame(card, bg=COLORS['bg_card'])
+            row.pack(fill=tk.X, padx=12, pady=6)
+            tk.Label(row, text=label, bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
+            var = tk.DoubleVar(value=self.cfg.thresholds.get(key, (mn+mx)/2))
+            NeonSlider(row, var, from_=mn, to=mx, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
+            self.thresh_vars[key] = var
+        card = self._card(c, "SENSITIVITY")
+        self.sens_vars = {}
+        for key in ["steering", "fingers", "distance"]:
+            row = tk.Frame(card, bg=COLORS['bg_card'])
+            row.pack(fill=tk.X, padx=12, pady=6)
+            tk.Label(row, text=key.title(), bg=COLORS['bg_card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(anchor=tk.W)
+            var = tk.DoubleVar(value=self.cfg.sensitivity.get(key, 1.0))
+            NeonSlider(row, var, from_=0.5, to=2.0, width=320, height=36).pack(anchor=tk.W, pady=(4, 0))
+            self.sens_vars[key] = var
+        btn_frame = tk.Frame(c, bg=COLORS['bg_medium'])
+        btn_frame.pack(fill=tk.X, pady=20, padx=12)
+        NeonButton(btn_frame, "💾 SAVE", self._save, width=160, height=48).pack(side=tk.LEFT, padx=(0, 10))
+        NeonButton(btn_frame, "↺ RESET", self._reset, width=160, height=48, primary=False).pack(side=tk.LEFT)
+        tk.Frame(c, height=30, bg=COLORS['bg_medium']).pack()
+
+    def _on_zone_change(self, *args):
+        """Handle zone slider changes in real-time."""
+        dead = self.dead_zone_var.get()
+        
+        self.dead_zone_lbl.config(text=f"{dead:.0%}")
+        
+        # Update config
+        self.cfg.thresholds['dead_zone_ratio'] = dead
+        
+        # Update detector if running
+        if self.detector:
+            self.detector.update_thresholds(self.cfg.thresholds)
+
+    def _on_strength_change(self, *args):
+        """Handle steering strength slider changes in real-time."""
+        strength = self.steer_strength_var.get()
+        
+        self.steer_strength_lbl.config(text=f"{strength:.1f}x")
+        
+        # Update config
+        self.cfg.sensitivity['steering_strength'] = strength
+        
+        # Update keyboard controller
+        self.keyboard.set_steering_strength(strength)
+
+    def _card(self, parent, title):
+        card = tk.Frame(parent, bg=COLORS['bg_card'])
+        card.pack(fill=tk.X, padx=10, pady=8)
+        header = tk.Frame(card, bg=COLORS['bg_card'])
+        header.pack(fill=tk.X, padx=12, pady=(12, 8))
+        tk.Frame(header, bg=COLORS['accent'], width=4, height=20).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Label(header, text=title, bg=COLORS['bg_card'], fg=COLORS['accent'], font=('Segoe UI', 13, 'bold')).pack(side=tk.LEFT)
+        return card
+
+    def _load_config(self):
+        for k, e in self.key_entries.items():
+            e.delete(0, tk.END)
+            e.insert(0, self.cfg.keybindings.get(k, ''))
+        for k, v in self.gesture_enabled.items():
+            v.set(self.cfg.enabled_gestures.get(k, True))
+        for k, v in self.thresh_vars.items():
+            v.set(self.cfg.thresholds.get(k, 0.5))
+        for k, v in self.sens_vars.items():
+            v.set(self.cfg.sensitivity.get(k, 1.0))
+        self.opt_vars["Show Skeleton"].set(self.cfg.show_skeleton)
+        self.opt_vars["Show Trails"].set(self.cfg.show_trails)
+        self.opt_vars["Mirror Mode"].set(self.cfg.mirror_mode)
+        self.opt_vars["Stability Filter"].set(self.cfg.stability_mode)
+        self.cam_var.set(str(self.cfg.camera_index))
+        self.maxk_var.set(str(self.cfg.max_keys))
+        # Load zone values
+        self.dead_zone_var.set(self.cfg.thresholds.get('dead_zone_ratio', 0.3))
+        self.steer_strength_var.set(self.cfg.sensitivity.get('steering_strength', 1.0))
+        self.keyboard.set_steering_strength(self.steer_strength_var.get())
+
+    def _maxk_change(self):
+        try:
+            v = int(self.maxk_var.get())
+            self.keyboard.set_max(v)
+            self.cfg.max_keys = v
+        except: pass
+
+    def _apply_profile(self, name):
+        self.cfg.apply_profile(name)
+        self._load_config()
+        if self.detector:
+            self.detector.update_thresholds(self.cfg.thresholds)
+            self.detector.update_sensitivity(self.cfg.sensitivity)
+        self.keyboard.set_max(self.cfg.max_keys)
+        self.keyboard.set_steering_strength(self.cfg.sensitivity.get('steering_strength', 1.0))
+        messagebox.showinfo("Profile", f"{name.upper()} profile loaded!")
+
+    def _save(self):
+        for k, e in self.key_entries.items():
+            self.cfg.keybindings[k] = e.get().strip()
+        for k, v in self.gesture_enabled.items():
+            self.cfg.enabled_gestures[k] = v.get()
+        for k, v in self.thresh_vars.items():
+            self.cfg.thresholds[k] = v.get()
+        for k, v in self.sens_vars.items():
+            self.cfg.sensitivity[k] = v.get()
+        # Save zone values
+        self.cfg.thresholds['dead_zone_ratio'] = self.dead_zone_var.get()
+        self.cfg.sensitivity['steering_strength'] = self.steer_strength_var.get()
+        if self.detector:
+            self.detector.update_thresholds(self.cfg.thresholds)
+            self.detector.update_sensitivity(self.cfg.sensitivity)
+            self.detector.motion_enabled = self.cfg.motion_bound()
+        self.cfg.save()
+        messagebox.showinfo("Saved", "Settings saved!")
+
+    def _reset(self):
+        self.cfg.reset()
+        self._load_config()
+        if self.detector:
+            self.detector.update_thresholds(self.cfg.thresholds)
+            self.detector.update_sensitivity(self.cfg.sensitivity)
+
+    def _open_camera(self, idx: int, on_probe=None) -> Optional[cv2.VideoCapture]:
+        cached = str(idx) in self.cfg.camera_profiles
+        cap = open_camera(idx, self.cfg.camera_profiles, on_probe)
+        if cap and not cached:
+            # Persist the probe result so the next START skips probing
+            self.cfg.save()
+        return cap
+
+    def _show_probe(self, backend: str, fourcc: str):
+        """First START on a camera: say which backend/format is being tried."""
+        self.cam_lbl.config(image='', text=f"\n\n📷 Probing camera…\n\n{backend} / {fourcc}")
+        # Redraw only; input events wait, so nothing re-enters START
+        self.root.update_idletasks()
+
+    def _start(self):
+        idx = int(self.cam_var.get())
+        if self.running:
+            if not self.paused: return
+            if idx == self.cam_index:
+                # Warm resume: the worker picks it up on its next frame
+                self.paused = False
+                self._show_resuming()
+                return
+            # Different camera: full teardown, then start from scratch
+            self._stop()
+        self.cap = self._open_camera(idx, self._show_probe)
+        if not self.cap:
+            self.cam_lbl.config(text="\n\n📷 Camera Stopped\n\nClick START")
+            messagebox.showerror("Error", f"Cannot open camera {idx}")
+            return
+        self.watchdog = CaptureWatchdog(self.cfg.capture_timeout, self._on_stall)
+        try:
+            self.detector = GestureDetector(
+                self.cfg.thresholds, self.cfg.sensitivity,
+                backend=self.cfg.landmark_backend, model_path=self.cfg.hand_model_path or None,
+                rules=self.cfg.rules(), clock=self.clock,
+                graphs=self.cfg.inference_graphs, pool=self.cfg.inference_pool,
+            )
+        except Exception as e:
+            self.cap.release(); self.cap = None
+            self.watchdog.stop(); self.watchdog = None
+            messagebox.showerror("Error", f"Cannot start hand tracking: {e}")
+            return
+        self.detector.motion_enabled = self.cfg.motion_bound()
+        self.detector.set_enabled(self.cfg.enabled_rules(self.enabled))
+        self.cam_index = idx
+        self.idle = IdleMonitor(self.cfg.idle_timeout, self.clock)
+        self.shown_idle = False
+        self.paused = False
+        self.running = True
+        self.last_time = self.clock()
+        self.worker = threading.Thread(target=self._capture_loop, daemon=True)
+        self.worker.start()
+
+    def _pause(self):
+        """Stop key output but keep the camera and graph warm; START resumes."""
+        if not self.running or self.paused: return
+        self.paused = True
+        self.photo = None
+        self.cam_lbl.config(image='', text="\n\n⏸ Paused\n\nClick START to resume")
+        self.fps_lbl.config(text="FPS: -- (paused)")
+        self.hands_lbl.config(text="Hands: None")
+        self.gest_lbl.config(text="None")
+        self.pressed_lbl.config(text="Keys: None")
+        self.force_lbl.config(text="Steering: 0% | Pulse: OFF")
+
+    def _show_resuming(self):
+        self.cam_lbl.config(image='', text="\n\n▶ Resuming...")
+
+    def _stop(self):
+        """Full teardown: release the camera and the graph (camera change, errors, exit)."""
+        if self._stopping: return
+        self._stopping = True
+        for btn in (self.start_btn, self.stop_btn): btn.set_enabled(False)
+        self.running = False
+        self.paused = False
+        worker, self.worker = self.worker, None
+        # A read the worker is blocked in returns once the capture is released
+        if self.cap: self.cap.release()
+        if worker:
+            # The worker may be blocked handing its notification to this thread: run
+            # queued cross-thread calls (not user input, nothing re-entrant) until it exits
+            deadline = time.monotonic() + STOP_TIMEOUT
+            while worker.is_alive() and time.monotonic() < deadline:
+                self.root.tk.dooneevent(_tkinter.FILE_EVENTS | _tkinter.DONT_WAIT)
+                worker.join(0.01)
+            # Stuck in inference: it's a daemon and leaves its loop once it returns
+            if worker.is_alive(): print("Capture thread did not stop; abandoning it")
+        with self._result_lock:
+            result, self._result = self._result, None
+        if result: self.frames.release(result['frame'])
+        self.cap = None
+        if self.watchdog: self.watchdog.stop(); self.watchdog = None
+        if self.detector: self.detector.release(); self.detector = None
+        self.keyboard.release_all()
+        self.active_keys.clear()
+        self.frames.pool.clear()
+        self.photo = None
+        self.cam_lbl.config(image='', text="\n\n📷 Camera Stopped\n\nClick START")
+        self.fps_lbl.config(text="FPS: --")
+        self.hands_lbl.config(text="Hands: None")
+        self.gest_lbl.config(text="None")
+        self.pressed_lbl.config(text="Keys: None")
+        self.force_lbl.config(text="Steering: 0% | Pulse: OFF")
+        for btn in (self.start_btn, self.stop_btn): btn.set_enabled(True)
+        self._stopping = False
+
+    def _sync_opts(self):
+        """Copy the option toggles into plain values the capture thread can read."""
+        self.opts = {name: var.get() for name, var in self.opt_vars.items()}
+        # Rules from config.json without a toggle here keep their enabled_gestures value
+        self.enabled = dict(self.cfg.enabled_gestures, **{name: var.get() for name, var in self.gesture_enabled.items()})
+        # The detector only evaluates enabled gestures
+        if self.detector: self.detector.set_enabled(self.cfg.enabled_rules(self.enabled))
+
+    def _on_stall(self):
+        """Watchdog thread: a read is hung. Releasing the capture makes it
+        return, and the capture loop then reopens the camera."""
+        cap = self.cap
+        if cap: cap.release()
+
+    def _capture_loop(self):
+        """Capture, inference and key output on a worker thread; Tk only renders."""
+        was_paused = False
+        me = threading.current_thread()
+        # An abandoned worker (see _stop) must not carry on beside its replacement
+        while self.running and self.worker is me:
+            # Mirrored RGB frame from the pool, shared by inference, overlay and display
+            with self.watchdog:
+                frame = self.frames.next(self.cap, self.opts["Mirror Mode"])
+            if self.watchdog.consume():
+                # _on_stall has already released the capture to unblock the read
+                print("Camera read stalled, reopening")
+                if frame is not None: self.frames.release(frame); frame = None
+                self.cap.release()
+                self.cap = self._open_camera(self.cam_index)
+                if not self.cap:
+                    self._post({'error': "Camera stopped responding"})
+                    return
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            # One detector for the whole pass: _stop may swap or drop self.detector meanwhile
+            detector = self.detector
+            # Pause/resume transitions happen here so keys and the camera are
+            # only ever touched from this thread
+            if self.paused:
+                if not was_paused:
+                    was_paused = True
+                    self.keyboard.release_all()
+                    self.active_keys.clear()
+                    if self.cfg.paused_fps: self.cap.set(cv2.CAP_PROP_FPS, self.cfg.paused_fps)
+                # Keep draining the camera so resuming shows a current frame
+                self.frames.release(frame)
+                continue
+            if was_paused:
+                was_paused = False
+                # Leaving idle restores the full rate too
+                if self.idle.idle: self._set_idle(False)
+                elif self.cfg.paused_fps: self.cap.set(cv2.CAP_PROP_FPS, FPS)
+                self.idle.reset()
+                # Stale smoothing, trails and motion would otherwise leak into the new round
+                detector.clear()
+                self.last_time = self.clock()
+            now = self.clock()
+            dt = now - self.last_time
+            self.last_time = now
+            self.fps = 1.0 / dt if dt > 0 else 0
+            # Inference failures are recovered inside the detector's supervisor;
+            # a drawing bug must never cost a graph rebuild or the key output.
+            state = self.state
+            try:
+                state, frame = detector.process(frame, self.opts["Stability Filter"], rgb=True, captured_at=now)
+            except Exception as e:
+                print(f"Gesture error: {e}")
+                if detector.supervisor: detector.supervisor.record('gesture_errors')
+            # Stopped during inference (this worker may be abandoned): no keys, stream or drawing
+            if not (self.running and self.worker is me):
+                self.frames.release(frame)
+                return
+            self.state = state
+            # Records carry wall time for consumers; `now` is only good for differences
+            if self.state_server: self.state_server.publish(self.state, time.time(), detector.left, detector.right)
+            if self.idle.update(self.state.left_detected or self.state.right_detected):
+                self._set_idle(self.idle.idle)
+            if self.idle.idle:
+                # No hands for a while: keys are released and the preview is paused
+                self.frames.release(frame)
+                self._post({'frame': None, 'state': self.state, 'fps': self.fps, 'idle': True})
+                continue
+            self.active_keys = handle_gestures(self.keyboard, self.state, self.cfg, self.enabled, self.active_keys)
+            try:
+                frame = detector.draw(frame, self.opts["Show Skeleton"], self.opts["Show Trails"], rgb=True)
+            except Exception as e:
+                print(f"Render error: {e}")
+                detector.supervisor.record('render_errors')
+            cv2.putText(frame, f"FPS: {int(self.fps)}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 230, 0), 2)
+            if self.preview and self.preview.wants_frame(now): self.preview.submit(frame, rgb=True, now=now)
+            self._post({'frame': frame, 'state': self.state, 'fps': self.fps, 'idle': False})
+
+    def _post(self, result: dict):
+        """Hand a result to the Tk thread; a result it hasn't drawn yet is replaced."""
+        with self._result_lock:
+            old, self._result = self._result, result
+            notify = not self._notified
+            self._notified = True
+        if old: self.frames.release(old.get('frame'))
+        if notify:
+            # Thread-safe with threaded Tcl: queued to the Tk thread's event loop
+            self.root.event_generate('<<FrameReady>>', when='tail')
+
+    def _render(self, event=None):
+        with self._result_lock:
+            result, self._result = self._result, None
+            self._notified = False
+        if not result or not self.running or self.paused:
+            if result: self.frames.release(result.get('frame'))
+            return
+        if 'error' in result:
+            self._stop()
+            messagebox.showerror("Error", result['error'])
+            return
+        s = result['state']
+        if result['idle']:
+            if not self.shown_idle: self._show_idle()
+            self.fps_lbl.config(text=f"FPS: {int(result['fps'])} (idle)")
+            return
+        self.shown_idle = False
+        self._show(result['frame'])
+        self.frames.release(result['frame'])
+        self.fps_lbl.config(text=f"FPS: {int(result['fps'])}")
+        hands = []
+        if s.left_detected: hands.append("Left")
+        if s.right_detected: hands.append("Right")
+        self.hands_lbl.config(text=f"Hands: {', '.join(hands) if hands else 'None'}")
+        self.keys_lbl.config(text=f"Active: {self.keyboard.count()}/{self.keyboard.max_keys}")
+        if self.detector:
+            sup = self.detector.supervisor
+            self.health_lbl.config(text=f"Recoveries: {sup.stats['failovers']} | Stalls: {self.watchdog.stalls} | Motion skip: {self.detector.motion_gate.skip_ratio:.0%}")
+        active = s.active
+        self.gest_lbl.config(text="  |  ".join(active) if active else "None")
+        if self.timeline_lbl and self.detector: self._draw_timeline()
+        pressed = self.keyboard.get_pressed()
+        self.pressed_lbl.config(text=f"Keys: {' + '.join(key_display(k) for k in pressed) if pressed else 'None'}")
+        
+        # Show steering force and pulse state
+        force = s.steering_force
+        pulse_state = "OFF"
+        steer_key = None
+        if s.steer_left:
+            steer_key = self.cfg.keybindings.get('steer_left', '')
+        elif s.steer_right:
+            steer_key = self.cfg.keybindings.get('steer_right', '')
+        
+        if steer_key:
+            pwm = self.keyboard.get_pwm_state(steer_key)
+            if pwm:
+                pulse_state = "ON" if pwm['is_on'] else "off"
+        
+        self.force_lbl.config(text=f"Steering: {force:.0%} | Pulse: {pulse_state}")
+
+    def _set_idle(self, idle: bool):
+        """Enter or leave power-saving mode (lower camera FPS and inference rate)."""
+        self.detector.set_idle(idle, self.cfg.idle_refresh)
+        if self.cap: self.cap.set(cv2.CAP_PROP_FPS, self.cfg.idle_fps if idle else FPS)
+        if idle:
+            self.keyboard.release_all()
+            self.active_keys.clear()
+
+    def _show_idle(self):
+        self.shown_idle = True
+        self.photo = None
+        self.cam_lbl.config(image='', text="\n\n💤 Idle\n\nShow your hands to wake")
+        self.hands_lbl.config(text="Hands: None")
+        self.gest_lbl.config(text="None")
+        self.pressed_lbl.config(text="Keys: None")
+
+    def _draw_timeline(self):
+        """Plot the detector's recent history into the timeline panel."""
+        rows = self.detector.history.window(self.cfg.timeline_seconds)
+        img = render_timeline(rows, self.cfg.timeline_seconds, TIMELINE_SIZE[0], TIMELINE_SIZE[1],
+                              self.cfg.thresholds.get('visual_max_angle', 60.0))
+        pil = Image.frombuffer('RGB', TIMELINE_SIZE, img, 'raw', 'RGB', 0, 1)
+        if self.timeline_photo is None:
+            self.timeline_photo = ImageTk.PhotoImage(pil)
+            self.timeline_lbl.config(image=self.timeline_photo)
+        else:
+            self.timeline_photo.paste(pil)
+
+    def _show(self, rgb):
+        """Blit an RGB frame into the preview, reusing the Tk photo when possible."""
+        h, w = rgb.shape[:2]
+        img = Image.frombuffer('RGB', (w, h), rgb, 'raw', 'RGB', 0, 1)
+        if self.photo is None or (self.photo.width(), self.photo.height()) != (w, h):
+            self.photo = ImageTk.PhotoImage(img)
+            self.cam_lbl.imgtk = self.photo
+            self.cam_lbl.config(image=self.photo, text="")
+        else:
+            self.photo.paste(img)
+
+    def _close(self):
+        self._stop()
+        self.cfg.show_skeleton = self.opt_vars["Show Skeleton"].get()
+        self.cfg.show_trails = self.opt_vars["Show Trails"].get()
+        self.cfg.mirror_mode = self.opt_vars["Mirror Mode"].get()
+        self.cfg.stability_mode = self.opt_vars["Stability Filter"].get()
+        self.cfg.camera_index = int(self.cam_var.get())
+        self.cfg.thresholds['dead_zone_ratio'] = self.dead_zone_var.get()
+        self.cfg.sensitivity['steering_strength'] = self.steer_strength_var.get()
+        self.cfg.save()
+        if self.state_server: self.state_server.close()
+        if self.preview: self.preview.close()
+        self.root.destroy()
+
+    def run(self):
+        self.root.mainloop()
@@ -0,0 +1,136 @@
+"""Fixed-capacity per-frame gesture history.
+
+GestureHistory keeps the last `capacity` frames in one structured NumPy
+array (timestamp, steering angle, force, hands distance, gesture bits) and
+overwrites the oldest row when full. append() writes into preallocated
+columns, so recording a frame adds nothing for the garbage collector to
+track; text labels are made from the bits only when something is shown.
+
+One thread appends (the capture loop) and others may read: a row becomes
+visible only after all its fields are written, and a reader copies what
+it needs with window().
+"""
+from typing import Optional
+
+import numpy as np
+
+HISTORY_DTYPE = np.dtype([
+    ('t', np.float64),
+    ('angle', np.float32),
+    ('force', np.float32),
+    ('distance', np.float32),
+    ('bits', np.uint16),
+])
+
+# RGB timeline strip per gesture bit, top to bottom; bit i is GESTURE_NAMES[i]
+# (steer L/R, close, far, left fwd/bwd, right fwd/bwd)
+BANDS = (
+    (0, 220, 255), (0, 220, 255), (255, 200, 0), (255, 140, 0),
+    (0, 255, 136), (255, 80, 120), (0, 255, 136), (255, 80, 120),
+)
+BG = (10, 14, 26)
+GRID = (40, 50, 70)
+ANGLE_COLOR = (0, 150, 200)
+DISTANCE_COLOR = (255, 230, 0)
+GAP = 0.5
+
+
+class GestureHistory:
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.buf = np.zeros(capacity, HISTORY_DTYPE)
+        # Column views so append() assigns scalars instead of building records
+        self._t = self.buf['t']
+        self._angle = self.buf['angle']
+        self._force = self.buf['force']
+        self._distance = self.buf['distance']
+        self._bits = self.buf['bits']
+        self.count = 0  # Frames ever appended; row i lives at i % capacity
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, t: float, angle: float, force: float, distance: float, bits: int):
+        i = self.count % self.capacity
+        self._t[i] = t
+        self._angle[i] = angle
+        self._force[i] = force
+        self._distance[i] = distance
+        self._bits[i] = bits
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def last(self, n: int) -> np.ndarray:
+        """Copy of the newest `n` rows, oldest first."""
+        end = self.count
+        n = min(n, end, self.capacity)
+        if n <= 0:
+            return self.buf[:0].copy()
+        start = (end - n) % self.capacity
+        stop = start + n
+        if stop <= self.capacity:
+            return self.buf[start:stop].copy()
+        return np.concatenate((self.buf[start:], self.buf[:stop - self.capacity]))
+
+    def window(self, seconds: float) -> np.ndarray:
+        """Copy of the rows from the last `seconds` before the newest one."""
+        rows = self.last(self.capacity)
+        if not len(rows):
+            return rows
+        return rows[np.searchsorted(rows['t'], rows['t'][-1] - seconds):]
+
+
+def render_timeline(
+    rows: np.ndarray, seconds: float, width: int, height: int,
+    max_angle: float = 60.0, max_distance: float = 1.0, now: Optional[float] = None,
+) -> np.ndarray:
+    """(height, width, 3) uint8 RGB image of `rows` over the last `seconds`.
+
+    The top half shows the steering angle as a filled area around the
+    centre line and the hands distance as a line; below it each gesture
+    bit gets a strip that is lit while the gesture is on. Everything is
+    rasterized with array operations, one pass for the whole image.
+    """
+    img = np.empty((height, width, 3), np.uint8)
+    img[:] = BG
+    band_h = max(2, height // 24)
+    plot_h = height - band_h * len(BANDS) - 2
+    mid = plot_h // 2
+    img[mid] = GRID
+    img[plot_h] = GRID
+    if not len(rows):
+        return img
+
+    # Newest sample at or before each column's time; columns before the first
+    # sample, or in a gap of more than GAP seconds (e.g. idle), stay empty
+    now = rows['t'][-1] if now is None else now
+    col_t = now - seconds + (np.arange(width) + 1) * (seconds / width)
+    idx = np.searchsorted(rows['t'], col_t, 'right') - 1
+    valid = idx >= 0
+    idx = np.maximum(idx, 0)
+    cols = rows[idx]
+    valid &= col_t - cols['t'] < GAP
+
+    y = np.arange(plot_h)[:, None]
+    ang = np.clip(cols['angle'] / max_angle, -1.0, 1.0)
+    ang_y = (mid - ang * (mid - 1)).astype(np.int32)
+    area = (y >= np.minimum(ang_y, mid)) & (y <= np.maximum(ang_y, mid)) & valid
+    dist_y = (plot_h - 1 - np.clip(cols['distance'] / max_distance, 0.0, 1.0) * (plot_h - 1)).astype(np.int32)
+    has_dist = valid & (cols['distance'] > 0)
+    line = (y == dist_y) & has_dist
+    plot = img[:plot_h]
+    plot[area] = ANGLE_COLOR
+    plot[line] = DISTANCE_COLOR
+
+    shifts = np.arange(len(BANDS), dtype=np.uint16)
+    on = ((cols['bits'][None, :] >> shifts[:, None]) & 1).astype(bool) & valid  # (bands, width)
+    colors = np.array(BANDS, np.uint8)
+    top = plot_h + 2
+    strip = img[top:top + band_h * len(BANDS)].reshape(len(BANDS), band_h, width, 3)
+    # Leave a 1px gap between strips
+    lit = np.repeat(on[:, None, :], band_h, axis=1)
+    lit[:, -1, :] = False
+    strip[lit] = np.broadcast_to(colors[:, None, None, :], strip.shape)[lit]
+    return img
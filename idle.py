@@ -0,0 +1,42 @@
+from typing import Optional
+
+from clock import Clock, monotonic
+
+
+class IdleMonitor:
+    """ACTIVE/IDLE state machine driven by per-frame hand presence.
+
+    After `timeout` seconds without any hand the monitor goes IDLE; the first
+    frame with a hand switches it straight back to ACTIVE. A timeout of 0
+    disables idling.
+    """
+
+    ACTIVE = 'active'
+    IDLE = 'idle'
+
+    def __init__(self, timeout: float = 10.0, clock: Optional[Clock] = None):
+        self.timeout = timeout
+        self.clock = clock or monotonic
+        self.state = self.ACTIVE
+        self._last_seen = self.clock()
+
+    @property
+    def idle(self) -> bool:
+        return self.state == self.IDLE
+
+    def update(self, hands_present: bool, now: Optional[float] = None) -> Optional[str]:
+        """Feed one frame; returns the new state on a transition, else None."""
+        now = self.clock() if now is None else now
+        if hands_present:
+            self._last_seen = now
+            if self.state == self.IDLE:
+                self.state = self.ACTIVE
+                return self.state
+        elif self.state == self.ACTIVE and self.timeout > 0 and now - self._last_seen >= self.timeout:
+            self.state = self.IDLE
+            return self.state
+        return None
+
+    def reset(self, now: Optional[float] = None):
+        self.state = self.ACTIVE
+        self._last_seen = self.clock() if now is None else now
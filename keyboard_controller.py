@@ -1,227 +1,372 @@
-import time
-from pynput.keyboard import Controller, Key
-from typing import Set, Dict, Optional
-
-
-class KeyboardController:
-    """Keyboard controller with PWM-style pulsing for progressive steering."""
-    
-    # Special key mapping
-    SPECIAL_KEYS = {
-        'space': Key.space,
-        'shift': Key.shift,
-        'ctrl': Key.ctrl,
-        'alt': Key.alt,
-        'tab': Key.tab,
-        'enter': Key.enter,
-        'esc': Key.esc,
-        'up': Key.up,
-        'down': Key.down,
-        'left': Key.left,
-        'right': Key.right,
-        'backspace': Key.backspace,
-        'delete': Key.delete,
-        'home': Key.home,
-        'end': Key.end,
-        'pageup': Key.page_up,
-        'pagedown': Key.page_down,
-    }
-
-    def __init__(self, max_keys: int = 4):
-        self.controller = Controller()
-        self.max_keys = max_keys
-        self._pressed: Set[str] = set()
-        self._enabled = True
-        
-        # PWM state for steering keys
-        self._pwm_state: Dict[str, dict] = {}  # key -> {force, last_toggle, is_on}
-        self._base_cycle_ms = 500  # Base PWM cycle time in ms
-        self._steering_strength = 1.0  # Multiplier for steering responsiveness
-
-    def set_enabled(self, enabled: bool):
-        if not enabled:
-            self.release_all()
-        self._enabled = enabled
-
-    def set_max(self, n: int):
-        self.max_keys = n
-
-    def set_steering_strength(self, strength: float):
-        """Set steering strength multiplier (0.5 to 2.0)."""
-        self._steering_strength = max(0.5, min(2.0, strength))
-
-    def _get_key(self, key_str: str):
-        """Convert string to pynput key."""
-        key_str = key_str.lower().strip()
-        if key_str in self.SPECIAL_KEYS:
-            return self.SPECIAL_KEYS[key_str]
-        if len(key_str) == 1:
-            return key_str
-        return None
-
-    def _calculate_pwm_timing(self, force: float) -> tuple:
-        """Calculate on/off times based on force level.
-        
-        Returns (on_time_ms, off_time_ms)
-        
-        At low force: short on, long off (gentle taps)
-        At high force: long on, short off (strong steering)
-        At 100% force: always on
-        """
-        # Clamp force to valid range
-        force = max(0.0, min(1.0, force))
-        
-        # Apply steering strength multiplier
-        effective_force = min(1.0, force * self._steering_strength)
-        
-        # Base cycle time (adjustable)
-        cycle_ms = self._base_cycle_ms
-        
-        # Calculate duty cycle (percentage of time key is pressed)
-        # Minimum 10% duty cycle at lowest force, 100% at max force
-        min_duty = 0.10
-        duty_cycle = min_duty + (1.0 - min_duty) * effective_force
-        
-        on_time = int(cycle_ms * duty_cycle)
-        off_time = int(cycle_ms * (1.0 - duty_cycle))
-        
-        # Minimum times to prevent flickering
-        on_time = max(30, on_time)
-        off_time = max(0, off_time)
-        
-        return on_time, off_time
-
-    def press_pwm(self, key: str, force: float) -> bool:
-        """Press a key with PWM-style pulsing based on force.
-        
-        This should be called every frame. It manages the on/off timing internally.
-        
-        Args:
-            key: The key to press
-            force: Force level 0.0 to 1.0
-            
-        Returns:
-            True if key is currently in 'on' state
-        """
-        if not self._enabled or not key:
-            return False
-        
-        pkey = self._get_key(key)
-        if pkey is None:
-            return False
-        
-        current_time = time.time() * 1000  # Convert to ms
-        
-        # Initialize PWM state if needed
-        if key not in self._pwm_state:
-            self._pwm_state[key] = {
-                'force': force,
-                'last_toggle': current_time,
-                'is_on': False
-            }
-        
-        state = self._pwm_state[key]
-        state['force'] = force
-        
-        # At 100% force (or very close), just hold the key
-        if force >= 0.95:
-            if key not in self._pressed:
-                if len(self._pressed) >= self.max_keys:
-                    return False
-                try:
-                    self.controller.press(pkey)
-                    self._pressed.add(key)
-                except Exception:
-                    return False
-            state['is_on'] = True
-            return True
-        
-        # Calculate timing
-        on_time, off_time = self._calculate_pwm_timing(force)
-        
-        # Check if we need to toggle
-        time_since_toggle = current_time - state['last_toggle']
-        
-        if state['is_on']:
-            # Currently on, check if we should turn off
-            if time_since_toggle >= on_time:
-                # Turn off
-                if key in self._pressed:
-                    try:
-                        self.controller.release(pkey)
-                        self._pressed.discard(key)
-                    except Exception:
-                        pass
-                state['is_on'] = False
-                state['last_toggle'] = current_time
-        else:
-            # Currently off, check if we should turn on
-            if time_since_toggle >= off_time:
-                # Turn on
-                if len(self._pressed) < self.max_keys:
-                    try:
-                        self.controller.press(pkey)
-                        self._pressed.add(key)
-                        state['is_on'] = True
-                    except Exception:
-                        pass
-                state['last_toggle'] = current_time
-        
-        return state['is_on']
-
-    def press(self, key: str) -> bool:
-        """Press a key (non-PWM, for regular gestures)."""
-        if not self._enabled or not key:
-            return False
-        if len(self._pressed) >= self.max_keys:
-            return False
-        pkey = self._get_key(key)
-        if pkey is None:
-            return False
-        if key in self._pressed:
-            return True
-        try:
-            self.controller.press(pkey)
-            self._pressed.add(key)
-            return True
-        except Exception:
-            return False
-
-    def release(self, key: str):
-        """Release a key."""
-        if not key:
-            return
-        pkey = self._get_key(key)
-        if pkey is None:
-            return
-        if key in self._pressed:
-            try:
-                self.controller.release(pkey)
-            except Exception:
-                pass
-            self._pressed.discard(key)
-        # Clear PWM state
-        if key in self._pwm_state:
-            del self._pwm_state[key]
-
-    def release_all(self):
-        """Release all pressed keys."""
-        for key in list(self._pressed):
-            pkey = self._get_key(key)
-            if pkey:
-                try:
-                    self.controller.release(pkey)
-                except Exception:
-                    pass
-        self._pressed.clear()
-        self._pwm_state.clear()
-
-    def count(self) -> int:
-        return len(self._pressed)
-
-    def get_pressed(self) -> Set[str]:
-        return self._pressed.copy()
-
-    def get_pwm_state(self, key: str) -> Optional[dict]:
-        """Get PWM state for a key (for debugging/display)."""
-        return self._pwm_state.get(key)
+import threading
+from typing import Callable, List, Set, Dict, Optional, Tuple
+from clock import millis, monotonic
+
+
+class PynputBackend:
+    """Injects real key events through pynput."""
+
+    def __init__(self):
+        from pynput.keyboard import Controller, Key
+
+        self.controller = Controller()
+        self._key = Key
+
+    def press(self, key: str):
+        self.controller.press(self._resolve(key))
+
+    def release(self, key: str):
+        self.controller.release(self._resolve(key))
+
+    def _resolve(self, key: str):
+        if len(key) == 1:
+            return key
+        return getattr(self._key, KeyboardController.SPECIAL_KEYS[key])
+
+
+class RecordingBackend:
+    """Fake backend that logs (timestamp, 'press'|'release', key) instead of typing.
+
+    Timestamps come from `clock` (ms), normally the same clock the
+    controller uses, so recorded edges line up with its PWM timing.
+    """
+
+    def __init__(self, clock: Callable[[], float] = millis(monotonic)):
+        self.clock = clock
+        self.events: List[Tuple[float, str, str]] = []
+
+    def press(self, key: str):
+        self.events.append((self.clock(), 'press', key))
+
+    def release(self, key: str):
+        self.events.append((self.clock(), 'release', key))
+
+    def clear(self):
+        self.events.clear()
+
+
+class KeyboardController:
+    """Keyboard controller with PWM-style pulsing for progressive steering.
+
+    Thread-safe: the GUI thread may enable, resize or inspect it while the
+    capture thread is pressing keys.
+    """
+    
+    # Special key name -> pynput Key attribute
+    SPECIAL_KEYS = {
+        'space': 'space',
+        'shift': 'shift',
+        'ctrl': 'ctrl',
+        'alt': 'alt',
+        'tab': 'tab',
+        'enter': 'enter',
+        'esc': 'esc',
+        'up': 'up',
+        'down': 'down',
+        'left': 'left',
+        'right': 'right',
+        'backspace': 'backspace',
+        'delete': 'delete',
+        'home': 'home',
+        'end': 'end',
+        'pageup': 'page_up',
+        'pagedown': 'page_down',
+    }
+
+    def __init__(self, max_keys: int = 4, backend=None, clock: Optional[Callable[[], float]] = None):
+        """`backend` has press(key)/release(key) taking normalized key names
+        (default: PynputBackend). `clock` returns milliseconds (clock.millis)."""
+        self.controller = backend if backend is not None else PynputBackend()
+        self._clock = clock or millis(monotonic)
+        self.max_keys = max_keys
+        self._pressed: Set[str] = set()
+        self._enabled = True
+        
+        # PWM state for steering keys
+        self._pwm_state: Dict[str, dict] = {}  # key -> {force, last_toggle, is_on}
+        self._base_cycle_ms = 500  # Base PWM cycle time in ms
+        self._steering_strength = 1.0  # Multiplier for steering responsiveness
+        self._taps: Dict[str, float] = {}  # key -> release time (ms) for tap()
+        # Reentrant: tap() presses, release_due() and set_enabled() release
+        self._lock = threading.RLock()
+
+    def set_enabled(self, enabled: bool):
+        with self._lock:
+            if not enabled:
+                self.release_all()
+            self._enabled = enabled
+
+    def set_max(self, n: int):
+        with self._lock:
+            self.max_keys = n
+
+    def set_steering_strength(self, strength: float):
+        """Set steering strength multiplier (0.5 to 2.0)."""
+        self._steering_strength = max(0.5, min(2.0, strength))
+
+    def _get_key(self, key_str: str):
+        """Normalize a key name; None if the backend can't send it."""
+        key_str = key_str.lower().strip()
+        if key_str in self.SPECIAL_KEYS or len(key_str) == 1:
+            return key_str
+        return None
+
+    def _calculate_pwm_timing(self, force: float) -> tuple:
+        """Calculate on/off times based on force level.
+        
+        Returns (on_time_ms, off_time_ms)
+        
+        At low force: short on, long off (gentle taps)
+        At high force: long on, short off (strong steering)
+        At 100% force: always on
+        """
+        # Clamp force to valid range
+        force = max(0.0, min(1.0, force))
+        
+        # Apply steering strength multiplier
+        effective_force = min(1.0, force * self._steering_strength)
+        
+        # Base cycle time (adjustable)
+        cycle_ms = self._base_cycle_ms
+        
+        # Calculate duty cycle (percentage of time key is pressed)
+        # Minimum 10% duty cycle at lowest force, 100% at max force
+        min_duty = 0.10
+        duty_cycle = min_duty + (1.0 - min_duty) * effective_force
+        
+        on_time = int(cycle_ms * duty_cycle)
+        off_time = int(cycle_ms * (1.0 - duty_cycle))
+        
+        # Minimum times to prevent flickering
+        on_time = max(30, on_time)
+        off_time = max(0, off_time)
+        
+        return on_time, off_time
+
+    def press_pwm(self, key: str, force: float) -> bool:
+        """Press a key with PWM-style pulsing based on force.
+        
+        This should be called every frame. It manages the on/off timing internally.
+        
+        Args:
+            key: The key to press
+            force: Force level 0.0 to 1.0
+            
+        Returns:
+            True if key is currently in 'on' state
+        """
+        with self._lock:
+            if not self._enabled or not key:
+                return False
+        
+            pkey = self._get_key(key)
+            if pkey is None:
+                return False
+        
+            current_time = self._clock()
+        
+            # Initialize PWM state if needed
+            if key not in self._pwm_state:
+                self._pwm_state[key] = {
+                    'force': force,
+                    'last_toggle': current_time,
+                    'is_on': False
+                }
+        
+            state = self._pwm_state[key]
+            state['force'] = force
+        
+            # At 100% force (or very close), just hold the key
+            if force >= 0.95:
+                if key not in self._pressed:
+                    if len(self._pressed) >= self.max_keys:
+                        return False
+                    try:
+                        self.controller.press(pkey)
+                        self._pressed.add(key)
+                    except Exception:
+                        return False
+                state['is_on'] = True
+                return True
+        
+            # Calculate timing
+            on_time, off_time = self._calculate_pwm_timing(force)
+        
+            # Check if we need to toggle
+            time_since_toggle = current_time - state['last_toggle']
+        
+            if state['is_on']:
+                # Currently on, check if we should turn off
+                if time_since_toggle >= on_time:
+                    # Turn off
+                    if key in self._pressed:
+                        try:
+                            self.controller.release(pkey)
+                            self._pressed.discard(key)
+                        except Exception:
+                            pass
+                    state['is_on'] = False
+                    state['last_toggle'] = current_time
+            else:
+                # Currently off, check if we should turn on
+                if time_since_toggle >= off_time:
+                    # Turn on
+                    if len(self._pressed) < self.max_keys:
+                        try:
+                            self.controller.press(pkey)
+                            self._pressed.add(key)
+                            state['is_on'] = True
+                        except Exception:
+                            pass
+                    state['last_toggle'] = current_time
+        
+            return state['is_on']
+
+    def press(self, key: str) -> bool:
+        """Press a key (non-PWM, for regular gestures)."""
+        with self._lock:
+            if not self._enabled or not key:
+                return False
+            if len(self._pressed) >= self.max_keys:
+                return False
+            pkey = self._get_key(key)
+            if pkey is None:
+                return False
+            if key in self._pressed:
+                return True
+            try:
+                self.controller.press(pkey)
+                self._pressed.add(key)
+                return True
+            except Exception:
+                return False
+
+    def release(self, key: str):
+        """Release a key."""
+        with self._lock:
+            if not key:
+                return
+            pkey = self._get_key(key)
+            if pkey is None:
+                return
+            if key in self._pressed:
+                try:
+                    self.controller.release(pkey)
+                except Exception:
+                    pass
+                self._pressed.discard(key)
+            # Clear PWM state
+            if key in self._pwm_state:
+                del self._pwm_state[key]
+
+    def tap(self, key: str, duration_ms: float = 80) -> bool:
+        """Press a key now and let release_due() release it `duration_ms` later.
+
+        For one-shot gestures: long enough for games that poll key state
+        once per frame to see it.
+        """
+        with self._lock:
+            if key in self._taps:
+                self._taps[key] = self._clock() + duration_ms
+                return True
+            if key in self._pressed or not self.press(key):
+                return False
+            self._taps[key] = self._clock() + duration_ms
+            return True
+
+    def release_due(self):
+        """Release tapped keys whose time is up; call once per frame."""
+        with self._lock:
+            if not self._taps:
+                return
+            now = self._clock()
+            for key in [k for k, t in self._taps.items() if t <= now]:
+                del self._taps[key]
+                self.release(key)
+
+    def release_all(self):
+        """Release all pressed keys."""
+        with self._lock:
+            for key in list(self._pressed):
+                pkey = self._get_key(key)
+                if pkey:
+                    try:
+                        self.controller.release(pkey)
+                    except Exception:
+                        pass
+            self._pressed.clear()
+            self._pwm_state.clear()
+            self._taps.clear()
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._pressed)
+
+    def get_pressed(self) -> Set[str]:
+        with self._lock:
+            return self._pressed.copy()
+
+    def get_pwm_state(self, key: str) -> Optional[dict]:
+        """Get PWM state for a key (for debugging/display)."""
+        with self._lock:
+            state = self._pwm_state.get(key)
+            return dict(state) if state else None
+
+
+def handle_gestures(keyboard: KeyboardController, state, cfg, enabled: Dict[str, bool], held: Set[str]) -> Set[str]:
+    """Press and release keys for one frame's GestureState (the single-player mapping).
+
+    Steering keys pulse via PWM at the steering force, other gestures hold
+    their key and motion events tap it. `cfg` supplies keybindings and
+    custom_gestures(); `held` is what the previous call returned (keys held
+    by non-steering gestures) and the new set is returned.
+    """
+    s = state
+
+    # Handle steering with PWM
+    steer_left_key = cfg.keybindings.get('steer_left', '')
+    steer_right_key = cfg.keybindings.get('steer_right', '')
+
+    # PWM steering for left
+    if s.steer_left and enabled.get('steer_left', True):
+        if steer_left_key:
+            keyboard.press_pwm(steer_left_key, s.steering_force)
+    else:
+        if steer_left_key:
+            keyboard.release(steer_left_key)
+
+    # PWM steering for right
+    if s.steer_right and enabled.get('steer_right', True):
+        if steer_right_key:
+            keyboard.press_pwm(steer_right_key, s.steering_force)
+    else:
+        if steer_right_key:
+            keyboard.release(steer_right_key)
+
+    # Handle other gestures (non-PWM)
+    other_mapping = {
+        'hands_close': s.hands_close, 'hands_far': s.hands_far,
+        'left_forward': s.left_forward, 'left_backward': s.left_backward,
+        'right_forward': s.right_forward, 'right_backward': s.right_backward,
+    }
+    for name in cfg.custom_gestures():
+        other_mapping[name] = name in s.extra
+    new_active = set()
+    for gesture, active in other_mapping.items():
+        if not enabled.get(gesture, True): continue
+        key = cfg.keybindings.get(gesture, '')
+        if not key: continue
+        if active:
+            if keyboard.press(key): new_active.add(key)
+        elif key in held:
+            keyboard.release(key)
+    for key in held - new_active:
+        if key not in [steer_left_key, steer_right_key]:
+            keyboard.release(key)
+
+    # Motion gestures are one-shot: tap their keys
+    for event in s.events:
+        key = cfg.keybindings.get(event, '')
+        if key: keyboard.tap(key)
+    keyboard.release_due()
+    return new_active
@@ -0,0 +1,141 @@
+"""Landmark sources: the backends GestureDetector gets hand landmarks from.
+
+Every source has `process(rgb) -> List[HandResult]` and `close()`, so the
+steering and finger logic (and InferenceSupervisor) work with either one:
+
+- SolutionsSource: legacy `mp.solutions.hands`, blocks until the frame is done.
+- TasksLiveSource: MediaPipe Tasks HandLandmarker in LIVE_STREAM mode. Frames
+  are submitted with timestamps and results arrive on MediaPipe's thread via
+  a callback, so `process` returns immediately with the newest result and
+  capture overlaps with inference (results trail the frame by ~1 inference).
+- TasksVideoSource: HandLandmarker in VIDEO mode, synchronous; for recorded
+  footage (extract.py, with the video's timestamps) and GraphPool workers.
+"""
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# (21 normalized (x, y) points, MediaPipe handedness label)
+HandResult = Tuple[List[Tuple[float, float]], str]
+
+BACKENDS = ('solutions', 'tasks')
+DEFAULT_MODEL = os.path.expanduser("~/.gesture_gaming/hand_landmarker.task")
+
+
+class SolutionsSource:
+    def __init__(self, max_hands: int = 2):
+        import mediapipe as mp
+
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_hands,
+            min_detection_confidence=0.4,
+            min_tracking_confidence=0.35,
+            model_complexity=1,
+        )
+
+    def process(self, rgb: np.ndarray) -> List[HandResult]:
+        results = self.hands.process(rgb)
+        out: List[HandResult] = []
+        if results and results.multi_hand_landmarks and results.multi_handedness:
+            for lm, info in zip(results.multi_hand_landmarks, results.multi_handedness):
+                out.append(([(l.x, l.y) for l in lm.landmark], info.classification[0].label))
+        return out
+
+    def close(self):
+        self.hands.close()
+
+
+def _landmarker(max_hands: int, model_path: Optional[str], mode: str, **extra):
+    """HandLandmarker with the detector's confidence settings in running `mode`."""
+    from mediapipe.tasks.python import BaseOptions
+    from mediapipe.tasks.python import vision
+
+    model_path = model_path or DEFAULT_MODEL
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(
+            f"HandLandmarker model not found at {model_path} "
+            "(download hand_landmarker.task from the MediaPipe model page)"
+        )
+    options = vision.HandLandmarkerOptions(
+        base_options=BaseOptions(model_asset_path=model_path),
+        running_mode=getattr(vision.RunningMode, mode),
+        num_hands=max_hands,
+        min_hand_detection_confidence=0.4,
+        min_hand_presence_confidence=0.4,
+        min_tracking_confidence=0.35,
+        **extra,
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+
+def _tasks_results(result) -> List[HandResult]:
+    return [([(l.x, l.y) for l in lms], handed[0].category_name)
+            for lms, handed in zip(result.hand_landmarks, result.handedness)]
+
+
+class TasksLiveSource:
+    def __init__(self, max_hands: int = 2, model_path: Optional[str] = None):
+        import mediapipe as mp
+
+        self._mp = mp
+        self._lock = threading.Lock()
+        self._latest: List[HandResult] = []
+        self._last_ts = -1
+        self.submitted = 0
+        self.completed = 0
+        self.landmarker = _landmarker(max_hands, model_path, 'LIVE_STREAM', result_callback=self._on_result)
+
+    def _on_result(self, result, image, timestamp_ms: int):
+        out = _tasks_results(result)
+        with self._lock:
+            self._latest = out
+            self.completed += 1
+
+    def process(self, rgb: np.ndarray) -> List[HandResult]:
+        # LIVE_STREAM needs strictly increasing millisecond timestamps
+        ts = max(int(time.monotonic() * 1000), self._last_ts + 1)
+        self._last_ts = ts
+        # mp.Image copies the pixels, so pooled frame buffers can be reused right away
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb))
+        self.landmarker.detect_async(image, ts)
+        self.submitted += 1
+        with self._lock:
+            return self._latest
+
+    def close(self):
+        self.landmarker.close()
+
+
+class TasksVideoSource:
+    def __init__(self, max_hands: int = 2, model_path: Optional[str] = None):
+        import mediapipe as mp
+
+        self._mp = mp
+        self._last_ts = -1
+        self.landmarker = _landmarker(max_hands, model_path, 'VIDEO')
+
+    def process(self, rgb: np.ndarray, timestamp_ms: Optional[int] = None) -> List[HandResult]:
+        """Landmarks of this frame; `timestamp_ms` is its position in the
+        video (default: now, for live frames)."""
+        # VIDEO mode also needs strictly increasing timestamps
+        ts = int(time.monotonic() * 1000) if timestamp_ms is None else int(timestamp_ms)
+        ts = max(ts, self._last_ts + 1)
+        self._last_ts = ts
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb))
+        return _tasks_results(self.landmarker.detect_for_video(image, ts))
+
+    def close(self):
+        self.landmarker.close()
+
+
+def make_source(backend: str = 'solutions', max_hands: int = 2, model_path: Optional[str] = None, video: bool = False):
+    """`video`: a synchronous source even for 'tasks' (one result per frame, no lag)."""
+    if backend == 'tasks':
+        return TasksVideoSource(max_hands, model_path) if video else TasksLiveSource(max_hands, model_path)
+    if backend == 'solutions':
+        return SolutionsSource(max_hands)
+    raise ValueError(f"Unknown landmark backend: {backend}")
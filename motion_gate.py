@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class MotionGate:
+    """Cheap pre-stage that decides whether a frame needs full inference.
+
+    Each frame is shrunk to a small grayscale thumbnail and compared with the
+    thumbnail of the last frame that was inferred. Below `threshold` (mean
+    absolute difference in gray levels) the frame is skipped, but never more
+    than `refresh` frames in a row. A threshold of 0 disables gating.
+    """
+
+    def __init__(self, threshold: float = 2.0, refresh: int = 6, size: Tuple[int, int] = (64, 48)):
+        self.threshold = threshold
+        self.refresh = refresh
+        self.size = size
+        w, h = size
+        self._small = np.empty((h, w, 3), np.uint8)
+        self._gray = np.empty((h, w), np.uint8)
+        self._diff = np.empty((h, w), np.uint8)
+        self._ref: Optional[np.ndarray] = None
+        self._since = 0
+        self.energy = 0.0
+        self.frames = 0
+        self.skipped = 0
+
+    def configure(self, threshold: float, refresh: int):
+        self.threshold = threshold
+        self.refresh = max(1, int(refresh))
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        self.frames += 1
+        if self.threshold <= 0:
+            return True
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_RGB2GRAY, dst=self._gray)
+        if self._ref is None:
+            self._ref = self._gray.copy()
+            self._since = 0
+            return True
+        cv2.absdiff(self._gray, self._ref, dst=self._diff)
+        self.energy = cv2.mean(self._diff)[0]
+        if self.energy >= self.threshold or self._since >= self.refresh:
+            # Compare later frames against this one so slow drift still adds up
+            self._ref, self._gray = self._gray, self._ref
+            self._since = 0
+            return True
+        self._since += 1
+        self.skipped += 1
+        return False
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def reset(self):
+        self._ref = None
+        self._since = 0
+        self.energy = 0.0
+        self.frames = 0
+        self.skipped = 0
@@ -0,0 +1,124 @@
+"""Motion gestures: swipes, pushes, double taps and holds.
+
+The pose gestures in GestureDetector look at one frame. These look at how
+a hand moves, using a small state machine per hand that is updated once per
+frame with constant work:
+
+- swipe_left/right/up/down: the palm travels `swipe_dist` (normalized
+  image units) within `swipe_window` seconds, mostly along one axis. Left
+  and right are in image coordinates, so on a mirrored view they match the
+  player's own left and right.
+- push: the hand grows by `push_ratio` within `swipe_window` (moved
+  towards the camera).
+- double_tap: two thumb-index pinches within `double_tap_window` seconds.
+- hold: a pinch held for `hold_ms`.
+
+Each fires once, as an event; swipes and pushes then wait
+`motion_cooldown` seconds so the end of one motion can't start another.
+Event names are prefixed with the hand: 'left_swipe_up', 'right_push', ...
+(MOTION_NAMES); bind them to keys in Config.keybindings like any gesture.
+"""
+import math
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+MOTION_GESTURES = ('swipe_left', 'swipe_right', 'swipe_up', 'swipe_down', 'push', 'double_tap', 'hold')
+MOTION_NAMES = tuple(f"{side}_{g}" for side in ('left', 'right') for g in MOTION_GESTURES)
+
+# Pinch ends only once the fingers open past this multiple of pinch_ratio
+PINCH_RELEASE = 1.3
+# Palm samples kept per hand; more than a swipe window holds at camera rates
+TRAIL_SIZE = 64
+
+
+class HandMotion:
+    """State machine for one hand."""
+
+    def __init__(self, side: str):
+        self.side = side
+        self.names = {g: f"{side}_{g}" for g in MOTION_GESTURES}
+        self.trail: deque = deque(maxlen=TRAIL_SIZE)  # (t, x, y, size)
+        self.reset()
+
+    def reset(self):
+        self.trail.clear()
+        self.cooldown_until = 0.0
+        self.pinched = False
+        self.pinch_start = 0.0
+        self.held = False
+        self.last_tap: Optional[float] = None
+
+    def update(self, t: float, hand, th: Dict, out: List[str]):
+        if hand is None:
+            if self.trail or self.pinched:
+                self.reset()
+            return
+        wx, wy = hand.wrist
+        mx, my = hand.middle_mcp
+        size = math.sqrt((mx - wx) * (mx - wx) + (my - wy) * (my - wy))
+        if size <= 0:
+            return
+        x, y = hand.palm
+        trail = self.trail
+        trail.append((t, x, y, size))
+
+        # Swipe / push: newest sample against the oldest one inside the window
+        window = th.get('swipe_window', 0.3)
+        while t - trail[0][0] > window:
+            trail.popleft()
+        if t >= self.cooldown_until and len(trail) > 1:
+            _, x0, y0, size0 = trail[0]
+            dx, dy = x - x0, y - y0
+            dist = th.get('swipe_dist', 0.18)
+            event = None
+            if abs(dx) >= dist and abs(dx) > 2 * abs(dy):
+                event = 'swipe_right' if dx > 0 else 'swipe_left'
+            elif abs(dy) >= dist and abs(dy) > 2 * abs(dx):
+                event = 'swipe_down' if dy > 0 else 'swipe_up'
+            elif size >= size0 * th.get('push_ratio', 1.3):
+                event = 'push'
+            if event:
+                out.append(self.names[event])
+                self.cooldown_until = t + th.get('motion_cooldown', 0.5)
+                trail.clear()
+
+        # Pinch taps and holds
+        tx, ty = hand.thumb_tip
+        ix, iy = hand.index_tip
+        gap = math.sqrt((tx - ix) * (tx - ix) + (ty - iy) * (ty - iy)) / size
+        ratio = th.get('pinch_ratio', 0.35)
+        if not self.pinched:
+            if gap < ratio:
+                self.pinched = True
+                self.pinch_start = t
+                self.held = False
+                if self.last_tap is not None and t - self.last_tap <= th.get('double_tap_window', 0.4):
+                    out.append(self.names['double_tap'])
+                    self.last_tap = None
+                else:
+                    self.last_tap = t
+        elif gap > ratio * PINCH_RELEASE:
+            self.pinched = False
+        elif not self.held and t - self.pinch_start >= th.get('hold_ms', 600) / 1000:
+            self.held = True
+            self.last_tap = None  # A hold is not the first half of a double tap
+            out.append(self.names['hold'])
+
+
+class MotionRecognizer:
+    """Motion gestures for one player's (left, right) hands."""
+
+    def __init__(self, thresholds: Dict):
+        self.thresholds = thresholds
+        self.hands = (HandMotion('left'), HandMotion('right'))
+
+    def update(self, t: float, left, right) -> Tuple[str, ...]:
+        """Events that fired this frame (usually none)."""
+        out: List[str] = []
+        self.hands[0].update(t, left, self.thresholds, out)
+        self.hands[1].update(t, right, self.thresholds, out)
+        return tuple(out) if out else ()
+
+    def reset(self):
+        for h in self.hands:
+            h.reset()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Multi-camera, multi-player runtime.
+
+Each player gets a capture+inference worker process with its own camera,
+so players scale across CPU cores instead of sharing one GIL-bound loop.
+All workers feed one key-output stage in the main process, which enforces
+every player's max_keys and Config.global_max_keys.
+
+Players are configured in config.json; each section overrides the base
+settings for that seat:
+
+    "players": [
+        {"camera_index": 0, "max_keys": 3},
+        {"camera_index": 1, "max_keys": 3,
+         "keybindings": {"steer_left": "left", "steer_right": "right",
+                         "right_forward": "i", "right_backward": "k"}}
+    ]
+
+Players with the same camera_index share one worker and one inference
+call: the detector tracks two hands per player and splits them by screen
+region (players ordered left to right) or by nearest previous position,
+per Config.player_assignment. Thresholds for a shared camera come from
+the first of its players.
+
+Bind distinct keys per player: a key shared by two players is released as
+soon as either of them lets go of it.
+"""
+import multiprocessing
+import queue
+import sys
+import time
+from typing import Dict, List, Set, Tuple
+
+from config import Config, CONFIG_FILE
+
+PWM_GESTURES = ('steer_left', 'steer_right')
+KEY_GESTURES = ('hands_close', 'hands_far', 'left_forward', 'left_backward', 'right_forward', 'right_backward')
+STALE_AFTER = 0.5  # Release a player's keys if their worker goes quiet this long
+REPORT_EVERY = 5.0
+
+
+def _worker(players: List[int], cfg: Config, enabled: List[str], out, stop):
+    """Capture + inference loop for one camera and its players (own process)."""
+    # Imported here so only the workers load OpenCV/MediaPipe
+    import cv2
+    from camera import open_camera
+    from frame_pool import FramePipeline
+    from gesture_detector import GestureDetector
+
+    # One core per worker; oversubscribing threads defeats the process split
+    cv2.setNumThreads(1)
+    cap = open_camera(cfg.camera_index, cfg.camera_profiles)
+    if cap is None:
+        for index in players:
+            out.put(('error', index, f"Cannot open camera {cfg.camera_index}"))
+        return
+    frames = FramePipeline()
+    detector = GestureDetector(
+        cfg.thresholds, cfg.sensitivity, len(players), cfg.player_assignment,
+        cfg.landmark_backend, cfg.hand_model_path or None, cfg.rules(),
+        graphs=cfg.inference_graphs, pool=cfg.inference_pool,
+    )
+    detector.motion_enabled = cfg.motion_bound()
+    detector.set_enabled(enabled)
+    preview = None
+    if cfg.preview_port:
+        from preview_server import PreviewServer
+
+        # One preview per camera: preview_port + index of the camera's first player
+        try:
+            preview = PreviewServer(cfg.preview_host, cfg.preview_port + players[0], cfg.preview_fps)
+        except OSError as e:
+            out.put(('error', players[0], f"Preview disabled: {e}"))
+    try:
+        while not stop.is_set():
+            frame = frames.next(cap, cfg.mirror_mode)
+            if frame is None:
+                time.sleep(0.005)
+                continue
+            detector.process(frame, cfg.stability_mode, rgb=True)
+            if preview and preview.wants_frame():
+                # Only drawn while someone is watching
+                preview.submit(detector.draw(frame.copy(), cfg.show_skeleton, cfg.show_trails, rgb=True), rgb=True, copy=False)
+            frames.release(frame)
+            now = time.time()
+            for index, s in zip(players, detector.seat_states if len(players) > 1 else [detector.state]):
+                out.put(('state', index, now, s.bits(), s.steering_force, s.events, s.extra))
+    finally:
+        if preview:
+            preview.close()
+        detector.release()
+        cap.release()
+
+
+class KeyCoordinator:
+    """Single key-output stage shared by all players."""
+
+    def __init__(self, keyboard, players: List[Config]):
+        from gesture_detector import GESTURE_NAMES
+
+        self.names = GESTURE_NAMES
+        self.keyboard = keyboard
+        self.players = players
+        self.held: List[Set[str]] = [set() for _ in players]
+        self.last_seen = [0.0] * len(players)
+        self._bound = [
+            {k for k in p.keybindings.values() if k} for p in players
+        ]
+
+    def _owned(self, index: int, pressed: Set[str]) -> int:
+        return len(self._bound[index] & pressed)
+
+    def apply(
+        self, index: int, bits: int, force: float, now: float,
+        events: Tuple[str, ...] = (), extra: Tuple[str, ...] = (),
+    ):
+        cfg = self.players[index]
+        self.last_seen[index] = now
+        active = {name: bool(bits >> i & 1) for i, name in enumerate(self.names)}
+        for name in cfg.custom_gestures():
+            active[name] = name in extra
+
+        # Steering keys pulse via PWM, as in the single-player GUI
+        for gesture in PWM_GESTURES:
+            key = cfg.keybindings.get(gesture, '')
+            if not key:
+                continue
+            if active[gesture] and cfg.enabled_gestures.get(gesture, True):
+                pressed = self.keyboard.get_pressed()
+                if key in pressed or self._owned(index, pressed) < cfg.max_keys:
+                    self.keyboard.press_pwm(key, force)
+            else:
+                self.keyboard.release(key)
+
+        new_held = set()
+        for gesture in KEY_GESTURES + tuple(cfg.custom_gestures()):
+            if not cfg.enabled_gestures.get(gesture, True):
+                continue
+            key = cfg.keybindings.get(gesture, '')
+            if not key or not active[gesture]:
+                continue
+            pressed = self.keyboard.get_pressed()
+            if key in pressed or self._owned(index, pressed) < cfg.max_keys:
+                if self.keyboard.press(key):
+                    new_held.add(key)
+        for key in self.held[index] - new_held:
+            self.keyboard.release(key)
+        self.held[index] = new_held
+
+        # Motion gestures tap their key once
+        for event in events:
+            key = cfg.keybindings.get(event, '')
+            if key:
+                pressed = self.keyboard.get_pressed()
+                if key in pressed or self._owned(index, pressed) < cfg.max_keys:
+                    self.keyboard.tap(key)
+
+    def release_player(self, index: int):
+        for key in self._bound[index]:
+            self.keyboard.release(key)
+        self.held[index] = set()
+
+    def expire(self, now: float):
+        self.keyboard.release_due()
+        for i, seen in enumerate(self.last_seen):
+            if seen and now - seen > STALE_AFTER:
+                self.release_player(i)
+                self.last_seen[i] = 0.0
+
+
+class MultiPlayerRuntime:
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        self.players = [cfg.for_player(i) for i in range(len(cfg.players))]
+        ctx = multiprocessing.get_context('spawn')
+        self.queue = ctx.Queue()
+        self.stop = ctx.Event()
+        cameras: Dict[int, List[int]] = {}
+        for i, p in enumerate(self.players):
+            cameras.setdefault(p.camera_index, []).append(i)
+        # A shared camera evaluates every gesture any of its players has enabled
+        self.procs = [
+            ctx.Process(target=_worker, args=(
+                idx, self.players[idx[0]], sorted({g for i in idx for g in self.players[i].enabled_rules()}),
+                self.queue, self.stop,
+            ), daemon=True)
+            for idx in cameras.values()
+        ]
+
+    def run(self):
+        from keyboard_controller import KeyboardController
+
+        keyboard = KeyboardController(self.cfg.global_max_keys)
+        coord = KeyCoordinator(keyboard, self.players)
+        for p in self.procs:
+            p.start()
+        frames = [0] * len(self.players)
+        last_report = time.time()
+        try:
+            while any(p.is_alive() for p in self.procs):
+                try:
+                    msg = self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    msg = None
+                now = time.time()
+                if msg and msg[0] == 'state':
+                    _, index, _, bits, force, events, extra = msg
+                    coord.apply(index, bits, force, now, events, extra)
+                    frames[index] += 1
+                elif msg and msg[0] == 'error':
+                    print(f"  Player {msg[1] + 1}: {msg[2]}")
+                coord.expire(now)
+                if now - last_report >= REPORT_EVERY:
+                    fps = " | ".join(f"P{i + 1}: {n / (now - last_report):.0f} fps" for i, n in enumerate(frames))
+                    print(f"  {fps} | keys {keyboard.count()}/{keyboard.max_keys}")
+                    frames = [0] * len(self.players)
+                    last_report = now
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop.set()
+            for p in self.procs:
+                p.join(timeout=2.0)
+                if p.is_alive():
+                    p.terminate()
+            keyboard.release_all()
+
+
+def main():
+    cfg = Config.load()
+    if not cfg.players:
+        print(f"No players configured: add a \"players\" list to {CONFIG_FILE}")
+        sys.exit(1)
+    print(f"  Starting {len(cfg.players)} players (Ctrl+C to stop)...\n")
+    MultiPlayerRuntime(cfg).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from typing import List, Optional, Sequence, Tuple
+
+# Seats are (left, right) hand slots; either may be None
+Seat = Tuple[Optional[object], Optional[object]]
+
+
+class PlayerAssigner:
+    """Group the hands found in one frame into per-player seats.
+
+    'region' splits the frame into equal vertical strips, one per player, in
+    seat order from the left edge. 'tracking' attaches each hand to the
+    player whose hands were nearest in the previous frame (falling back to
+    the player's strip centre until that player has been seen).
+
+    Hands are any objects with `palm` (x, y) and `side` (MediaPipe label).
+    """
+
+    def __init__(self, players: int, mode: str = 'region'):
+        self.players = players
+        self.mode = mode
+        self._centres: List[Optional[Tuple[float, float]]] = [None] * players
+
+    def _strip(self, x: float) -> int:
+        return min(self.players - 1, max(0, int(x * self.players)))
+
+    def _anchor(self, p: int) -> Tuple[float, float]:
+        if self._centres[p] is not None:
+            return self._centres[p]
+        return ((p + 0.5) / self.players, 0.5)
+
+    def assign(self, hands: Sequence) -> List[Seat]:
+        groups: List[list] = [[] for _ in range(self.players)]
+        if self.mode == 'tracking':
+            pairs = []
+            for h, hand in enumerate(hands):
+                for p in range(self.players):
+                    ax, ay = self._anchor(p)
+                    d = (hand.palm[0] - ax) ** 2 + (hand.palm[1] - ay) ** 2
+                    pairs.append((d, h, p))
+            taken = set()
+            for d, h, p in sorted(pairs):
+                if h in taken or len(groups[p]) >= 2:
+                    continue
+                groups[p].append(hands[h])
+                taken.add(h)
+        else:
+            for hand in hands:
+                p = self._strip(hand.palm[0])
+                if len(groups[p]) < 2:
+                    groups[p].append(hand)
+
+        seats = [self._split(g) for g in groups]
+        for p, g in enumerate(groups):
+            if g:
+                self._centres[p] = (
+                    sum(h.palm[0] for h in g) / len(g),
+                    sum(h.palm[1] for h in g) / len(g),
+                )
+        return seats
+
+    @staticmethod
+    def _split(group: list) -> Seat:
+        """Pick left/right slots the same way the two-hand detector does."""
+        if not group:
+            return None, None
+        if len(group) == 1:
+            hand = group[0]
+            return (None, hand) if hand.side == "Left" else (hand, None)
+        a, b = group
+        if a.side != b.side:
+            # MediaPipe's "Left" label goes to the right slot, as in process()
+            return (b, a) if a.side == "Left" else (a, b)
+        # Both hands got the same label; fall back to x order, which
+        # matches the label mapping on mirrored frames
+        return (a, b) if a.palm[0] > b.palm[0] else (b, a)
+
+    def reset(self):
+        self._centres = [None] * self.players
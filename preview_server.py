@@ -0,0 +1,153 @@
+"""On-demand MJPEG preview of the annotated camera view.
+
+    http://host:port/          page with the live view
+    http://host:port/stream    multipart/x-mixed-replace MJPEG stream
+    http://host:port/frame.jpg latest frame
+
+The capture loop calls wants_frame() and, only if it returns True, hands a
+drawn frame to submit(). That is True only while a viewer is connected and
+the preview's own frame interval (`fps`, normally well below the camera
+rate) has passed, so a station nobody is watching does no extra work.
+Each submitted frame is JPEG-encoded once on the encoder thread and the
+same bytes go to every viewer; HTTP runs on its own threads too.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import cv2
+import numpy as np
+
+BOUNDARY = b"frame"
+PAGE = b"""<!doctype html><html><head><title>Gesture preview</title></head>
+<body style="margin:0;background:#05080f"><img src="/stream" style="width:100%"></body></html>"""
+
+
+class PreviewServer:
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, fps: float = 10.0, quality: int = 70):
+        self.fps = fps
+        self.quality = quality
+        self.viewers = 0
+        self.encoded = 0
+        self._last_submit = 0.0
+        self._frame: Optional[np.ndarray] = None
+        self._frame_rgb = False
+        self._jpeg: Optional[bytes] = None
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/':
+                    self._reply(b"text/html", PAGE)
+                elif path == '/frame.jpg':
+                    server._viewer(+1)
+                    try:
+                        jpeg = server._next_jpeg(0, timeout=2.0)
+                    finally:
+                        server._viewer(-1)
+                    if jpeg is None:
+                        self.send_error(503, "No frame yet")
+                    else:
+                        self._reply(b"image/jpeg", jpeg[1])
+                elif path == '/stream':
+                    self._stream()
+                else:
+                    self.send_error(404)
+
+            def _reply(self, ctype: bytes, body: bytes):
+                self.send_response(200)
+                self.send_header("Content-Type", ctype.decode())
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY.decode()}")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                server._viewer(+1)
+                seq = 0
+                try:
+                    while not server._stop.is_set():
+                        item = server._next_jpeg(seq, timeout=1.0)
+                        if item is None:
+                            continue
+                        seq, jpeg = item
+                        self.wfile.write(
+                            b"--" + BOUNDARY + b"\r\nContent-Type: image/jpeg\r\n"
+                            + f"Content-Length: {len(jpeg)}\r\n\r\n".encode() + jpeg + b"\r\n"
+                        )
+                except OSError:
+                    pass  # Viewer went away
+                finally:
+                    server._viewer(-1)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        threading.Thread(target=self._encoder, daemon=True).start()
+
+    def wants_frame(self, now: Optional[float] = None) -> bool:
+        """True if a viewer is connected and the preview frame interval has passed."""
+        if not self.viewers:
+            return False
+        now = time.time() if now is None else now
+        return now - self._last_submit >= 1.0 / self.fps
+
+    def submit(self, frame: np.ndarray, rgb: bool = False, copy: bool = True, now: Optional[float] = None):
+        """Queue a drawn frame for encoding; pass copy=False if `frame` won't be reused."""
+        self._last_submit = time.time() if now is None else now
+        self._frame = frame.copy() if copy else frame
+        self._frame_rgb = rgb
+        self._wake.set()
+
+    def _viewer(self, delta: int):
+        with self._cond:
+            self.viewers += delta
+
+    def _next_jpeg(self, after: int, timeout: float):
+        """Wait for a frame newer than sequence `after`; (seq, bytes) or None."""
+        with self._cond:
+            if self._seq <= after:
+                self._cond.wait(timeout)
+            if self._seq <= after or self._jpeg is None:
+                return None
+            return self._seq, self._jpeg
+
+    def _encoder(self):
+        while not self._stop.is_set():
+            if not self._wake.wait(0.5):
+                continue
+            self._wake.clear()
+            frame, self._frame = self._frame, None
+            if frame is None:
+                continue
+            if self._frame_rgb:
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                continue
+            self.encoded += 1
+            with self._cond:
+                self._jpeg = buf.tobytes()
+                self._seq += 1
+                self._cond.notify_all()
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,92 @@
+"""Recorded landmark sessions.
+
+A session is one .npz file:
+
+- timestamps: (T,) float64 seconds
+- landmarks: (T, 2, 21, 2) float32, hand slots (left, right) as in
+  gesture_batch, NaN where a hand is missing
+- labels: (T,) int32 intended gestures, packed like GestureState.bits()
+- gestures: names of the gestures the labels cover (others are unlabeled)
+
+float32 holds MediaPipe's landmarks exactly, so replaying a session gives
+the same results as the live run did.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from gesture_detector import GESTURE_NAMES
+
+
+@dataclass
+class Session:
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    labels: np.ndarray
+    gestures: List[str] = field(default_factory=list)
+    meta: Dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def label(self, name: str) -> np.ndarray:
+        """(T,) bool: frames where `name` was the intended action."""
+        return (self.labels >> GESTURE_NAMES.index(name)) & 1 == 1
+
+
+class Recorder:
+    """Collect frames from a running GestureDetector for save()."""
+
+    def __init__(self):
+        self.timestamps: List[float] = []
+        self.landmarks: List[np.ndarray] = []
+        self.labels: List[int] = []
+
+    def add(self, timestamp: float, left, right, label: int = 0):
+        """`left`/`right` are the detector's Hand objects (or None)."""
+        lm = np.full((2, 21, 2), np.nan, np.float32)
+        for slot, hand in enumerate((left, right)):
+            if hand is not None:
+                lm[slot] = hand.landmarks
+        self.timestamps.append(timestamp)
+        self.landmarks.append(lm)
+        self.labels.append(label)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def save(self, path: str, gestures: Sequence[str] = (), meta: Optional[Dict] = None):
+        landmarks = np.stack(self.landmarks) if self.landmarks else np.zeros((0, 2, 21, 2), np.float32)
+        save(path, self.timestamps, landmarks, np.array(self.labels, np.int32), gestures, meta)
+
+
+def save(
+    path: str,
+    timestamps: Sequence[float],
+    landmarks: np.ndarray,
+    labels: Optional[np.ndarray] = None,
+    gestures: Sequence[str] = (),
+    meta: Optional[Dict] = None,
+):
+    n = len(timestamps)
+    np.savez_compressed(
+        path,
+        timestamps=np.asarray(timestamps, np.float64),
+        landmarks=np.asarray(landmarks, np.float32).reshape(n, 2, 21, 2),
+        labels=np.zeros(n, np.int32) if labels is None else np.asarray(labels, np.int32),
+        gestures=np.array(list(gestures), dtype=str),
+        meta=np.array(json.dumps(meta or {})),
+    )
+
+
+def load(path: str) -> Session:
+    with np.load(path) as z:
+        return Session(
+            timestamps=z['timestamps'],
+            landmarks=z['landmarks'],
+            labels=z['labels'],
+            gestures=[str(g) for g in z['gestures']],
+            meta=json.loads(str(z['meta'])),
+        )
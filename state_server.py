@@ -0,0 +1,303 @@
+"""Stream each frame's GestureState to local consumers over UDP or WebSocket.
+
+Record layout (little endian, 32 bytes + optional landmarks):
+
+    offset  type     field
+    0       2s       magic b"GS"
+    2       u8       version (1)
+    3       u8       flags: bit 0 = landmarks follow
+    4       u32      sequence number
+    8       f64      timestamp (time.time() when the frame was read)
+    16      f32      steering angle (smoothed, degrees)
+    20      f32      steering force 0..1
+    24      f32      hands distance
+    28      u16      gesture bits, GestureState.bits() order (GESTURE_NAMES)
+    30      u16      reserved
+    32      f32[84]  landmarks if flagged: (left, right) x 21 x (x, y), NaN if missing
+
+UDP: send any datagram to the server port to subscribe and repeat it at
+least every CLIENT_TIMEOUT seconds to stay subscribed; b"bye" unsubscribes.
+Each record is one datagram.
+
+WebSocket: connect to ws://host:port/; every record is one binary message.
+
+publish() only stores a reference to the newest state and returns; packing
+and sending happen on the server's own thread, and nothing at all is done
+while no client is connected. A client that falls behind gets the newest
+record, not a backlog.
+"""
+import abc
+import base64
+import hashlib
+import math
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+HEADER = struct.Struct('<2sBBIdfffHH')
+MAGIC = b"GS"
+VERSION = 1
+FLAG_LANDMARKS = 1
+LANDMARKS = struct.Struct('<84f')
+DEFAULT_PORT = 47800
+CLIENT_TIMEOUT = 5.0
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_NAN_HAND = [math.nan] * 42
+
+
+def pack(seq: int, timestamp: float, state, hands: Optional[Tuple] = None) -> bytes:
+    """One record; `hands` is (left, right) Hand-or-None to include landmarks."""
+    flags = FLAG_LANDMARKS if hands is not None else 0
+    out = HEADER.pack(
+        MAGIC, VERSION, flags, seq & 0xFFFFFFFF, timestamp,
+        state.steering_angle, state.steering_force, state.hands_distance, state.bits(), 0,
+    )
+    if hands is not None:
+        values: List[float] = []
+        for hand in hands:
+            values += [c for pt in hand.landmarks for c in pt] if hand else _NAN_HAND
+        out += LANDMARKS.pack(*values)
+    return out
+
+
+def unpack(data: bytes) -> Dict:
+    """Reference decoder for clients."""
+    magic, version, flags, seq, ts, angle, force, dist, bits, _ = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a gesture state record")
+    rec = {'seq': seq, 'timestamp': ts, 'steering_angle': angle, 'steering_force': force,
+           'hands_distance': dist, 'bits': bits, 'landmarks': None}
+    if flags & FLAG_LANDMARKS:
+        v = LANDMARKS.unpack_from(data, HEADER.size)
+        rec['landmarks'] = [[(v[h * 42 + 2 * i], v[h * 42 + 2 * i + 1]) for i in range(21)] for h in range(2)]
+    return rec
+
+
+class StateServer(abc.ABC):
+    """Base: latest-record handoff to a sender thread. Subclasses do the transport."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, landmarks: bool = False):
+        self.host = host
+        self.port = port
+        self.landmarks = landmarks
+        self.sent = 0
+        self._seq = 0
+        self._pending = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._open()
+        threading.Thread(target=self._serve, daemon=True).start()
+        threading.Thread(target=self._sender, daemon=True).start()
+
+    @property
+    @abc.abstractmethod
+    def clients(self) -> int:
+        """Number of subscribed clients."""
+
+    def publish(self, state, timestamp: float, left=None, right=None):
+        """Hand over this frame's state (hot path: no work without clients)."""
+        if not self.clients:
+            return
+        self._pending = (timestamp, state, (left, right) if self.landmarks else None)
+        self._wake.set()
+
+    def _sender(self):
+        while not self._stop.is_set():
+            if not self._wake.wait(0.5):
+                continue
+            self._wake.clear()
+            item, self._pending = self._pending, None
+            if item is None:
+                continue
+            timestamp, state, hands = item
+            self._seq += 1
+            self._send(pack(self._seq, timestamp, state, hands))
+            self.sent += 1
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._close()
+
+    # Transport hooks
+    @abc.abstractmethod
+    def _open(self):
+        """Bind the socket (set self.port if it was 0)."""
+
+    @abc.abstractmethod
+    def _serve(self):
+        """Accept subscriptions until self._stop is set (own thread)."""
+
+    @abc.abstractmethod
+    def _send(self, data: bytes):
+        """Send one record to every client."""
+
+    @abc.abstractmethod
+    def _close(self):
+        """Close the socket and drop the clients."""
+
+
+class UdpStateServer(StateServer):
+    def _open(self):
+        self._clients: Dict[Tuple, float] = {}
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.host, self.port))
+        self.sock.settimeout(0.5)
+        self.port = self.sock.getsockname()[1]
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(64)
+            except socket.timeout:
+                self._expire()
+                continue
+            except OSError:
+                # Closed by close(), or an ICMP port-unreachable from a client that
+                # went away (ConnectionResetError on Windows): only the first ends it
+                if self._stop.is_set():
+                    return
+                continue
+            with self._lock:
+                if data == b"bye":
+                    self._clients.pop(addr, None)
+                else:
+                    self._clients[addr] = time.monotonic()
+
+    def _expire(self):
+        cutoff = time.monotonic() - CLIENT_TIMEOUT
+        with self._lock:
+            for addr in [a for a, seen in self._clients.items() if seen < cutoff]:
+                del self._clients[addr]
+
+    def _send(self, data: bytes):
+        with self._lock:
+            addrs = list(self._clients)
+        for addr in addrs:
+            try:
+                self.sock.sendto(data, addr)
+            except OSError:
+                with self._lock:
+                    self._clients.pop(addr, None)
+
+    def _close(self):
+        self.sock.close()
+
+
+class WebSocketStateServer(StateServer):
+    """Minimal RFC 6455 server: handshake, server-to-client binary messages only."""
+
+    def _open(self):
+        self._clients: List[socket.socket] = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.listen(4)
+        self.sock.settimeout(0.5)
+        self.port = self.sock.getsockname()[1]
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._handshake, args=(conn,), daemon=True).start()
+
+    def _handshake(self, conn: socket.socket):
+        conn.settimeout(2.0)
+        try:
+            request = b""
+            while b"\r\n\r\n" not in request and len(request) < 8192:
+                chunk = conn.recv(1024)
+                if not chunk:
+                    raise OSError("closed during handshake")
+                request += chunk
+            key = None
+            for line in request.decode('latin-1').split("\r\n"):
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "sec-websocket-key":
+                    key = value.strip()
+            if not key:
+                conn.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+                raise OSError("not a websocket request")
+            accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+            conn.sendall((
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode())
+        except OSError:
+            conn.close()
+            return
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # A client stuck longer than this is dropped rather than stalling the others
+        conn.settimeout(0.5)
+        with self._lock:
+            self._clients.append(conn)
+        self._drain(conn)
+
+    def _drain(self, conn: socket.socket):
+        """Discard whatever the client sends; EOF or a close frame ends the connection."""
+        while not self._stop.is_set():
+            try:
+                data = conn.recv(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            # Client frames are masked; opcode 0x8 is close
+            if not data or data[0] & 0x0F == 0x8:
+                break
+        self._drop(conn)
+
+    def _drop(self, conn: socket.socket):
+        with self._lock:
+            if conn in self._clients:
+                self._clients.remove(conn)
+        conn.close()
+
+    def _send(self, data: bytes):
+        n = len(data)
+        if n < 126:
+            head = struct.pack('!BB', 0x82, n)
+        elif n < 65536:
+            head = struct.pack('!BBH', 0x82, 126, n)
+        else:
+            head = struct.pack('!BBQ', 0x82, 127, n)
+        msg = head + data
+        with self._lock:
+            conns = list(self._clients)
+        for conn in conns:
+            try:
+                conn.sendall(msg)
+            except OSError:
+                self._drop(conn)
+
+    def _close(self):
+        self.sock.close()
+        with self._lock:
+            conns, self._clients = self._clients, []
+        for conn in conns:
+            conn.close()
+
+
+def make_server(kind: str, host: str = '127.0.0.1', port: int = DEFAULT_PORT, landmarks: bool = False) -> StateServer:
+    if kind == 'udp':
+        return UdpStateServer(host, port, landmarks)
+    if kind == 'ws':
+        return WebSocketStateServer(host, port, landmarks)
+    raise ValueError(f"Unknown state server: {kind}")
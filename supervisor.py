@@ -0,0 +1,152 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class InferenceSupervisor:
+    """Runs inference on an active graph and keeps a warm standby for failover.
+
+    When the active graph raises, the standby is promoted on the spot and the
+    failing frame is skipped; a replacement standby is built on a background
+    thread, so a transient error never blocks the caller on a graph rebuild.
+    """
+
+    def __init__(self, factory: Callable[[], object], warm_standby: bool = True):
+        self.factory = factory
+        self.warm_standby = warm_standby
+        self.active = factory()
+        self.standby = None
+        self._lock = threading.Lock()
+        self._building = False
+        self._closed = False
+        self.stats: Dict[str, int] = {
+            'inference_errors': 0,
+            'render_errors': 0,
+            'failovers': 0,
+            'rebuilds': 0,
+            'skipped_frames': 0,
+        }
+        self._spawn_standby()
+
+    def _spawn_standby(self):
+        with self._lock:
+            if self._closed or self._building or self.standby is not None:
+                return
+            if not self.warm_standby and self.active is not None:
+                return
+            self._building = True
+        threading.Thread(target=self._build_standby, daemon=True).start()
+
+    def _build_standby(self):
+        try:
+            graph = self.factory()
+        except Exception as e:
+            print(f"Standby build failed: {e}")
+            graph = None
+        with self._lock:
+            self._building = False
+            if graph is None:
+                return
+            if self._closed:
+                self._close_graph(graph)
+                return
+            self.standby = graph
+            self.stats['rebuilds'] += 1
+
+    @staticmethod
+    def _close_graph(graph):
+        try:
+            graph.close()
+        except Exception:
+            pass
+
+    def _failover(self, failed):
+        with self._lock:
+            self.active, self.standby = self.standby, None
+            if self.active is not None:
+                self.stats['failovers'] += 1
+        # Closing a broken graph can be slow; keep it off the frame path
+        threading.Thread(target=self._close_graph, args=(failed,), daemon=True).start()
+        self._spawn_standby()
+
+    def process(self, image):
+        """Return inference results, or None if this frame had to be skipped."""
+        if self.active is None:
+            with self._lock:
+                self.active, self.standby = self.standby, None
+            if self.active is None:
+                self.stats['skipped_frames'] += 1
+                self._spawn_standby()
+                return None
+            self._spawn_standby()
+        graph = self.active
+        try:
+            return graph.process(image)
+        except Exception as e:
+            print(f"Inference error: {e}")
+            self.stats['inference_errors'] += 1
+            self.stats['skipped_frames'] += 1
+            self._failover(graph)
+            return None
+
+    def record(self, name: str):
+        self.stats[name] = self.stats.get(name, 0) + 1
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            graphs = [self.active, self.standby]
+            self.active = self.standby = None
+        for g in graphs:
+            if g is not None:
+                self._close_graph(g)
+
+
+class CaptureWatchdog:
+    """Flags cap.read() calls that stall longer than `timeout` seconds.
+
+    Wrap each read in `with watchdog:`; the watchdog thread invokes `on_stall`
+    once per stalled read and sets `stalled` so the loop can reopen the camera.
+    """
+
+    def __init__(self, timeout: float = 2.0, on_stall: Optional[Callable[[], None]] = None):
+        self.timeout = timeout
+        self.on_stall = on_stall
+        self.stalls = 0
+        self.stalled = False
+        self._started: Optional[float] = None
+        self._flagged = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        self._flagged = False
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self._started = None
+        return False
+
+    def _watch(self):
+        while not self._stop.wait(self.timeout / 4):
+            started = self._started
+            if started is None or self._flagged:
+                continue
+            if time.monotonic() - started > self.timeout:
+                self._flagged = True
+                self.stalled = True
+                self.stalls += 1
+                if self.on_stall:
+                    self.on_stall()
+
+    def consume(self) -> bool:
+        """Return True once after a stall was detected."""
+        if self.stalled:
+            self.stalled = False
+            return True
+        return False
+
+    def stop(self):
+        self._stop.set()
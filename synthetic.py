@@ -0,0 +1,127 @@
+"""Synthetic hand landmark streams for benchmarks and soak runs.
+
+Hands are built from a simple skeleton in normalized image coordinates so
+that GestureDetector classifies them as intended (fingers up/curled, thumb
+out/in). Streams yield (timestamp, hands) pairs where `hands` is the same
+List[HandResult] a landmark source returns. Everything is seeded, so a
+stream is identical from run to run.
+"""
+import math
+import random
+from typing import Iterator, List, Optional, Tuple
+
+from landmark_sources import HandResult
+
+Frame = Tuple[float, List[HandResult]]
+
+# Finger pose -> (thumb extended, index, middle, ring, pinky extended)
+POSES = {
+    'open': (True, True, True, True, True),
+    'fist': (False, False, False, False, False),
+    'forward': (False, True, True, False, False),
+    'backward': (True, False, False, False, False),
+}
+
+# (mcp x offset) for index, middle, ring, pinky
+_MCP_X = (-0.03, -0.01, 0.015, 0.045)
+
+
+def make_hand(
+    cx: float,
+    cy: float,
+    pose: str = 'open',
+    scale: float = 1.0,
+    mirror: bool = False,
+    rng: Optional[random.Random] = None,
+    jitter: float = 0.002,
+) -> List[Tuple[float, float]]:
+    """21 landmarks for a hand whose knuckles are centred on (cx, cy)."""
+    thumb_ext, *fingers_ext = POSES[pose]
+    d = -1.0 if mirror else 1.0
+    s = scale
+    pts = [(0.0, 0.0)] * 21
+    pts[0] = (cx, cy + 0.10 * s)
+
+    # Thumb: cmc, mcp, ip, tip
+    pts[1] = (cx - 0.04 * s * d, cy + 0.07 * s)
+    pts[2] = (cx - 0.06 * s * d, cy + 0.04 * s)
+    if thumb_ext:
+        pts[3] = (cx - 0.10 * s * d, cy + 0.02 * s)
+        pts[4] = (cx - 0.14 * s * d, cy)
+    else:
+        pts[3] = (cx - 0.04 * s * d, cy + 0.03 * s)
+        pts[4] = (cx - 0.01 * s * d, cy + 0.03 * s)
+
+    for f, ext in enumerate(fingers_ext):
+        base = 5 + 4 * f
+        x = cx + _MCP_X[f] * s * d
+        pts[base] = (x, cy)
+        if ext:
+            pts[base + 1] = (x, cy - 0.06 * s)
+            pts[base + 2] = (x, cy - 0.11 * s)
+            pts[base + 3] = (x, cy - 0.15 * s)
+        else:
+            pts[base + 1] = (x, cy - 0.03 * s)
+            pts[base + 2] = (x, cy - 0.01 * s)
+            pts[base + 3] = (x, cy + 0.03 * s)
+
+    if rng is not None and jitter:
+        pts = [(x + rng.gauss(0, jitter), y + rng.gauss(0, jitter)) for x, y in pts]
+    return pts
+
+
+def two_hands(
+    dy: float = 0.0,
+    gap: float = 0.3,
+    left_pose: str = 'open',
+    right_pose: str = 'open',
+    rng: Optional[random.Random] = None,
+) -> List[HandResult]:
+    """A steering pair: `dy` is right-slot wrist y minus left-slot wrist y.
+
+    MediaPipe's "Left" label lands in the detector's right slot, so the
+    right-slot hand is labelled "Left" here.
+    """
+    left = make_hand(0.5 + gap / 2, 0.5 - dy / 2, left_pose, mirror=True, rng=rng)
+    right = make_hand(0.5 - gap / 2, 0.5 + dy / 2, right_pose, rng=rng)
+    return [(left, "Right"), (right, "Left")]
+
+
+def steering_sweep(n: int = 600, fps: float = 30.0, amplitude: float = 0.35, seed: int = 0) -> Iterator[Frame]:
+    """Both hands up, steering swept left-right-left."""
+    rng = random.Random(seed)
+    for i in range(n):
+        dy = amplitude * math.sin(2 * math.pi * i / 120)
+        yield i / fps, two_hands(dy, rng=rng)
+
+
+def finger_poses(n: int = 600, fps: float = 30.0, hold: int = 15, seed: int = 0) -> Iterator[Frame]:
+    """Both hands cycling through every pose combination, `hold` frames each."""
+    rng = random.Random(seed)
+    names = list(POSES)
+    combos = [(a, b) for a in names for b in names]
+    for i in range(n):
+        lp, rp = combos[(i // hold) % len(combos)]
+        yield i / fps, two_hands(0.0, left_pose=lp, right_pose=rp, rng=rng)
+
+
+def enter_leave(n: int = 600, fps: float = 30.0, period: int = 90, seed: int = 0) -> Iterator[Frame]:
+    """Hands appearing and disappearing: none, left only, right only, both."""
+    rng = random.Random(seed)
+    for i in range(n):
+        phase = (i // (period // 4)) % 4
+        hands = two_hands(0.1 * math.sin(i / 20), rng=rng)
+        if phase == 0:
+            hands = []
+        elif phase == 1:
+            hands = hands[:1]
+        elif phase == 2:
+            hands = hands[1:]
+        yield i / fps, hands
+
+
+STREAMS = {
+    'steering_sweep': steering_sweep,
+    'finger_poses': finger_poses,
+    'enter_leave': enter_leave,
+}
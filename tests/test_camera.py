@@ -0,0 +1,44 @@
+import camera
+
+
+class FakeCap:
+    def __init__(self, backend, fourcc):
+        self.backend, self.fourcc = backend, fourcc
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+def fake_camera(monkeypatch, seconds_for_frames):
+    """Every pair opens; `seconds_for_frames(fourcc)` is how long MEASURE_FRAMES reads take."""
+    opened = []
+
+    def open_(index, backend, fourcc):
+        opened.append(FakeCap(backend, fourcc))
+        return opened[-1]
+
+    monkeypatch.setattr(camera, 'candidate_backends', lambda: [1, 2])
+    monkeypatch.setattr(camera, 'backend_name', str)
+    monkeypatch.setattr(camera, '_open', open_)
+    monkeypatch.setattr(camera, 'warm_up', lambda cap, timeout=2.0: True)
+    monkeypatch.setattr(camera, '_measure', lambda cap: seconds_for_frames(cap.fourcc))
+    return opened
+
+
+def test_probe_stops_at_full_frame_rate(monkeypatch):
+    opened = fake_camera(monkeypatch, lambda fourcc: camera.MEASURE_FRAMES / camera.FPS)
+    tried = []
+    cap, prof = camera.probe(0, lambda backend, fourcc: tried.append((backend, fourcc)))
+    assert len(opened) == 1 and cap is opened[0] and not cap.released
+    assert tried == [('1', 'MJPG')]
+    assert prof['fourcc'] == 'MJPG'
+
+
+def test_probe_keeps_the_fastest_when_none_is_full_rate(monkeypatch):
+    slow = {'MJPG': 1.0, 'YUYV': 0.5, '': 0.8}
+    opened = fake_camera(monkeypatch, lambda fourcc: slow[fourcc])
+    cap, prof = camera.probe(0)
+    assert len(opened) == 2 * len(camera.PIXEL_FORMATS)
+    assert prof['fourcc'] == 'YUYV' and not cap.released
+    assert all(c.released for c in opened if c is not cap)
@@ -0,0 +1,80 @@
+import multiprocessing
+import queue
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+import extract
+import session
+
+
+class CountingSource:
+    """Stand-in landmark model: one hand whose x is the frame's first pixel."""
+
+    def __init__(self, built):
+        built.append(self)
+        self.frames = 0
+        self.closed = False
+
+    def process(self, rgb):
+        self.frames += 1
+        return [([(rgb[0, 0, 0] / 255, 0.5)] * 21, 'Left')]
+
+    def close(self):
+        self.closed = True
+
+
+def write_video(path, n):
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+    for i in range(n):
+        out.write(np.full((48, 64, 3), i * 10, np.uint8))
+    out.release()
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    built = []
+    monkeypatch.setattr(extract, '_build_source', lambda: CountingSource(built))
+    # _init_worker sets module globals: register them so they're restored afterwards
+    for name in ('_backend', '_model_path', '_mirror', '_progress'):
+        monkeypatch.setattr(extract, name, getattr(extract, name))
+    extract._init_worker('solutions', None, False, multiprocessing.Value('q', 0))
+    return built
+
+
+def test_fresh_source_per_video(tmp_path, worker):
+    for name, n in (('a.avi', 5), ('b.avi', 8)):
+        write_video(tmp_path / name, n)
+        video, frames, _, error = extract._extract((str(tmp_path / name), str(tmp_path / (name + '.npz'))))
+        assert (frames, error) == (n, None)
+    assert [s.frames for s in worker] == [5, 8]
+    assert all(s.closed for s in worker)
+    s = session.load(str(tmp_path / 'b.avi.npz'))
+    assert len(s.timestamps) == 8 and s.timestamps[0] == 0.0
+    assert np.isnan(s.landmarks[:, 0]).all() and not np.isnan(s.landmarks[:, 1]).any()
+
+
+class BrokenCapture:
+    def __init__(self, good):
+        self.good = good
+
+    def read(self):
+        if self.good:
+            self.good -= 1
+            return True, np.zeros((4, 4, 3), np.uint8)
+        raise cv2.error("corrupt frame")
+
+
+def test_decode_error_ends_the_stream(monkeypatch):
+    monkeypatch.setattr(extract, '_mirror', False)
+    frames: queue.Queue = queue.Queue()
+    errors = []
+    t = threading.Thread(target=extract._decode, args=(BrokenCapture(3), 30.0, frames, threading.Event(), errors))
+    t.start()
+    t.join(2.0)
+    assert not t.is_alive()
+    items = [frames.get_nowait() for _ in range(frames.qsize())]
+    assert len(items) == 4 and items[-1] is None
+    assert errors and 'frame 3' in errors[0]
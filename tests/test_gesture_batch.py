@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pytest
+
+import gesture_batch
+import synthetic
+from clock import VirtualClock
+from config import DEFAULT_SENSITIVITY, DEFAULT_THRESHOLDS
+from gesture_detector import GestureDetector
+from gesture_rules import BUILTIN_RULES
+
+
+def noisy(n, seed=0):
+    """Random poses, gaps and tilts at an irregular frame rate, hands dropping in and out."""
+    rng = random.Random(seed)
+    t = 0.0
+    for _ in range(n):
+        t += rng.uniform(0.01, 0.06)
+        hands = synthetic.two_hands(rng.uniform(-0.4, 0.4), gap=rng.uniform(0.05, 0.7),
+                                    left_pose=rng.choice(list(synthetic.POSES)),
+                                    right_pose=rng.choice(list(synthetic.POSES)), rng=rng)
+        r = rng.random()
+        yield t, [] if r < 0.1 else hands[:1] if r < 0.2 else hands[1:] if r < 0.3 else hands
+
+
+STREAMS = dict(synthetic.STREAMS, noisy=lambda n: noisy(n))
+
+
+def streamed(frames, thresholds, use_stability, rules=None):
+    clock = VirtualClock()
+    det = GestureDetector(thresholds, dict(DEFAULT_SENSITIVITY), backend=None, rules=rules, clock=clock)
+    states = []
+    for t, hands in frames:
+        clock.set(t)
+        states.append(det.process_landmarks(hands, use_stability))
+    return states
+
+
+def batch(frames, thresholds, use_stability, rules=None):
+    return gesture_batch.evaluate(
+        gesture_batch.stack_hands([h for _, h in frames]), np.array([t for t, _ in frames]),
+        thresholds, dict(DEFAULT_SENSITIVITY), use_stability, rules=rules,
+    )
+
+
+@pytest.mark.parametrize('stream', sorted(STREAMS))
+@pytest.mark.parametrize('delay', [0.0, 0.18, 1.0])
+@pytest.mark.parametrize('use_stability', [True, False])
+def test_batch_equals_streaming(stream, delay, use_stability):
+    frames = list(STREAMS[stream](600))
+    thresholds = dict(DEFAULT_THRESHOLDS, stability_delay=delay)
+    states = streamed(frames, thresholds, use_stability)
+    r = batch(frames, thresholds, use_stability)
+    # Same arithmetic, so exactly equal, not just close
+    assert [s.steering_angle for s in states] == list(r.steering_angle)
+    assert [s.steering_force for s in states] == list(r.steering_force)
+    assert [s.hands_distance for s in states] == list(r.hands_distance)
+    assert [s.bits() for s in states] == list(r.bits())
+
+
+CUSTOM = dict(
+    BUILTIN_RULES,
+    peace_left={'hand': 'left', 'fingers': '?11??'},
+    any_fist={'hand': 'any', 'fingers': '00000'},
+    both_open={'hand': 'both', 'fingers': '11111'},
+    mid_gap={'hand': 'both', 'distance': ['>', 0.2, '<', 0.45]},
+    tilt={'hand': 'both', 'angle': ['>', 15]},
+)
+
+
+@pytest.mark.parametrize('stream', sorted(synthetic.STREAMS))
+@pytest.mark.parametrize('use_stability', [True, False])
+def test_batch_equals_streaming_custom_rules(stream, use_stability):
+    frames = list(synthetic.STREAMS[stream](600))
+    states = streamed(frames, dict(DEFAULT_THRESHOLDS), use_stability, CUSTOM)
+    active = [{name for name in CUSTOM if getattr(s, name, False) or name in s.extra} for s in states]
+    r = batch(frames, dict(DEFAULT_THRESHOLDS), use_stability, CUSTOM)
+    assert [{name for name in CUSTOM if r.flags[name][i]} for i in range(len(frames))] == active
+    # The custom rules actually fire somewhere in the stream
+    assert set().union(*active) - set(BUILTIN_RULES)
+
+
+def test_stack_hands_slots():
+    left, right = synthetic.two_hands()
+    lm = gesture_batch.stack_hands([[left, right], [right], []])
+    # MediaPipe's "Left" label is the right slot
+    assert np.array_equal(lm[0, 0], left[0]) and np.array_equal(lm[0, 1], right[0])
+    assert np.isnan(lm[1, 0]).all() and np.array_equal(lm[1, 1], right[0])
+    assert np.isnan(lm[2]).all()
@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+import synthetic
+from config import DEFAULT_SENSITIVITY, DEFAULT_THRESHOLDS
+from gesture_detector import GestureDetector
+from gesture_rules import BUILTIN_RULES, RuleSet, parse
+
+FIST, OPEN = 0b00000, 0b11111
+PEACE = 0b00110  # Index and middle
+
+
+def matches(rules, left, right, measures=None, thresholds=None, sensitivity=None):
+    rs = RuleSet(rules, thresholds, sensitivity)
+    matched, _ = rs.evaluate(left, right, measures)
+    return {name for name, bit in zip(rs.names, rs.bits) if matched & bit}
+
+
+@pytest.mark.parametrize('spec, message', [
+    ({'hand': 'middle', 'fingers': '11111'}, 'hand must be one of'),
+    ({'fingers': '1111'}, 'fingers must be 5'),
+    ({'fingers': '1111x'}, 'fingers must be 5'),
+    ({'hand': 'both', 'distance': ['<']}, 'operator/value pairs'),
+    ({'hand': 'both', 'distance': []}, 'operator/value pairs'),
+    ({'hand': 'both', 'distance': ['<=', 0.2]}, 'unknown operator'),
+    ({'hand': 'left', 'distance': ['<', 0.2]}, "need hand 'both'"),
+    ({'hand': 'any'}, 'has no fingers or conditions'),
+])
+def test_parse_errors(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse('bad', spec)
+
+
+def test_unknown_threshold():
+    with pytest.raises(ValueError, match="unknown threshold 'nope'"):
+        RuleSet({'r': {'hand': 'both', 'distance': ['<', 'nope']}})
+
+
+def test_finger_pattern():
+    rule = parse('r', {'hand': 'left', 'fingers': '?1100'})
+    assert (rule.care, rule.want) == (0b11110, 0b00110)
+    rules = {'r': {'hand': 'left', 'fingers': '?1100'}}
+    assert matches(rules, PEACE, None) == {'r'}
+    assert matches(rules, PEACE | 1, None) == {'r'}  # Thumb is '?'
+    assert matches(rules, OPEN, None) == set()
+
+
+@pytest.mark.parametrize('op, x, expected', [
+    ('<', 0.29, True), ('<', 0.3, False), ('<', 0.31, False),
+    ('>', 0.29, False), ('>', 0.3, False), ('>', 0.31, True),
+])
+def test_strict_at_breakpoint(op, x, expected):
+    rules = {'r': {'hand': 'both', 'distance': [op, 0.3]}}
+    assert (matches(rules, FIST, FIST, (x, 0.0, 0.0)) == {'r'}) is expected
+
+
+def test_any_and_both():
+    rules = {
+        'any_peace': {'hand': 'any', 'fingers': '?11??'},
+        'both_peace': {'hand': 'both', 'fingers': '?11??'},
+    }
+    assert matches(rules, PEACE, None) == {'any_peace'}
+    assert matches(rules, None, PEACE) == {'any_peace'}
+    assert matches(rules, PEACE, FIST) == {'any_peace'}
+    assert matches(rules, PEACE, PEACE) == {'any_peace', 'both_peace'}
+    assert matches(rules, FIST, FIST) == set()
+
+
+def test_unevaluated_without_hands():
+    rs = RuleSet({'both_fist': {'hand': 'both', 'fingers': '00000'}, 'left_fist': {'hand': 'left', 'fingers': '00000'}})
+    assert rs.evaluate(None, None) == (0, 0)
+    matched, evaluated = rs.evaluate(FIST, None)
+    assert evaluated == rs.bits[1] and matched == rs.bits[1]
+
+
+def test_several_conditions_on_one_measurement():
+    rules = {'band': {'hand': 'both', 'distance': ['>', 0.2, '<', 0.4]}}
+    for x, expected in [(0.1, False), (0.2, False), (0.3, True), (0.4, False), (0.5, False)]:
+        assert (matches(rules, FIST, FIST, (x, 0.0, 0.0)) == {'band'}) is expected
+    # Repeated bounds on the same side keep the tightest
+    rules = {'tight': {'hand': 'both', 'angle': ['<', 30, '<', 10, '>', -10, '>', -30]}}
+    for x, expected in [(-20, False), (-5, True), (5, True), (20, False)]:
+        assert (matches(rules, FIST, FIST, (0.0, 0.0, x)) == {'tight'}) is expected
+
+
+def test_measurements_and_fingers_combine():
+    rules = {'wide_peace': {'hand': 'both', 'fingers': '?11??', 'distance': ['>', 0.5]}}
+    assert matches(rules, PEACE, PEACE, (0.6, 0.0, 0.0)) == {'wide_peace'}
+    assert matches(rules, PEACE, PEACE, (0.4, 0.0, 0.0)) == set()
+    assert matches(rules, FIST, PEACE, (0.6, 0.0, 0.0)) == set()
+
+
+def test_threshold_names_and_negation():
+    rules = {'left': {'hand': 'both', 'steer': ['<', '-dead_zone_ratio']}}
+    th = {'dead_zone_ratio': 0.2}
+    assert matches(rules, FIST, FIST, (0.0, -0.25, 0.0), th) == {'left'}
+    assert matches(rules, FIST, FIST, (0.0, -0.15, 0.0), th) == set()
+    # Missing from the thresholds: the fallback value (0.3)
+    assert matches(rules, FIST, FIST, (0.0, -0.25, 0.0)) == set()
+    assert matches(rules, FIST, FIST, (0.0, -0.35, 0.0)) == {'left'}
+
+
+def test_distance_sensitivity_and_rebind():
+    rules = {'close': {'hand': 'both', 'distance': ['<', 'hands_close_dist']}}
+    th = {'hands_close_dist': 0.1}
+    assert matches(rules, FIST, FIST, (0.15, 0.0, 0.0), th) == set()
+    # '<' thresholds are divided by the distance sensitivity
+    assert matches(rules, FIST, FIST, (0.15, 0.0, 0.0), th, {'distance': 0.5}) == {'close'}
+    rs = RuleSet(rules, th)
+    wide = rs.rebind({'hands_close_dist': 0.2}, {})
+    assert wide.evaluate(FIST, FIST, (0.15, 0.0, 0.0))[0] == wide.bits[0]
+    # The original keeps its tables (the capture thread may still be using it)
+    assert rs.evaluate(FIST, FIST, (0.15, 0.0, 0.0))[0] == 0
+
+
+def test_detector_swaps_plan_on_threshold_change():
+    det = GestureDetector(dict(DEFAULT_THRESHOLDS), dict(DEFAULT_SENSITIVITY), backend=None)
+    det.set_enabled(['hands_close'])
+    old = det.plan
+    tables = old.rules.tables
+    det.update_thresholds(dict(DEFAULT_THRESHOLDS, hands_close_dist=0.5))
+    det.update_sensitivity(dict(DEFAULT_SENSITIVITY, distance=2.0))
+    assert det.plan is not old and old.rules.tables is tables
+    # 0.5 divided by the distance sensitivity; the old plan still says 0.12
+    assert det.plan.rules.evaluate(FIST, FIST, (0.2, 0.0, 0.0))[0] == det.plan.rules.bits[0]
+    assert old.rules.evaluate(FIST, FIST, (0.2, 0.0, 0.0))[0] == 0
+    # The enabled subset carries over
+    assert det.plan.rules.names == ('hands_close',)
+
+
+def test_array_matches_scalar():
+    rules = dict(BUILTIN_RULES, band={'hand': 'both', 'distance': ['>', 0.2, '<', 0.4]},
+                 any_peace={'hand': 'any', 'fingers': '?11??'})
+    rs = RuleSet(rules, DEFAULT_THRESHOLDS, DEFAULT_SENSITIVITY)
+    rng = np.random.default_rng(0)
+    n = 500
+    left = rng.integers(-1, 32, n)
+    right = rng.integers(-1, 32, n)
+    measures = np.stack([rng.choice([0.2, 0.3, 0.4, 0.6], n), rng.uniform(-1, 1, n), rng.uniform(-60, 60, n)], 1)
+    measures[(left < 0) | (right < 0)] = np.nan
+    matched, evaluated = rs.evaluate_array(left, right, measures)
+    for i in range(n):
+        l = int(left[i]) if left[i] >= 0 else None
+        r = int(right[i]) if right[i] >= 0 else None
+        m = tuple(measures[i]) if l is not None and r is not None else None
+        assert rs.evaluate(l, r, m) == (matched[i], evaluated[i])
+
+
+@pytest.mark.parametrize('seats', [1, 2])
+def test_measurements_without_distance_rules(seats):
+    frames = list(synthetic.steering_sweep(120))
+    full = GestureDetector(dict(DEFAULT_THRESHOLDS), dict(DEFAULT_SENSITIVITY), seats=seats, backend=None)
+    fingers_only = GestureDetector(dict(DEFAULT_THRESHOLDS), dict(DEFAULT_SENSITIVITY), seats=seats, backend=None)
+    fingers_only.set_enabled(['left_forward'])
+    for _, hands in frames:
+        a = full.process_landmarks(hands, False)
+        b = fingers_only.process_landmarks(hands, False)
+        assert b.hands_distance == a.hands_distance
+        assert b.hands_distance > 0 or not (b.left_detected and b.right_detected)
+        assert b.steering_angle == a.steering_angle
+        assert not (b.hands_close or b.hands_far or b.steer_left or b.steer_right)
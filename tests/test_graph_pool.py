@@ -0,0 +1,107 @@
+import random
+import time
+from functools import partial
+
+import numpy as np
+import pytest
+
+import gesture_detector
+from graph_pool import GraphPool
+
+
+class SlowGraph:
+    """Stand-in landmark graph: sleeps like inference and echoes the frame
+    number encoded in its first pixels."""
+
+    def __init__(self, delay, fail_at):
+        self.delay = delay
+        self.fail_at = fail_at
+        self.rng = random.Random()
+
+    def process(self, rgb):
+        n = int(rgb[0, 0, 0]) + 256 * int(rgb[0, 0, 1])
+        time.sleep(self.delay * self.rng.uniform(0.5, 1.5))
+        if n == self.fail_at:
+            raise ValueError(f"bad frame {n}")
+        return [([(float(n), 0.0)] * 21, 'Left')]
+
+    def close(self):
+        pass
+
+
+def slow_graph(delay=0.02, fail_at=None):
+    return SlowGraph(delay, fail_at)
+
+
+def frame(n, shape=(48, 64)):
+    f = np.zeros(shape + (3,), np.uint8)
+    f[0, 0, 0], f[0, 0, 1] = n % 256, n // 256
+    return f
+
+
+def delivered(pool, frames):
+    out = []
+    for f in frames:
+        hands = pool.process(f)
+        if hands:
+            out.append(int(hands[0][0][0][0]))
+    return out
+
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_in_order_delivery(mode):
+    pool = GraphPool(partial(slow_graph), 3, mode)
+    try:
+        # Frames of changing size also exercise the shared-memory regrowth
+        shapes = [(48, 64), (96, 128), (24, 32)]
+        got = delivered(pool, [frame(i, shapes[i % 3]) for i in range(40)])
+    finally:
+        pool.close()
+    assert got == sorted(got)
+    assert got[-1] >= 40 - 1 - pool.size
+    assert 0 <= pool.lag <= pool.size
+
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_error_surfaces_on_its_frame(mode):
+    pool = GraphPool(partial(slow_graph, 0.02, 10), 3, mode)
+    got = []
+    try:
+        with pytest.raises(Exception, match='bad frame 10'):
+            for i in range(40):
+                hands = pool.process(frame(i))
+                if hands:
+                    got.append(int(hands[0][0][0][0]))
+    finally:
+        pool.close()
+    # Everything before the failing frame came out, nothing after it
+    assert got and got[-1] == 9
+
+
+def test_pool_overlaps_inference():
+    pool = GraphPool(partial(slow_graph, 0.04), 3, 'thread')
+    try:
+        t0 = time.perf_counter()
+        delivered(pool, [frame(i) for i in range(30)])
+        elapsed = time.perf_counter() - t0
+    finally:
+        pool.close()
+    # One graph would need about 30 * 40 ms
+    assert elapsed < 30 * 0.04 / 1.5
+
+
+def test_factory_error_in_process():
+    with pytest.raises(RuntimeError, match='failed to start'):
+        GraphPool(partial(SlowGraph, 0.0), 2, 'process')  # Missing argument
+
+
+def test_detector_pool_has_no_standby(monkeypatch):
+    monkeypatch.setattr(gesture_detector, 'make_source', lambda *a, **k: slow_graph(0.0))
+    det = gesture_detector.GestureDetector({}, {}, backend='solutions', graphs=2)
+    try:
+        assert isinstance(det.supervisor.active, GraphPool)
+        assert not det.supervisor.warm_standby
+        time.sleep(0.1)
+        assert det.supervisor.standby is None
+    finally:
+        det.release()
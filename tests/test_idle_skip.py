@@ -0,0 +1,59 @@
+import numpy as np
+
+from config import Config
+from gesture_detector import GestureDetector
+
+
+class CountingSupervisor:
+    active = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, rgb):
+        self.calls += 1
+        return []
+
+
+def detector(motion_threshold):
+    cfg = Config()
+    d = GestureDetector(dict(cfg.thresholds, motion_threshold=motion_threshold), cfg.sensitivity, backend=None)
+    d.supervisor = CountingSupervisor()
+    return d
+
+
+def run(d, frames):
+    for f in frames:
+        d.process(f, rgb=True)
+    calls, d.supervisor.calls = d.supervisor.calls, 0
+    return calls
+
+
+def still(n):
+    return [np.zeros((48, 64, 3), np.uint8)] * n
+
+
+def test_idle_skips_without_motion_gate():
+    d = detector(0)
+    assert run(d, still(30)) == 30
+    d.set_idle(True, 10)
+    assert run(d, still(30)) == 3
+    d.set_idle(False)
+    assert run(d, still(30)) == 30
+
+
+def test_motion_wakes_idle_inference_at_once():
+    d = detector(2.0)
+    d.set_idle(True, 10)
+    run(d, still(3))
+    assert run(d, [np.full((48, 64, 3), 200, np.uint8)]) == 1
+
+
+def test_motion_wakes_idle_inference_with_gate_disabled():
+    d = detector(0)
+    d.set_idle(True, 30)
+    run(d, still(5))
+    assert run(d, [np.full((48, 64, 3), 200, np.uint8)]) == 1
+    # Leaving idle turns gating back off
+    d.set_idle(False)
+    assert run(d, still(10)) == 10
@@ -0,0 +1,107 @@
+import threading
+import time
+
+from clock import VirtualClock, millis
+from config import Config
+from gesture_detector import GestureState
+from keyboard_controller import KeyboardController, RecordingBackend, handle_gestures
+
+
+def setup(**bindings):
+    cfg = Config()
+    cfg.keybindings.update(bindings)
+    clock = VirtualClock()
+    recorder = RecordingBackend(millis(clock))
+    kb = KeyboardController(4, backend=recorder, clock=millis(clock))
+    return cfg, clock, recorder, kb
+
+
+def test_hold_and_release():
+    cfg, clock, rec, kb = setup()
+    held = handle_gestures(kb, GestureState(left_forward=True, hands_close=True), cfg, {}, set())
+    assert held == {'up', 'space'}
+    assert kb.get_pressed() == {'up', 'space'}
+    held = handle_gestures(kb, GestureState(hands_close=True), cfg, {}, held)
+    assert held == {'space'}
+    assert kb.get_pressed() == {'space'}
+
+
+def test_disabled_gesture_presses_nothing():
+    cfg, clock, rec, kb = setup()
+    held = handle_gestures(kb, GestureState(left_forward=True, steer_left=True, steering_force=1.0),
+                           cfg, {'left_forward': False, 'steer_left': False}, set())
+    assert held == set() and not rec.events
+
+
+def test_steering_pulses_with_force():
+    cfg, clock, rec, kb = setup()
+    held = set()
+    for _ in range(300):
+        clock.advance(1 / 60)
+        held = handle_gestures(kb, GestureState(steer_right=True, steering_force=0.5), cfg, {}, held)
+    presses = [e for e in rec.events if e[1:] == ('press', 'd')]
+    releases = [e for e in rec.events if e[1:] == ('release', 'd')]
+    # Half force: pulsed, not held down for the whole run
+    assert len(presses) > 1 and len(releases) > 1
+    assert held == set()
+    handle_gestures(kb, GestureState(), cfg, {}, held)
+    assert 'd' not in kb.get_pressed()
+
+
+def test_motion_event_taps_and_custom_gesture_holds():
+    cfg, clock, rec, kb = setup(left_swipe_left='q')
+    cfg.gesture_rules = {'peace': {'hand': 'left', 'fingers': '?11??'}}
+    cfg.keybindings['peace'] = 'p'
+    held = handle_gestures(kb, GestureState(events=('left_swipe_left',), extra=('peace',)), cfg, {}, set())
+    assert held == {'p'}
+    assert {'q', 'p'} <= kb.get_pressed()
+    clock.advance(0.2)
+    handle_gestures(kb, GestureState(extra=('peace',)), cfg, {}, held)
+    assert kb.get_pressed() == {'p'}
+
+
+class YieldingBackend(RecordingBackend):
+    """Gives up the GIL inside every key event, where a real injector blocks."""
+
+    def press(self, key):
+        time.sleep(0)
+        super().press(key)
+
+    def release(self, key):
+        time.sleep(0)
+        super().release(key)
+
+
+def test_gui_thread_calls_race_capture_thread():
+    cfg, clock, rec, kb = setup()
+    kb.controller = YieldingBackend(millis(clock))
+    errors, stop = [], threading.Event()
+
+    def capture():
+        held = set()
+        try:
+            for i in range(3000):
+                clock.advance(1 / 60)
+                s = GestureState(steer_left=i % 2 == 0, steering_force=0.5, left_forward=True, hands_close=i % 3 == 0)
+                held = handle_gestures(kb, s, cfg, {}, held)
+        except Exception as e:
+            errors.append(e)
+        stop.set()
+
+    t = threading.Thread(target=capture)
+    t.start()
+    while not stop.is_set():
+        kb.set_enabled(False)
+        kb.set_enabled(True)
+        kb.set_max(2)
+        kb.get_pressed(), kb.get_pwm_state('a')
+        kb.set_max(4)
+    t.join()
+    kb.release_all()
+    assert not errors
+    # Every key that went down came back up, none twice
+    down = set()
+    for _, kind, key in kb.controller.events:
+        assert (key in down) == (kind == 'release')
+        (down.add if kind == 'press' else down.discard)(key)
+    assert not down
@@ -0,0 +1,140 @@
+import base64
+import os
+import socket
+import struct
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from gesture_detector import GestureState
+from state_server import make_server, unpack
+
+
+def udp_client(port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(2.0)
+    sock.sendto(b"hi", ('127.0.0.1', port))
+    return sock, lambda: sock.recv(2048)
+
+
+def ws_client(port):
+    sock = socket.create_connection(('127.0.0.1', port), timeout=2.0)
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall((
+        f"GET / HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    ).encode())
+    buf = [b""]
+    while b"\r\n\r\n" not in buf[0]:
+        buf[0] += sock.recv(1024)
+    head, buf[0] = buf[0].split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 101")
+
+    def need(n):
+        while len(buf[0]) < n:
+            buf[0] += sock.recv(65536)
+
+    def recv():
+        need(2)
+        assert buf[0][0] == 0x82  # Final binary frame
+        n, off = buf[0][1] & 0x7F, 2
+        if n == 126:
+            need(4)
+            n, off = struct.unpack('!H', buf[0][2:4])[0], 4
+        need(off + n)
+        msg, buf[0] = buf[0][off:off + n], buf[0][off + n:]
+        return msg
+    return sock, recv
+
+
+def wait_for_client(server):
+    deadline = time.monotonic() + 2.0
+    while not server.clients:
+        assert time.monotonic() < deadline, "client never subscribed"
+        time.sleep(0.01)
+
+
+def sample_state():
+    return GestureState(steer_left=True, steering_angle=-12.5, steering_force=0.75,
+                        hands_close=True, hands_distance=0.25, left_forward=True)
+
+
+@pytest.mark.parametrize('kind, connect', [('udp', udp_client), ('ws', ws_client)])
+@pytest.mark.parametrize('landmarks', [False, True])
+def test_loopback(kind, connect, landmarks):
+    server = make_server(kind, port=0, landmarks=landmarks)
+    try:
+        assert server.port != 0
+        sock, recv = connect(server.port)
+        wait_for_client(server)
+        state = sample_state()
+        left = SimpleNamespace(landmarks=[(i / 32, 1 - i / 32) for i in range(21)])
+        server.publish(state, 1234.5, left, None)
+        rec = unpack(recv())
+        sock.close()
+    finally:
+        server.close()
+    assert rec['seq'] == 1
+    assert rec['timestamp'] == 1234.5
+    assert rec['steering_angle'] == -12.5
+    assert rec['steering_force'] == 0.75
+    assert rec['hands_distance'] == 0.25
+    assert rec['bits'] == state.bits()
+    if landmarks:
+        assert rec['landmarks'][0] == left.landmarks
+        assert all(x != x for pt in rec['landmarks'][1] for x in pt)  # Missing hand: NaN
+    else:
+        assert rec['landmarks'] is None
+
+
+def test_publish_without_clients_sends_nothing():
+    server = make_server('udp', port=0)
+    try:
+        server.publish(sample_state(), 0.0)
+        time.sleep(0.05)
+        assert server.sent == 0
+    finally:
+        server.close()
+
+
+class ResettingSocket:
+    """Raises ConnectionResetError on the first recvfrom, as Windows does after
+    an ICMP port-unreachable from a client that went away."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._reset = True
+
+    def recvfrom(self, n):
+        if self._reset:
+            self._reset = False
+            raise ConnectionResetError
+        return self._sock.recvfrom(n)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+def test_udp_survives_connection_reset():
+    server = make_server('udp', port=0)
+    server.sock = wrapped = ResettingSocket(server.sock)
+    try:
+        deadline = time.monotonic() + 2.0
+        while wrapped._reset:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        sock, recv = udp_client(server.port)
+        wait_for_client(server)
+        server.publish(sample_state(), 1.0)
+        assert unpack(recv())['seq'] == 1
+        sock.close()
+    finally:
+        server.close()
+
+
+def test_base_is_abstract():
+    from state_server import StateServer
+
+    with pytest.raises(TypeError):
+        StateServer(port=0)
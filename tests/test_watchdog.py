@@ -0,0 +1,49 @@
+import threading
+import time
+
+from frame_pool import FramePipeline
+from supervisor import CaptureWatchdog
+
+
+class HangingCapture:
+    """read() blocks until release(), like a camera that stopped delivering."""
+
+    def __init__(self):
+        self.released = threading.Event()
+
+    def read(self, buf=None):
+        self.released.wait(5.0)
+        return False, None
+
+    def release(self):
+        self.released.set()
+
+
+def test_on_stall_unblocks_hung_read():
+    cap = HangingCapture()
+    watchdog = CaptureWatchdog(0.2, cap.release)
+    try:
+        t0 = time.monotonic()
+        with watchdog:
+            frame = FramePipeline().next(cap, True)
+        assert frame is None
+        assert time.monotonic() - t0 < 2.0
+        assert watchdog.consume()
+        assert not watchdog.consume()
+        assert watchdog.stalls == 1
+    finally:
+        watchdog.stop()
+
+
+def test_no_stall_on_fast_reads():
+    calls = []
+    watchdog = CaptureWatchdog(0.2, lambda: calls.append(1))
+    try:
+        for _ in range(5):
+            with watchdog:
+                time.sleep(0.01)
+        time.sleep(0.1)
+        assert not watchdog.consume()
+        assert calls == []
+    finally:
+        watchdog.stop()
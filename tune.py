@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Threshold auto-tuner over recorded, labeled sessions.
+
+Record a labeled session (a window prompts for each enabled gesture in
+turn and labels the frames while you hold it):
+
+    python tune.py record sessions/me_1.npz --rounds 3
+
+Search for the thresholds that best reproduce the labels and save them as
+a profile in config.json (it then shows up under PROFILES in the GUI):
+
+    python tune.py search sessions/*.npz --profile tuned --trials 2000
+
+Candidates are spread over a process pool; each worker loads the sessions
+once and scores a candidate with gesture_batch.evaluate, so a trial costs
+milliseconds. Score (lower is better) = false triggers + seconds a gesture
+stays on outside its label + misses + mean confirmation latency, with the
+weights below.
+
+The tilt needed to steer is set by visual_max_angle together with
+dead_zone_ratio; the steering_angle threshold is not read by the detector,
+so it is not searched.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+
+SEARCH_SPACE = {
+    'visual_max_angle': (30.0, 90.0),
+    'dead_zone_ratio': (0.1, 0.5),
+    'stability_delay': (0.05, 0.5),
+    'finger_extend_thresh': (0.02, 0.12),
+    'hands_close_dist': (0.05, 0.25),
+    'hands_far_dist': (0.40, 0.70),
+}
+
+# Thresholds that can change each gesture; only those of labeled gestures are searched
+AFFECTS = {
+    'steer_left': ('visual_max_angle', 'dead_zone_ratio'),
+    'steer_right': ('visual_max_angle', 'dead_zone_ratio'),
+    'hands_close': ('hands_close_dist',),
+    'hands_far': ('hands_far_dist',),
+    'left_forward': ('finger_extend_thresh',),
+    'left_backward': ('finger_extend_thresh',),
+    'right_forward': ('finger_extend_thresh',),
+    'right_backward': ('finger_extend_thresh',),
+}
+
+WEIGHTS = {'false_triggers': 1.0, 'false_time': 1.0, 'misses': 3.0, 'latency': 2.0}
+
+PROMPTS = {
+    'steer_left': "Tilt LEFT (left hand up)",
+    'steer_right': "Tilt RIGHT (right hand up)",
+    'hands_close': "Hands CLOSE together",
+    'hands_far': "Hands FAR apart",
+    'left_forward': "LEFT hand: two fingers up",
+    'left_backward': "LEFT hand: thumb only",
+    'right_forward': "RIGHT hand: two fingers up",
+    'right_backward': "RIGHT hand: thumb only",
+}
+
+
+# ---------------------------------------------------------------- scoring
+
+def score_session(session, result, grace: float = 0.5) -> Dict[str, float]:
+    """False triggers, false-on time, misses and latencies for one session."""
+    t = session.timestamps
+    dt = np.diff(t, append=t[-1]) if len(t) else t
+    out = {'false_triggers': 0, 'false_time': 0.0, 'misses': 0, 'hits': 0, 'latency_sum': 0.0}
+    for name in session.gestures:
+        on = result.flags[name]
+        label = session.label(name)
+        # Allow the output to trail the label by `grace` seconds when it is released
+        seg_end = np.flatnonzero(label[:-1] & ~label[1:])
+        allowed = label.copy()
+        for e in seg_end:
+            allowed[e + 1:np.searchsorted(t, t[e] + grace, 'right')] = True
+
+        rises = np.flatnonzero(on & ~np.r_[False, on[:-1]])
+        out['false_triggers'] += int(np.count_nonzero(~allowed[rises]))
+        out['false_time'] += float(dt[on & ~allowed].sum())
+
+        starts = np.flatnonzero(label & ~np.r_[False, label[:-1]])
+        ends = np.r_[seg_end + 1, len(label)][:len(starts)] if len(starts) else starts
+        for s, e in zip(starts, ends):
+            hit = np.flatnonzero(on[s:e])
+            if len(hit):
+                out['hits'] += 1
+                out['latency_sum'] += float(t[s + hit[0]] - t[s])
+            else:
+                out['misses'] += 1
+    return out
+
+
+def total_score(metrics: Dict[str, float], weights: Dict[str, float]) -> float:
+    latency = metrics['latency_sum'] / metrics['hits'] if metrics['hits'] else 0.0
+    return (
+        weights['false_triggers'] * metrics['false_triggers']
+        + weights['false_time'] * metrics['false_time']
+        + weights['misses'] * metrics['misses']
+        + weights['latency'] * latency
+    )
+
+
+# ---------------------------------------------------------------- workers
+
+_sessions = []
+_base: Dict = {}
+_sensitivity: Dict = {}
+_weights: Dict = {}
+_rules: Dict = {}
+
+
+def _init_worker(paths: List[str], base: Dict, sensitivity: Dict, weights: Dict, rules: Dict):
+    global _sessions, _base, _sensitivity, _weights, _rules
+    import session
+
+    _sessions = [session.load(p) for p in paths]
+    _base, _sensitivity, _weights, _rules = base, sensitivity, weights, rules
+
+
+def _evaluate(params: Dict[str, float]) -> Tuple[float, Dict, Dict[str, float]]:
+    import gesture_batch
+
+    thresholds = dict(_base, **params)
+    total = {'false_triggers': 0, 'false_time': 0.0, 'misses': 0, 'hits': 0, 'latency_sum': 0.0}
+    for s in _sessions:
+        result = gesture_batch.evaluate(s.landmarks, s.timestamps, thresholds, _sensitivity, rules=_rules)
+        for k, v in score_session(s, result).items():
+            total[k] += v
+    return total_score(total, _weights), total, params
+
+
+def _sample(
+    rng: random.Random, keys: List[str], around: Optional[Dict[str, float]] = None, spread: float = 0.1
+) -> Dict[str, float]:
+    """Uniform over SEARCH_SPACE, or a Gaussian step around a good candidate."""
+    out = {}
+    for key in keys:
+        lo, hi = SEARCH_SPACE[key]
+        v = rng.uniform(lo, hi) if around is None else rng.gauss(around[key], (hi - lo) * spread)
+        out[key] = round(min(hi, max(lo, v)), 3)
+    return out
+
+
+def search(args):
+    paths = sorted({p for pattern in args.sessions for p in glob.glob(pattern)})
+    if not paths:
+        print("No session files found")
+        sys.exit(1)
+    import session
+
+    labeled = {g for p in paths for g in session.load(p).gestures}
+    keys = ['stability_delay'] + sorted({k for g in labeled for k in AFFECTS.get(g, ())})
+    cfg = Config.load()
+    base = dict(cfg.thresholds)
+    start = {k: base[k] for k in keys}
+    weights = dict(WEIGHTS)
+    for k in WEIGHTS:
+        if getattr(args, f"w_{k}") is not None:
+            weights[k] = getattr(args, f"w_{k}")
+
+    rng = random.Random(args.seed)
+    explore = args.trials // 2
+    ctx = multiprocessing.get_context('spawn')
+    workers = args.workers or os.cpu_count() or 1
+    print(f"  {len(paths)} sessions ({', '.join(sorted(labeled))}), {args.trials} trials on {workers} workers")
+    t0 = time.time()
+    with ctx.Pool(workers, _init_worker, (paths, base, cfg.sensitivity, weights, cfg.rules())) as pool:
+        # Round 1: current settings plus uniform samples
+        candidates = [start] + [_sample(rng, keys) for _ in range(explore - 1)]
+        results = pool.map(_evaluate, candidates, chunksize=max(1, len(candidates) // (workers * 4)))
+        current = results[0]
+        # Round 2: refine around the best few from round 1
+        results.sort(key=lambda r: r[0])
+        seeds = [r[2] for r in results[:5]]
+        candidates = [_sample(rng, keys, seeds[i % len(seeds)]) for i in range(args.trials - explore)]
+        results += pool.map(_evaluate, candidates, chunksize=max(1, len(candidates) // (workers * 4)))
+    results.sort(key=lambda r: r[0])
+    best_score, best_metrics, best = results[0]
+    elapsed = time.time() - t0
+
+    def describe(score, m):
+        latency = m['latency_sum'] / m['hits'] if m['hits'] else 0.0
+        return (f"score {score:.2f}: {m['false_triggers']} false triggers, {m['false_time']:.1f}s false-on, "
+                f"{m['misses']} misses, {latency * 1000:.0f} ms latency")
+
+    print(f"  Done in {elapsed:.1f}s ({args.trials / elapsed:.0f} trials/s)")
+    print(f"  Current: {describe(current[0], current[1])}")
+    print(f"  Best:    {describe(best_score, best_metrics)}")
+    for k, v in best.items():
+        print(f"    {k:<22} {base[k]:>7} -> {v}")
+
+    if args.dry_run:
+        return
+    cfg.custom_profiles[args.profile] = dict(best)
+    cfg.save()
+    print(f"\n  Saved as profile '{args.profile}'")
+
+
+# ---------------------------------------------------------------- recording
+
+def record(args):
+    import cv2
+    from camera import open_camera
+    from frame_pool import FramePipeline
+    from gesture_detector import GESTURE_NAMES, GestureDetector
+    from session import Recorder
+
+    cfg = Config.load()
+    gestures = [g for g in PROMPTS if cfg.enabled_gestures.get(g)] if not args.gestures else args.gestures
+    # (label, seconds): rest between prompts, then hold the gesture
+    script: List[Tuple[Optional[str], float]] = []
+    for _ in range(args.rounds):
+        for g in gestures:
+            script += [(None, args.rest), (g, args.hold)]
+    script.append((None, args.rest))
+
+    cap = open_camera(args.camera if args.camera is not None else cfg.camera_index, cfg.camera_profiles)
+    if not cap:
+        print("Cannot open camera")
+        sys.exit(1)
+    detector = GestureDetector(
+        cfg.thresholds, cfg.sensitivity,
+        backend=cfg.landmark_backend, model_path=cfg.hand_model_path or None, rules=cfg.rules(),
+    )
+    frames = FramePipeline()
+    rec = Recorder()
+    start = time.monotonic()
+    ends = np.cumsum([d for _, d in script])
+    try:
+        while True:
+            now = time.monotonic() - start
+            step = int(np.searchsorted(ends, now, 'right'))
+            if step >= len(script):
+                break
+            rgb = frames.next(cap, cfg.mirror_mode)
+            if rgb is None:
+                continue
+            detector.process(rgb, rgb=True)
+            name = script[step][0]
+            rec.add(now, detector.left, detector.right, 1 << GESTURE_NAMES.index(name) if name else 0)
+
+            view = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+            detector.draw(view)
+            text = PROMPTS[name] if name else "Rest: hands level, palms open"
+            cv2.putText(view, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.9,
+                        (0, 255, 220) if name else (180, 180, 180), 2)
+            cv2.putText(view, f"{ends[step] - now:.1f}s  ({step + 1}/{len(script)})", (20, 75),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+            cv2.imshow("Recording (Q to abort)", view)
+            frames.release(rgb)
+            if cv2.waitKey(1) & 0xFF in (ord('q'), 27):
+                print("Aborted")
+                return
+    finally:
+        cap.release()
+        detector.release()
+        cv2.destroyAllWindows()
+    rec.save(args.output, gestures, {'mirror': cfg.mirror_mode, 'backend': cfg.landmark_backend})
+    print(f"Saved {len(rec)} frames to {args.output}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Record labeled sessions and tune thresholds on them.")
+    sub = ap.add_subparsers(dest='cmd', required=True)
+
+    r = sub.add_parser('record', help='record a prompted, labeled session')
+    r.add_argument('output')
+    r.add_argument('--camera', type=int)
+    r.add_argument('--rounds', type=int, default=3)
+    r.add_argument('--hold', type=float, default=3.0)
+    r.add_argument('--rest', type=float, default=2.0)
+    r.add_argument('--gestures', nargs='+', choices=list(PROMPTS),
+                   help='gestures to prompt (default: enabled gestures)')
+
+    s = sub.add_parser('search', help='search thresholds over recorded sessions')
+    s.add_argument('sessions', nargs='+', help='session files or glob patterns')
+    s.add_argument('--profile', default='tuned')
+    s.add_argument('--trials', type=int, default=1000)
+    s.add_argument('--workers', type=int)
+    s.add_argument('--seed', type=int, default=0)
+    s.add_argument('--dry-run', action='store_true', help="print the result, don't save a profile")
+    for k in WEIGHTS:
+        s.add_argument(f"--w-{k.replace('_', '-')}", dest=f"w_{k}", type=float, help=f"weight (default {WEIGHTS[k]})")
+
+    args = ap.parse_args()
+    if args.cmd == 'record':
+        record(args)
+    else:
+        search(args)
+
+
+if __name__ == "__main__":
+    main()